@@ -8,6 +8,8 @@ from api.routes import (
     enrollment_routes,
     progress_routes,
     student_stats_routes,
+    dashboard_routes,
+    leaderboard_routes,
 )
 
 api_router = APIRouter()
@@ -18,5 +20,7 @@ api_router.include_router(lesson_routes.router, prefix="", tags=["lessons"])
 api_router.include_router(enrollment_routes.router, prefix="/enrollments", tags=["enrollments"])
 api_router.include_router(progress_routes.router, prefix="/progress", tags=["progress"])
 api_router.include_router(student_stats_routes.router, prefix="/student-stats", tags=["student-statistics"])
+api_router.include_router(dashboard_routes.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(leaderboard_routes.router, prefix="/leaderboards", tags=["leaderboards"])
 api_router.include_router(management_routes.router, tags=["management-endpoints"])
 api_router.include_router(common_routes.router, tags=["common-endpoints"])
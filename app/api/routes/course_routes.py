@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, status, Query
-from typing import List
-from models.course import CourseCreate, CourseUpdate, Course
-from models.pagination import PaginatedResponse
-from models.user import TokenData
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from typing import List, Optional
+from models.course import CourseCreate, CourseUpdate, Course, CourseWithEnrollment, CourseSearchResult
+from models.pagination import PaginatedResponse, CursorPage
+from models.user import TokenData, UserRole
 from services.course_service import course_service
+from services.search_service import search_service
 from core.dependencies import get_current_mentor
-from core.security import get_current_user
+from core.security import get_current_user, get_optional_user
+from core.http_cache import conditional_response, make_etag, CATALOG_CACHE_CONTROL, PRIVATE_CACHE_CONTROL
 
 router = APIRouter()
 
 
+def _enrollment_student_id(with_enrollment: bool, current_user: Optional[TokenData]) -> Optional[str]:
+    """Student whose enrollments annotate catalog results; only students have enrollments"""
+    if with_enrollment and current_user and current_user.role == UserRole.STUDENT:
+        return current_user.user_id
+    return None
+
+
 @router.post(
     "/",
     response_model=Course,
@@ -31,20 +40,67 @@ async def create_course(
 
 @router.get(
     "/",
-    response_model=PaginatedResponse[Course],
+    response_model=PaginatedResponse[CourseWithEnrollment],
     summary="Get all courses"
 )
 async def get_all_courses(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    with_enrollment: bool = Query(False, description="Include the signed-in student's enrollment per course"),
+    current_user: Optional[TokenData] = Depends(get_optional_user)
 ):
     """
     Get all available courses with pagination (public).
     
     - **page**: Page number (starts at 1)
     - **limit**: Number of items per page (1-100)
+    - **with_enrollment**: For a signed-in student, fill `enrollment` on each
+      course in the same query; otherwise it is always null
+    
+    Anonymous pages support conditional requests and are cacheable by shared caches.
+    """
+    student_id = _enrollment_student_id(with_enrollment, current_user)
+    response.headers["Vary"] = "Authorization"
+    if student_id:
+        response.headers["Cache-Control"] = PRIVATE_CACHE_CONTROL
+    else:
+        etag, last_modified = await course_service.get_catalog_cache_validators(page, limit)
+        not_modified = conditional_response(request, response, etag, last_modified, CATALOG_CACHE_CONTROL)
+        if not_modified:
+            not_modified.headers["Vary"] = "Authorization"
+            return not_modified
+    return await course_service.get_all_courses(page=page, limit=limit, student_id=student_id)
+
+
+@router.get(
+    "/search",
+    response_model=CursorPage[CourseSearchResult],
+    summary="Search courses"
+)
+async def search_courses(
+    q: str = Query(..., min_length=1, max_length=200, description="Search words; the last may be partial"),
+    include_lessons: bool = Query(False, description="Also match lesson titles"),
+    limit: int = Query(10, ge=1, le=50, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_enrollment: bool = Query(False, description="Include the signed-in student's enrollment per course"),
+    current_user: Optional[TokenData] = Depends(get_optional_user)
+):
     """
-    return await course_service.get_all_courses(page=page, limit=limit)
+    Full-text search over course titles and descriptions (public).
+    
+    Title matches weigh more than description matches, words match by
+    prefix, and newer courses get a small boost. Results are ordered by
+    `score`; follow `next_cursor` for more.
+    """
+    return await search_service.search_courses(
+        q,
+        include_lessons=include_lessons,
+        limit=limit,
+        cursor=cursor,
+        student_id=_enrollment_student_id(with_enrollment, current_user)
+    )
 
 
 @router.get(
@@ -71,11 +127,17 @@ async def get_my_courses(
     response_model=Course,
     summary="Get course by ID"
 )
-async def get_course(course_id: str):
+async def get_course(course_id: str, request: Request, response: Response):
     """
     Get course details by ID (public).
+    
+    Supports conditional requests via ETag/Last-Modified derived from `updated_at`.
     """
-    return await course_service.get_course_by_id(course_id)
+    course = await course_service.get_course_by_id(course_id)
+    not_modified = conditional_response(
+        request, response, make_etag("course", course.id, course.updated_at.isoformat()), course.updated_at
+    )
+    return not_modified or course
 
 
 @router.put(
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from models.dashboard import StudentDashboard, MentorDashboard
+from models.enrollment import EnrollmentStatus
+from models.user import TokenData
+from services.dashboard_service import dashboard_service
+from core.dependencies import get_current_student, get_current_mentor
+
+router = APIRouter()
+
+
+@router.get(
+    "/student",
+    response_model=StudentDashboard,
+    summary="Get my dashboard"
+)
+async def get_student_dashboard(
+    current_user: TokenData = Depends(get_current_student),
+    status: Optional[EnrollmentStatus] = Query(None, description="Only show enrollments in this status"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(6, ge=1, le=100, description="Courses per page")
+):
+    """
+    Get everything the student dashboard shows in one call (Student only).
+    
+    Returns:
+    - stats: the student's overall statistics
+    - courses: a page of enrolled courses, newest request first, each with its
+      enrollment and (for approved enrollments) lesson progress
+    - pending_requests: courses whose enrollment is still awaiting approval
+    """
+    return await dashboard_service.get_student_dashboard(current_user.user_id, status, page, limit)
+
+
+@router.get(
+    "/mentor",
+    response_model=MentorDashboard,
+    summary="Get my mentor dashboard"
+)
+async def get_mentor_dashboard(
+    current_user: TokenData = Depends(get_current_mentor),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(6, ge=1, le=100, description="Courses per page")
+):
+    """
+    Get everything the mentor dashboard shows in one call (Mentor only).
+    
+    Returns:
+    - courses: a page of the mentor's courses, newest first, each with
+      pending/approved/rejected enrollment counts
+    - pending_requests: newest pending requests across all the mentor's courses,
+      with course titles
+    - pending_total: number of pending requests
+    - enrolled_students: distinct students approved in any of the mentor's courses
+    """
+    return await dashboard_service.get_mentor_dashboard(current_user.user_id, page, limit)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status, Query
-from typing import List
-from models.enrollment import EnrollmentCreate, Enrollment
+from typing import List, Optional
+from models.enrollment import EnrollmentCreate, Enrollment, BulkEnrollmentUpdate, BulkEnrollmentResult
 from models.course import CourseWithProgress
 from models.pagination import PaginatedResponse
 from models.user import TokenData
@@ -106,12 +106,16 @@ async def get_course_enrollments(
 )
 async def approve_enrollment(
     enrollment_id: str,
-    current_user: TokenData = Depends(get_current_mentor)
+    current_user: TokenData = Depends(get_current_mentor),
+    version: Optional[int] = Query(None, ge=0, description="Expected enrollment version; 409 if it has changed")
 ):
     """
     Approve an enrollment request (Course owner only).
+    
+    Returns 409 Conflict if the request is no longer pending, or if **version**
+    is given and no longer matches.
     """
-    return await enrollment_service.approve_enrollment(enrollment_id, current_user.user_id)
+    return await enrollment_service.approve_enrollment(enrollment_id, current_user.user_id, version)
 
 
 @router.put(
@@ -121,10 +125,36 @@ async def approve_enrollment(
 )
 async def reject_enrollment(
     enrollment_id: str,
-    current_user: TokenData = Depends(get_current_mentor)
+    current_user: TokenData = Depends(get_current_mentor),
+    version: Optional[int] = Query(None, ge=0, description="Expected enrollment version; 409 if it has changed")
 ):
     """
     Reject an enrollment request (Course owner only).
+    
+    Returns 409 Conflict if the request is no longer pending, or if **version**
+    is given and no longer matches.
     """
-    return await enrollment_service.reject_enrollment(enrollment_id, current_user.user_id)
+    return await enrollment_service.reject_enrollment(enrollment_id, current_user.user_id, version)
 
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkEnrollmentResult,
+    summary="Approve or reject enrollment requests in bulk"
+)
+async def bulk_update_enrollments(
+    request: BulkEnrollmentUpdate,
+    current_user: TokenData = Depends(get_current_mentor)
+):
+    """
+    Approve or reject many pending enrollment requests at once (Course owner only).
+    
+    - **action**: approve or reject
+    - **enrollment_ids**: specific enrollments to decide (up to 1000)
+    - **course_id**: every pending enrollment in this course; combined with
+      enrollment_ids, only those enrollments within the course
+    
+    Enrollments that are no longer pending are left unchanged and counted as skipped.
+    """
+    return await enrollment_service.bulk_update_enrollments(request, current_user.user_id)
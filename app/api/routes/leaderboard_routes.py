@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Query
+from models.leaderboard import Leaderboard
+from models.user import TokenData
+from services.leaderboard_service import leaderboard_service
+from core.security import get_current_user
+
+router = APIRouter()
+
+
+@router.get(
+    "/global",
+    response_model=Leaderboard,
+    summary="Get the global leaderboard"
+)
+async def get_global_leaderboard(
+    limit: int = Query(10, ge=1, le=100, description="Number of top students"),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    Get the students with the most completed lessons across all courses
+    (Authenticated users).
+    
+    Ties go to the student who reached the score first. For students,
+    `me` holds their own rank even when they are outside the top `limit`.
+    """
+    return await leaderboard_service.get_global_leaderboard(current_user, limit)
+
+
+@router.get(
+    "/courses/{course_id}",
+    response_model=Leaderboard,
+    summary="Get a course leaderboard"
+)
+async def get_course_leaderboard(
+    course_id: str,
+    limit: int = Query(10, ge=1, le=100, description="Number of top students"),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    Get the students with the most completed lessons in a course
+    (Enrolled students and the course owner).
+    
+    Ties go to the student who reached the score first. For students,
+    `me` holds their own rank even when they are outside the top `limit`.
+    """
+    return await leaderboard_service.get_course_leaderboard(course_id, current_user, limit)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Request, Response
 from typing import List
 from models.lesson import LessonCreate, LessonUpdate, Lesson
 from models.user import TokenData
 from services.lesson_service import lesson_service
 from core.dependencies import get_current_mentor
 from core.security import get_current_user
+from core.http_cache import conditional_response
 
 router = APIRouter()
 
@@ -37,10 +38,17 @@ async def create_lesson(
     response_model=List[Lesson],
     summary="Get lessons for a course"
 )
-async def get_course_lessons(course_id: str):
+async def get_course_lessons(course_id: str, request: Request, response: Response):
     """
     Get all lessons for a course (public).
+    
+    Supports conditional requests: the ETag changes whenever a lesson in the
+    course is created, updated or deleted.
     """
+    etag, last_modified = await lesson_service.get_lessons_cache_validators(course_id)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
     return await lesson_service.get_lessons_by_course(course_id)
 
 
@@ -1,11 +1,67 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from core.query_monitor import query_monitor
+from core.health import readiness_probe
+from core.profiling import profile_store, is_profile_token, PROFILE_HEADER
+from core.metrics import collect_worker_snapshots, merge_snapshots, render_prometheus
 
 router = APIRouter()
 
 @router.get("/management/health/readiness")
 async def readiness_status():
-    return {"status": "UP", "components": {"readinessState": {"status": "UP"}}}
+    """
+    Ready only once collections are initialized, Mongo answers a (cached)
+    ping under the latency threshold and the connection pool is not
+    saturated. Returns 503 when DOWN so load balancers stop routing here.
+    """
+    report = await readiness_probe.check()
+    status_code = status.HTTP_200_OK if report["status"] == "UP" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(report, status_code=status_code)
 
 @router.get("/management/health/liveness")
 async def liveness_status():
     return {"status": "UP", "components": {"livenessState": {"status": "UP"}}}
+
+@router.get("/management/db/queries")
+async def query_statistics():
+    """
+    Mongo command latency histograms per collection and operation, totals per
+    repository method and recent slow queries with their explain() plans.
+    """
+    return query_monitor.snapshot()
+
+@router.delete("/management/db/queries")
+async def reset_query_statistics():
+    query_monitor.reset()
+    return {"message": "Query statistics reset"}
+
+@router.get("/management/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Prometheus text exposition of per-route request metrics, Mongo command
+    latency, connection pool stats and background task depth, aggregated
+    across gunicorn workers when METRICS_MULTIPROC_DIR is set.
+    """
+    snapshots = await collect_worker_snapshots()
+    return PlainTextResponse(
+        render_prometheus(merge_snapshots(snapshots)),
+        media_type="text/plain; version=0.0.4"
+    )
+
+def require_profile_token(request: Request) -> None:
+    """Only callers holding PROFILE_TOKEN may read profiles; they expose code paths and timings"""
+    value = request.headers.get(PROFILE_HEADER.decode("latin-1"))
+    if not is_profile_token(value.encode("latin-1") if value is not None else None):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profile token required")
+
+@router.get("/management/profiles", dependencies=[Depends(require_profile_token)])
+async def list_profiles():
+    """Recent request profiles captured by the profiling middleware, newest first"""
+    return profile_store.list()
+
+@router.get("/management/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+async def get_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
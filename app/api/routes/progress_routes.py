@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
-from models.progress import Progress, CourseProgress
+from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from models.progress import (
+    Progress,
+    CourseProgress,
+    StudentCourseProgress,
+    CourseAnalytics,
+    ActivityDay,
+    ExportFormat,
+    HistoryBucket,
+    ProgressHistory,
+)
+from models.pagination import PaginatedResponse, SortOrder
 from models.user import TokenData
 from services.progress_service import progress_service
+from services.course_analytics_service import course_analytics_service
 from core.dependencies import get_current_student, get_current_mentor
 
 router = APIRouter()
@@ -53,6 +65,26 @@ async def get_my_progress(
     return await progress_service.get_student_progress_details(course_id, current_user.user_id)
 
 
+@router.get(
+    "/history",
+    response_model=ProgressHistory,
+    summary="Get my completion history"
+)
+async def get_progress_history(
+    bucket: HistoryBucket = Query(HistoryBucket.DAY, description="day or week (ISO weeks, starting Monday)"),
+    periods: int = Query(30, ge=1, le=366, description="Number of buckets, including the current one"),
+    current_user: TokenData = Depends(get_current_student)
+):
+    """
+    Get the student's lesson completions across all courses per UTC day or
+    week, oldest first, with empty buckets filled with zeros (Student only).
+    
+    Also returns the number of days with a completion and the current and
+    longest streaks of consecutive days.
+    """
+    return await progress_service.get_progress_history(current_user.user_id, bucket, periods)
+
+
 @router.get(
     "/courses/{course_id}/details",
     response_model=List[Progress],
@@ -87,3 +119,101 @@ async def get_student_progress_mentor(
         current_user.user_id
     )
 
+
+@router.get(
+    "/courses/{course_id}/students",
+    response_model=PaginatedResponse[StudentCourseProgress],
+    summary="Get progress of all students in a course (Mentor view)"
+)
+async def get_course_students_progress(
+    course_id: str,
+    student_ids: Optional[List[str]] = Query(None, description="Only these students (repeat the parameter)"),
+    sort: SortOrder = Query(SortOrder.DESC, description="Sort by completion percentage"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    current_user: TokenData = Depends(get_current_mentor)
+):
+    """
+    Get course progress for every approved student in a course, or for the
+    given `student_ids`, sorted by completion percentage (Course owner only).
+    
+    - **student_ids**: Optional student ids to restrict the result to
+    - **sort**: `desc` (most complete first) or `asc`
+    - **page**: Page number (starts at 1)
+    - **limit**: Number of items per page (1-100)
+    """
+    return await progress_service.get_course_students_progress(
+        course_id,
+        current_user.user_id,
+        student_ids=student_ids,
+        page=page,
+        limit=limit,
+        sort=sort
+    )
+
+
+@router.get(
+    "/courses/{course_id}/analytics",
+    response_model=CourseAnalytics,
+    summary="Get lesson completion funnel (Mentor view)"
+)
+async def get_course_analytics(
+    course_id: str,
+    current_user: TokenData = Depends(get_current_mentor)
+):
+    """
+    Get completion analytics for a course (Course owner only).
+    
+    Returns completions per lesson in `order` sequence, enrolled, started
+    and recently active students, and the median time between a student's
+    completions. Results are cached briefly and refreshed after new completions.
+    """
+    return await course_analytics_service.get_course_analytics(course_id, current_user.user_id)
+
+
+@router.get(
+    "/courses/{course_id}/activity",
+    response_model=List[ActivityDay],
+    summary="Get daily course activity (Mentor view)"
+)
+async def get_course_activity(
+    course_id: str,
+    days: int = Query(30, ge=1, le=366, description="Number of UTC days, including today"),
+    current_user: TokenData = Depends(get_current_mentor)
+):
+    """
+    Get completions, active students and newly approved enrollments per
+    day for a course (Course owner only).
+    
+    Read from the pre-aggregated daily rollups; days without activity are
+    returned with zero counts.
+    """
+    return await course_analytics_service.get_course_activity(course_id, current_user.user_id, days)
+
+
+@router.get(
+    "/courses/{course_id}/export",
+    summary="Export course progress (Mentor view)",
+    response_class=StreamingResponse
+)
+async def export_course_progress(
+    course_id: str,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    current_user: TokenData = Depends(get_current_mentor)
+):
+    """
+    Download progress of every approved student in a course, one row per
+    student and lesson (Course owner only).
+    
+    - **format**: `csv` (with header row) or `ndjson` (one JSON object per line)
+    
+    Rows are streamed as they are read from the database, so memory use
+    does not grow with the cohort size.
+    """
+    rows = await progress_service.export_course_progress(course_id, current_user.user_id, format)
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="course-{course_id}-progress.{format.value}"'}
+    )
@@ -0,0 +1,147 @@
+"""
+Backfill job for the daily activity rollups
+Run this script: python backfill_activity.py [--since 2024-01-01] [--batch-size 200]
+
+Rebuilds `activity_daily` from the raw progress and enrollment history, a
+batch of courses at a time. Counters are overwritten rather than
+incremented, so the job can be rerun safely; increments made by the API for
+the same days while the job runs may be overwritten, so rerun it with
+--since set to today if it overlapped live traffic. Active-student markers
+are written for days that can still receive completions so that later live
+updates do not count backfilled students twice.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Load environment variables
+load_dotenv()
+
+# Import after loading env
+from core import mongodb
+from models.enrollment import EnrollmentStatus
+from repository.activity_repository import activity_repository, day_start
+
+# MongoDB connection details
+MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
+MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
+MONGO_DB = os.getenv('MONGO_DB', 'progress_db')
+
+
+def _day_expression(field: str) -> dict:
+    """Truncate a date field to UTC midnight ($dateTrunc needs MongoDB 5.0)"""
+    return {"$dateFromParts": {
+        "year": {"$year": field},
+        "month": {"$month": field},
+        "day": {"$dayOfMonth": field}
+    }}
+
+
+def completions_pipeline(course_ids: list, since: datetime, markers_since: datetime) -> list:
+    """Completions and distinct students per course and day; student ids only for marker days"""
+    return [
+        {"$match": {
+            "course_id": {"$in": course_ids},
+            "completed": True,
+            "completed_at": {"$gte": since} if since else {"$type": "date"}
+        }},
+        {"$group": {
+            "_id": {"course_id": "$course_id", "day": _day_expression("$completed_at")},
+            "completions": {"$sum": 1},
+            "students": {"$addToSet": "$student_id"}
+        }},
+        {"$project": {
+            "completions": 1,
+            "active_students": {"$size": "$students"},
+            "students": {"$cond": [{"$gte": ["$_id.day", markers_since]}, "$students", "$$REMOVE"]}
+        }}
+    ]
+
+
+def enrollments_pipeline(course_ids: list, since: datetime) -> list:
+    """Approved enrollments per course and approval day"""
+    return [
+        {"$match": {
+            "course_id": {"$in": course_ids},
+            "status": EnrollmentStatus.APPROVED.value,
+            "approved_at": {"$gte": since} if since else {"$type": "date"}
+        }},
+        {"$group": {
+            "_id": {"course_id": "$course_id", "day": _day_expression("$approved_at")},
+            "new_enrollments": {"$sum": 1}
+        }}
+    ]
+
+
+async def backfill_batch(db, course_ids: list, since: datetime, markers_since: datetime) -> int:
+    """Rebuild the rollups of one batch of courses, returning the number of days written"""
+    days = {}
+    async for row in db.progress.aggregate(completions_pipeline(course_ids, since, markers_since)):
+        key = (row["_id"]["course_id"], row["_id"]["day"])
+        days[key] = {"completions": row["completions"], "active_students": row["active_students"]}
+        if row.get("students"):
+            await activity_repository.add_markers(key[0], key[1], row["students"])
+
+    async for row in db.enrollments.aggregate(enrollments_pipeline(course_ids, since)):
+        key = (row["_id"]["course_id"], row["_id"]["day"])
+        days.setdefault(key, {})["new_enrollments"] = row["new_enrollments"]
+
+    await activity_repository.replace_days([
+        {"course_id": course_id, "day": day, **counters}
+        for (course_id, day), counters in days.items()
+    ])
+    return len(days)
+
+
+async def backfill_activity(args) -> dict:
+    """Rebuild the rollups for every course and return a summary"""
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(f"mongodb://{MONGO_HOST}:{MONGO_PORT}")
+    db = client[args.database or MONGO_DB]
+    # The repositories read the module-level database
+    mongodb.database = db
+
+    since = day_start(args.since) if args.since else None
+    markers_since = day_start(datetime.utcnow() - timedelta(seconds=mongodb.ACTIVITY_MARKER_TTL_SECONDS))
+    courses = days = 0
+
+    try:
+        batch = []
+        async for course in db.courses.find({}, {"_id": 1}).sort("_id", 1):
+            batch.append(str(course["_id"]))
+            if len(batch) >= args.batch_size:
+                days += await backfill_batch(db, batch, since, markers_since)
+                courses += len(batch)
+                print(f"   ... {courses} courses, {days} days")
+                batch = []
+        if batch:
+            days += await backfill_batch(db, batch, since, markers_since)
+            courses += len(batch)
+    finally:
+        client.close()
+
+    return {
+        "courses": courses,
+        "days": days,
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the daily activity rollups from history")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="Only rebuild days from this date on (ISO format, default: all history)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Courses per aggregation batch")
+    parser.add_argument("--database", help="Database name (defaults to MONGO_DB)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    summary = asyncio.run(backfill_activity(parse_args()))
+    print("🎉 Activity backfill completed")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
@@ -0,0 +1,107 @@
+"""
+Backfill job for the progress embedded in enrollments
+Run this script: python backfill_embedded_progress.py [--all] [--batch-size 500]
+
+Copies completed lessons from the `progress` collection into each
+enrollment's `completed_lessons` list and `completed_count`, then marks the
+enrollment with `progress_embedded` so the API serves the student's course
+progress from it. Entries are merged, not overwritten, so the job can run
+next to live traffic and be rerun safely. By default only enrollments not
+yet marked are processed; --all re-merges every enrollment, e.g. after an
+embedded write failed.
+"""
+import argparse
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Load environment variables
+load_dotenv()
+
+# Import after loading env
+from core import mongodb
+from repository.enrollment_repository import enrollment_repository
+
+# MongoDB connection details
+MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
+MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
+MONGO_DB = os.getenv('MONGO_DB', 'progress_db')
+
+
+def completed_pipeline(student_ids: list) -> list:
+    """Completed lessons of a batch of students, grouped per (student, course)"""
+    return [
+        {"$match": {"student_id": {"$in": student_ids}, "completed": True}},
+        {"$group": {
+            "_id": {"student_id": "$student_id", "course_id": "$course_id"},
+            "lessons": {"$push": {
+                "lesson_id": "$lesson_id",
+                "progress_id": {"$toString": "$_id"},
+                "completed_at": "$completed_at"
+            }}
+        }}
+    ]
+
+
+async def backfill_batch(db, enrollments: list) -> int:
+    """Merge progress into one batch of (student_id, course_id) enrollments, returning how many changed"""
+    completed = {pair: [] for pair in enrollments}
+    student_ids = list({student_id for student_id, _ in enrollments})
+    async for row in db.progress.aggregate(completed_pipeline(student_ids)):
+        pair = (row["_id"]["student_id"], row["_id"]["course_id"])
+        # Progress without an enrollment (e.g. the enrollment was removed) has nowhere to go
+        if pair in completed:
+            completed[pair] = row["lessons"]
+    return await enrollment_repository.merge_embedded_progress(completed)
+
+
+async def backfill_embedded_progress(args) -> dict:
+    """Embed progress into every enrollment that needs it and return a summary"""
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(f"mongodb://{MONGO_HOST}:{MONGO_PORT}")
+    db = client[args.database or MONGO_DB]
+    # The repositories read the module-level database
+    mongodb.database = db
+
+    query = {} if args.all else {"progress_embedded": {"$ne": True}}
+    enrollments = modified = 0
+
+    try:
+        batch = []
+        cursor = db.enrollments.find(query, {"student_id": 1, "course_id": 1}).sort("_id", 1)
+        async for enrollment in cursor:
+            batch.append((enrollment["student_id"], enrollment["course_id"]))
+            if len(batch) >= args.batch_size:
+                modified += await backfill_batch(db, batch)
+                enrollments += len(batch)
+                print(f"   ... {enrollments} enrollments, {modified} modified")
+                batch = []
+        if batch:
+            modified += await backfill_batch(db, batch)
+            enrollments += len(batch)
+    finally:
+        client.close()
+
+    return {
+        "enrollments": enrollments,
+        "modified": modified,
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Embed completed lessons into enrollment documents")
+    parser.add_argument("--all", action="store_true",
+                        help="Re-merge enrollments already marked as embedded")
+    parser.add_argument("--batch-size", type=int, default=500, help="Enrollments per batch")
+    parser.add_argument("--database", help="Database name (defaults to MONGO_DB)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    summary = asyncio.run(backfill_embedded_progress(parse_args()))
+    print("🎉 Embedded progress backfill completed")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Coroutine, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTaskTracker:
+    """
+    Spawns fire-and-forget tasks (e.g. student stats recalculation) while
+    keeping a strong reference to each one, so tasks are not garbage
+    collected mid-flight and the in-flight count can be reported.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+
+    def spawn(self, coro: Coroutine, name: str = None) -> asyncio.Task:
+        """Schedule a coroutine on the running loop and track it"""
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        self.started += 1
+        task.add_done_callback(self._on_done)
+        return task
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tasks still running"""
+        return len(self._tasks)
+
+    async def drain(self, timeout: float = 5.0) -> None:
+        """Wait for in-flight tasks on shutdown, cancelling any that overrun"""
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cancelled %s background tasks on shutdown", len(pending))
+
+    def snapshot(self) -> dict:
+        """Return task counters"""
+        return {
+            "in_flight": self.in_flight,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# Create singleton instance
+background_tasks = BackgroundTaskTracker()
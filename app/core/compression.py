@@ -0,0 +1,228 @@
+import os
+import zlib
+import asyncio
+from typing import List, Optional, Tuple
+import logging
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Bodies smaller than this are sent as-is; headers and framing would eat the savings
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI = os.getenv("COMPRESSION_BROTLI", "false").lower() == "true"
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+COMPRESSION_CONTENT_TYPES = [
+    content_type.strip().lower()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,application/x-ndjson,text/csv,text/plain,text/html"
+    ).split(",")
+    if content_type.strip()
+]
+# Whole bodies at least this large are compressed in a worker thread to keep the event loop free
+COMPRESSION_THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", 256 * 1024))
+
+_NOT_COMPRESSIBLE_STATUSES = {204, 206, 304}
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header: str, brotli_enabled: bool) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding (preferring br on ties), or None"""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = (["br"] if brotli_enabled else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Encoder:
+    """Streaming encoder; flush() emits everything compressed so far"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    """One-shot compression of a complete body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with gzip or (optionally) brotli.
+
+    Complete bodies below min_size, non-allow-listed content types and
+    responses that already carry a Content-Encoding pass through untouched.
+    Streaming responses are compressed chunk by chunk and flushed after each
+    chunk, so compression never holds data back from the client.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_enabled: bool = COMPRESSION_BROTLI,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        content_types: List[str] = None,
+        thread_threshold: int = COMPRESSION_THREAD_THRESHOLD
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types if content_types is not None else COMPRESSION_CONTENT_TYPES)
+        self.thread_threshold = thread_threshold
+        self.brotli_enabled = brotli_enabled and brotli is not None
+        if brotli_enabled and brotli is None:
+            logger.warning("COMPRESSION_BROTLI is set but the brotli package is not installed; using gzip only")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding, self.brotli_enabled) if accept_encoding else None
+
+        start_message = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                eligible = self._eligible(message)
+                if eligible:
+                    message["headers"] = _with_vary(message.get("headers", []))
+                if not eligible or encoding is None:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows whether to compress
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = start_message["headers"]
+                start = start_message
+                start_message = None
+                if not more_body:
+                    # Complete body: compress in one shot if it is worth it
+                    if len(body) < self.min_size:
+                        passthrough = True
+                        await send(start)
+                        await send(message)
+                        return
+                    compressed = await self._compress(body, encoding)
+                    start["headers"] = _set_encoding_headers(headers, encoding, len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                    return
+                # Streaming body: length is unknown, compress incrementally
+                encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                start["headers"] = _set_encoding_headers(headers, encoding, None)
+                await send(start)
+
+            chunk = encoder.compress(body) if body else b""
+            if not more_body:
+                chunk += encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _eligible(self, message) -> bool:
+        if message["status"] in _NOT_COMPRESSIBLE_STATUSES or message["status"] < 200:
+            return False
+        content_type = b""
+        for name, value in message.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        media_type = content_type.decode("latin-1").split(";", 1)[0].strip().lower()
+        return media_type in self.content_types
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.thread_threshold:
+            return await asyncio.to_thread(compress_body, body, encoding, self.gzip_level, self.brotli_quality)
+        return compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+
+
+def _with_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Add Accept-Encoding to Vary so shared caches keep encodings apart"""
+    headers = list(headers)
+    for index, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+def _set_encoding_headers(headers, encoding: str, content_length: Optional[int]):
+    headers = [(name, value) for name, value in headers if name != b"content-length"]
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode("latin-1")))
+    return headers
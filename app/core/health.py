@@ -0,0 +1,116 @@
+import os
+import time
+import asyncio
+from typing import Optional
+from core import mongodb
+from core.pool_monitor import pool_monitor
+from core.background import background_tasks
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Readiness configuration
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", 2))
+READINESS_PING_TIMEOUT_SECONDS = float(os.getenv("READINESS_PING_TIMEOUT_SECONDS", 1))
+READINESS_MAX_PING_MS = float(os.getenv("READINESS_MAX_PING_MS", 250))
+READINESS_MAX_CHECKOUT_WAIT_MS = float(os.getenv("READINESS_MAX_CHECKOUT_WAIT_MS", 500))
+READINESS_MAX_BACKGROUND_TASKS = int(os.getenv("READINESS_MAX_BACKGROUND_TASKS", 1000))
+
+
+class ReadinessProbe:
+    """
+    Readiness check backed by a cached Mongo ping.
+
+    The ping result is reused for READINESS_CACHE_SECONDS and concurrent
+    probes share a single in-flight ping, so frequent load balancer checks
+    add almost no load to Mongo.
+    """
+
+    def __init__(self):
+        self._checked_at = 0.0
+        self._ping_ms: Optional[float] = None
+        self._ping_error: Optional[str] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._last_status: Optional[str] = None
+
+    async def _ping(self) -> None:
+        database = mongodb.get_database()
+        if database is None:
+            self._ping_ms, self._ping_error = None, "Database not connected"
+            return
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(database.command("ping"), READINESS_PING_TIMEOUT_SECONDS)
+            self._ping_ms, self._ping_error = (time.perf_counter() - start) * 1000, None
+        except asyncio.TimeoutError:
+            self._ping_ms, self._ping_error = None, f"Ping timed out after {READINESS_PING_TIMEOUT_SECONDS}s"
+        except Exception as e:
+            self._ping_ms, self._ping_error = None, str(e)
+        finally:
+            self._checked_at = time.monotonic()
+
+    async def _cached_ping(self) -> None:
+        if time.monotonic() - self._checked_at < READINESS_CACHE_SECONDS:
+            return
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._ping())
+        await asyncio.shield(self._inflight)
+
+    async def check(self) -> dict:
+        """Return the readiness report; its top-level status is UP or DOWN"""
+        await self._cached_ping()
+
+        if mongodb.collections_initialized:
+            init_status = {"status": "UP"}
+        elif mongodb.initialization_error:
+            init_status = {"status": "DOWN", "details": {"error": mongodb.initialization_error}}
+        else:
+            init_status = {"status": "DOWN", "details": {"reason": "initialize_collections is running"}}
+
+        if self._ping_error:
+            mongo_status = {"status": "DOWN", "details": {"error": self._ping_error}}
+        else:
+            mongo_status = {
+                "status": "UP" if self._ping_ms <= READINESS_MAX_PING_MS else "DOWN",
+                "details": {"ping_ms": round(self._ping_ms, 3), "max_ping_ms": READINESS_MAX_PING_MS},
+            }
+
+        pool = pool_monitor.snapshot()
+        pool_down = pool_monitor.saturated or pool["recent_checkout_wait_ms"] > READINESS_MAX_CHECKOUT_WAIT_MS
+        pool_status = {
+            "status": "DOWN" if pool_down else "UP",
+            "details": {
+                "max_pool_size": pool["max_pool_size"],
+                "checked_out": pool["checked_out"],
+                "waiting": pool["waiting"],
+                "recent_checkout_wait_ms": pool["recent_checkout_wait_ms"],
+                "max_checkout_wait_ms": READINESS_MAX_CHECKOUT_WAIT_MS,
+            },
+        }
+
+        in_flight = background_tasks.in_flight
+        background_status = {
+            "status": "UP" if in_flight <= READINESS_MAX_BACKGROUND_TASKS else "DOWN",
+            "details": {"in_flight": in_flight, "max_in_flight": READINESS_MAX_BACKGROUND_TASKS},
+        }
+
+        components = {
+            "readinessState": init_status,
+            "mongo": mongo_status,
+            "mongoPool": pool_status,
+            "backgroundTasks": background_status,
+        }
+        down = [name for name, component in components.items() if component["status"] != "UP"]
+        overall = "DOWN" if down else "UP"
+        if overall != self._last_status:
+            if down:
+                logger.warning("Readiness changed to DOWN: %s", ", ".join(down))
+            else:
+                logger.info("Readiness changed to UP")
+            self._last_status = overall
+
+        return {"status": overall, "components": components}
+
+
+# Create singleton instance
+readiness_probe = ReadinessProbe()
@@ -0,0 +1,87 @@
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+# Latency bucket upper bounds in milliseconds
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000
+)
+
+# Payload size bucket upper bounds in bytes
+DEFAULT_SIZE_BUCKETS_BYTES: Tuple[float, ...] = (
+    100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Not synchronized - callers observing from several threads must hold
+    their own lock.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        # One slot per bound plus the +Inf overflow bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram with the same bounds into this one"""
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def cumulative_buckets(self) -> Dict[str, int]:
+        """Return cumulative bucket counts keyed by upper bound ("+Inf" last)"""
+        buckets = {}
+        running = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            running += bucket_count
+            buckets[format(bound, "g")] = running
+        buckets["+Inf"] = running + self.counts[-1]
+        return buckets
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable summary of the histogram"""
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "buckets": self.cumulative_buckets(),
+        }
+
+    def state(self) -> dict:
+        """Return the raw histogram state, restorable with from_state()"""
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Histogram":
+        """Rebuild a histogram from state()"""
+        histogram = cls(state["bounds"])
+        histogram.counts = list(state["counts"])
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.max = state["max"]
+        return histogram
@@ -1,5 +1,188 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-# Set up logging configuration
-logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
-logger = logging.getLogger()
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. "repository=WARNING,services.progress_service=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+# Max records per message template per window below ERROR; 0 disables sampling
+LOG_SAMPLE_RATE_LIMIT = int(os.getenv("LOG_SAMPLE_RATE_LIMIT", 20))
+LOG_SAMPLE_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", 10))
+
+# Attributes present on every LogRecord (plus uvicorn's ANSI-coloured duplicate
+# message); anything else came in through `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "color_message"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any fields passed via `extra`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits repetitive records per (logger, level, message template).
+
+    Records below ERROR beyond LOG_SAMPLE_RATE_LIMIT per window are dropped;
+    the first record of the next window carries a `suppressed` count.
+    Matching on the unformatted template means "Created progress for
+    student %s" is one key regardless of its arguments.
+    """
+
+    def __init__(self, limit: int, window_seconds: float):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._windows: dict = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats the message on the calling thread before
+    enqueueing; here only the lazy %-arguments are rendered to strings (so
+    mutable objects are captured as they are now) and JSON encoding and the
+    stream write happen on the listener thread. A full queue drops the
+    record instead of blocking the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # Tracebacks hold frame references; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _parse_module_levels(spec: str) -> dict:
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """
+    Route all logging through a bounded queue drained by a background
+    QueueListener thread, so log calls on the event loop never block on I/O.
+    Safe to call more than once, and again after shutdown_logging().
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    if LOG_FORMAT == "text":
+        formatter = logging.Formatter("%(levelname)s:     %(name)s - %(message)s")
+    else:
+        formatter = JsonFormatter()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE_LIMIT, LOG_SAMPLE_WINDOW_SECONDS))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    for name, level in _parse_module_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    # Uvicorn installs its own stream handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _queue_handler = queue_handler
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and log directly from then on
+
+    Without a listener nothing would drain the queue, so records logged
+    after shutdown (uvicorn's own shutdown messages, a second lifespan in
+    the same process) would fill it and then be dropped.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        for record_filter in _queue_handler.filters:
+            handler.addFilter(record_filter)
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
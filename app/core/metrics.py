@@ -0,0 +1,387 @@
+import os
+import glob
+import json
+import asyncio
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from core.histogram import Histogram, DEFAULT_SIZE_BUCKETS_BYTES
+from core.pool_monitor import pool_monitor
+from core.query_monitor import query_monitor
+from core.background import background_tasks
+from core.single_flight import single_flight_snapshots
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by gunicorn workers for multiprocess aggregation (unset = single process)
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", 5))
+
+# Route label used for requests that match no route, to bound label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteMetrics:
+    """Counters and histograms for one (method, route template) pair"""
+
+    __slots__ = ("in_flight", "statuses", "latency", "sizes")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram()
+        self.sizes = Histogram(DEFAULT_SIZE_BUCKETS_BYTES)
+
+    def observe(self, status_code: int, duration_ms: float, size: int) -> None:
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        self.latency.observe(duration_ms)
+        self.sizes.observe(size)
+
+
+class MetricsRegistry:
+    """
+    Per-worker HTTP metrics keyed by route template.
+
+    Only ever touched from the worker's event loop thread, so no locking is
+    needed; gunicorn workers are aggregated through snapshot files instead.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._route_index: Optional[Dict[str, list]] = None
+
+    def _build_route_index(self, app) -> Dict[str, list]:
+        """Group routes by first path segment so matching only scans a few regexes"""
+        index: Dict[str, list] = {}
+        for route in app.router.routes:
+            if not hasattr(route, "path_regex"):
+                continue
+            first_segment = route.path.lstrip("/").split("/", 1)[0]
+            index.setdefault(first_segment, []).append(route)
+        return index
+
+    def resolve_route(self, scope) -> str:
+        """Return the route template (e.g. /courses/{course_id}) for a request scope"""
+        if self._route_index is None:
+            self._route_index = self._build_route_index(scope["app"])
+
+        path = scope["path"]
+        method = scope["method"]
+        template = UNMATCHED_ROUTE
+        for route in self._route_index.get(path.lstrip("/").split("/", 1)[0], ()):
+            if route.path_regex.match(path):
+                methods = getattr(route, "methods", None)
+                if not methods or method in methods:
+                    return route.path
+                template = route.path
+        return template
+
+    def route_for(self, scope) -> RouteMetrics:
+        key = (scope["method"], self.resolve_route(scope))
+        route_metrics = self.routes.get(key)
+        if route_metrics is None:
+            route_metrics = self.routes[key] = RouteMetrics()
+        return route_metrics
+
+    def snapshot(self) -> dict:
+        """Return this worker's metrics as a JSON-serializable document"""
+        return {
+            "pid": os.getpid(),
+            "routes": [
+                {
+                    "method": method,
+                    "route": route,
+                    "in_flight": metrics.in_flight,
+                    "statuses": {str(code): count for code, count in metrics.statuses.items()},
+                    "latency": metrics.latency.state(),
+                    "sizes": metrics.sizes.state(),
+                }
+                for (method, route), metrics in self.routes.items()
+            ],
+            "pool": pool_monitor.snapshot(),
+            "background": background_tasks.snapshot(),
+            "single_flight": single_flight_snapshots(),
+            "mongo": query_monitor.histogram_states(),
+        }
+
+
+# Create singleton instance
+metrics_registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, latency, size and in-flight per route"""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_metrics = self.registry.route_for(scope)
+        route_metrics.in_flight += 1
+        status_code = 500
+        response_size = 0
+        start = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route_metrics.in_flight -= 1
+            route_metrics.observe(status_code, (perf_counter() - start) * 1000, response_size)
+
+
+# ---------------------------------------------------------------------------
+# Multiprocess aggregation
+# ---------------------------------------------------------------------------
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"metrics-{pid}.json")
+
+
+def _write_snapshot(snapshot: dict) -> None:
+    path = _snapshot_path(snapshot["pid"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _read_snapshots(own_pid: int) -> List[dict]:
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_MULTIPROC_DIR, "metrics-*.json")):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if snapshot.get("pid") != own_pid:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+async def flush_worker_snapshot() -> None:
+    """Persist this worker's snapshot for other workers to aggregate"""
+    if not METRICS_MULTIPROC_DIR:
+        return
+    snapshot = metrics_registry.snapshot()
+    try:
+        await asyncio.to_thread(_write_snapshot, snapshot)
+    except OSError as e:
+        logger.error("Error writing metrics snapshot: %s", e)
+
+
+async def _flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+        await flush_worker_snapshot()
+
+
+def start_metrics_flusher() -> Optional[asyncio.Task]:
+    """Start periodic snapshot flushing when multiprocess mode is configured"""
+    if not METRICS_MULTIPROC_DIR:
+        return None
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    return asyncio.create_task(_flush_periodically(), name="metrics_flusher")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def collect_worker_snapshots() -> List[dict]:
+    """Return snapshots for every worker, starting with the current one"""
+    own = metrics_registry.snapshot()
+    if not METRICS_MULTIPROC_DIR:
+        return [own]
+    await asyncio.to_thread(_write_snapshot, own)
+    others = await asyncio.to_thread(_read_snapshots, own["pid"])
+    return [own] + others
+
+
+def merge_snapshots(snapshots: List[dict]) -> dict:
+    """
+    Aggregate worker snapshots. Counters and histograms are summed across
+    all workers, including exited ones, so totals stay monotonic; gauges
+    are only summed over live workers.
+    """
+    routes: Dict[Tuple[str, str], dict] = {}
+    mongo: Dict[Tuple[str, str], dict] = {}
+    pool = {"max_pool_size": 0, "open_connections": 0, "checked_out": 0, "waiting": 0,
+            "checkouts": 0, "checkout_failures": 0, "checkout_wait_ms": None}
+    background = {"in_flight": 0, "started": 0, "completed": 0, "failed": 0}
+    single_flight: Dict[str, dict] = {}
+    live_workers = 0
+
+    for snapshot in snapshots:
+        alive = snapshot["pid"] == os.getpid() or _pid_alive(snapshot["pid"])
+        live_workers += alive
+
+        for route in snapshot["routes"]:
+            key = (route["method"], route["route"])
+            merged = routes.get(key)
+            if merged is None:
+                merged = routes[key] = {"in_flight": 0, "statuses": {},
+                                        "latency": None, "sizes": None}
+            if alive:
+                merged["in_flight"] += route["in_flight"]
+            for code, count in route["statuses"].items():
+                merged["statuses"][code] = merged["statuses"].get(code, 0) + count
+            merged["latency"] = _merge_histogram(merged["latency"], route["latency"])
+            merged["sizes"] = _merge_histogram(merged["sizes"], route["sizes"])
+
+        for command in snapshot["mongo"]:
+            key = (command["collection"], command["operation"])
+            merged = mongo.get(key)
+            if merged is None:
+                merged = mongo[key] = {"failures": 0, "latency": None}
+            merged["failures"] += command["failures"]
+            merged["latency"] = _merge_histogram(merged["latency"], command["latency"])
+
+        worker_pool = snapshot["pool"]
+        pool["checkouts"] += worker_pool["checkouts"]
+        pool["checkout_failures"] += worker_pool["checkout_failures"]
+        pool["checkout_wait_ms"] = _merge_histogram(pool["checkout_wait_ms"], worker_pool["checkout_wait_ms"])
+        worker_background = snapshot["background"]
+        for counter in ("started", "completed", "failed"):
+            background[counter] += worker_background[counter]
+        if alive:
+            for gauge in ("max_pool_size", "open_connections", "checked_out", "waiting"):
+                pool[gauge] += worker_pool[gauge]
+            background["in_flight"] += worker_background["in_flight"]
+
+        # Snapshots written before single-flight metrics existed have no entry
+        for group in snapshot.get("single_flight", []):
+            merged = single_flight.setdefault(group["name"], {"in_flight": 0, "executed": 0, "shared": 0})
+            merged["executed"] += group["executed"]
+            merged["shared"] += group["shared"]
+            if alive:
+                merged["in_flight"] += group["in_flight"]
+
+    return {"workers": live_workers, "routes": routes, "mongo": mongo,
+            "pool": pool, "background": background, "single_flight": single_flight}
+
+
+def _merge_histogram(merged: Optional[Histogram], state: dict) -> Histogram:
+    histogram = Histogram.from_state(state)
+    if merged is None:
+        return histogram
+    merged.merge(histogram)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text exposition
+# ---------------------------------------------------------------------------
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _series(name: str, **labels) -> str:
+    return f"{name}{{{_labels(**labels)}}}" if labels else name
+
+
+def _render_histogram(lines: List[str], name: str, labels: dict, histogram: Histogram, scale: float = 1.0) -> None:
+    running = 0
+    for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+        running += bucket_count
+        lines.append(f'{_series(f"{name}_bucket", **labels, le=format(bound * scale, "g"))} {running}')
+    lines.append(f'{_series(f"{name}_bucket", **labels, le="+Inf")} {histogram.count}')
+    lines.append(f"{_series(f'{name}_sum', **labels)} {histogram.total * scale}")
+    lines.append(f"{_series(f'{name}_count', **labels)} {histogram.count}")
+
+
+def _header(lines: List[str], name: str, metric_type: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def render_prometheus(metrics: dict) -> str:
+    """Render merged metrics in the Prometheus text exposition format"""
+    lines: List[str] = []
+    routes = sorted(metrics["routes"].items())
+
+    _header(lines, "http_requests_total", "counter", "HTTP requests by route template and status.")
+    for (method, route), data in routes:
+        for code, count in sorted(data["statuses"].items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=code)}}} {count}")
+
+    _header(lines, "http_request_duration_seconds", "histogram", "HTTP request latency by route template.")
+    for (method, route), data in routes:
+        _render_histogram(lines, "http_request_duration_seconds", {"method": method, "route": route},
+                          data["latency"], scale=0.001)
+
+    _header(lines, "http_requests_in_flight", "gauge", "HTTP requests currently being served.")
+    for (method, route), data in routes:
+        lines.append(f"http_requests_in_flight{{{_labels(method=method, route=route)}}} {data['in_flight']}")
+
+    _header(lines, "http_response_size_bytes", "histogram", "HTTP response body size by route template.")
+    for (method, route), data in routes:
+        _render_histogram(lines, "http_response_size_bytes", {"method": method, "route": route}, data["sizes"])
+
+    mongo = sorted(metrics["mongo"].items())
+    _header(lines, "mongo_command_duration_seconds", "histogram", "Mongo command latency by collection and operation.")
+    for (collection, operation), data in mongo:
+        _render_histogram(lines, "mongo_command_duration_seconds",
+                          {"collection": collection, "operation": operation}, data["latency"], scale=0.001)
+    _header(lines, "mongo_command_failures_total", "counter", "Failed Mongo commands by collection and operation.")
+    for (collection, operation), data in mongo:
+        lines.append(f"mongo_command_failures_total{{{_labels(collection=collection, operation=operation)}}} {data['failures']}")
+
+    pool = metrics["pool"]
+    for name, key, metric_type, help_text in (
+        ("mongo_pool_max_size", "max_pool_size", "gauge", "Configured Mongo connection pool size."),
+        ("mongo_pool_open_connections", "open_connections", "gauge", "Open Mongo connections."),
+        ("mongo_pool_checked_out_connections", "checked_out", "gauge", "Mongo connections in use."),
+        ("mongo_pool_waiting_checkouts", "waiting", "gauge", "Operations waiting for a Mongo connection."),
+        ("mongo_pool_checkouts_total", "checkouts", "counter", "Mongo connection checkouts."),
+        ("mongo_pool_checkout_failures_total", "checkout_failures", "counter", "Failed Mongo connection checkouts."),
+    ):
+        _header(lines, name, metric_type, help_text)
+        lines.append(f"{name} {pool[key]}")
+    _header(lines, "mongo_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a Mongo connection.")
+    if pool["checkout_wait_ms"] is not None:
+        _render_histogram(lines, "mongo_pool_checkout_wait_seconds", {}, pool["checkout_wait_ms"], scale=0.001)
+
+    background = metrics["background"]
+    _header(lines, "background_tasks_in_flight", "gauge", "Background tasks (stats recalculation) queued or running.")
+    lines.append(f"background_tasks_in_flight {background['in_flight']}")
+    for counter in ("started", "completed", "failed"):
+        name = f"background_tasks_{counter}_total"
+        _header(lines, name, "counter", f"Background tasks {counter}.")
+        lines.append(f"{name} {background[counter]}")
+
+    single_flight = sorted(metrics["single_flight"].items())
+    _header(lines, "single_flight_calls_total", "counter",
+            "Coalesced reads by group; result=shared joined an in-flight call, collapse ratio = shared / all.")
+    for name, data in single_flight:
+        for result in ("executed", "shared"):
+            lines.append(f"single_flight_calls_total{{{_labels(group=name, result=result)}}} {data[result]}")
+    _header(lines, "single_flight_in_flight", "gauge", "Distinct keys currently executing by group.")
+    for name, data in single_flight:
+        lines.append(f"single_flight_in_flight{{{_labels(group=name)}}} {data['in_flight']}")
+
+    _header(lines, "metrics_workers", "gauge", "Live worker processes contributing metrics.")
+    lines.append(f"metrics_workers {metrics['workers']}")
+
+    return "\n".join(lines) + "\n"
@@ -1,13 +1,30 @@
 import os
+import asyncio
 import motor.motor_asyncio
-from core.log_config import logger
+import logging
+from pymongo.errors import CollectionInvalid
+from core.query_monitor import query_monitor
+from core.pool_monitor import pool_monitor
 from typing_extensions import Annotated
 from pydantic.functional_validators import BeforeValidator
 
+logger = logging.getLogger(__name__)
+
 # Initialize global variables
 client = None
 database = None
 
+# Collection/index initialization state, reported by the readiness probe
+collections_initialized = False
+initialization_error = None
+initialization_task = None
+
+# Active-student markers only matter while their day can still receive completions
+ACTIVITY_MARKER_TTL_SECONDS = 2 * 24 * 3600
+
+# Capped collection workers tail for cache invalidation events; old events are overwritten
+CACHE_INVALIDATIONS_SIZE_BYTES = int(os.getenv("CACHE_INVALIDATIONS_SIZE_BYTES", 4 * 1024 * 1024))
+
 # Type alias for PyObjectId using Annotated
 PyObjectId = Annotated[str, BeforeValidator(str)]
 
@@ -16,6 +33,16 @@ def get_database():
     return database
 
 
+async def _initialize_collections_in_background():
+    """Run initialize_collections without blocking startup, recording the outcome."""
+    global collections_initialized, initialization_error
+    try:
+        await initialize_collections()
+        collections_initialized = True
+    except Exception as e:
+        initialization_error = str(e)
+
+
 async def initialize_collections():
     """Initialize required collections and indexes on application startup."""
     try:
@@ -73,6 +100,13 @@ async def initialize_collections():
         if 'student_id_1_lesson_id_1' not in progress_indexes:
             await progress_collection.create_index([('student_id', 1), ('lesson_id', 1)], unique=True)
             logger.info("Created unique compound index on 'student_id' and 'lesson_id' in progress collection")
+        if 'course_id_1_student_id_1' not in progress_indexes:
+            # Lets the course export read a course's progress already grouped by student
+            await progress_collection.create_index([('course_id', 1), ('student_id', 1)])
+            logger.info("Created compound index on 'course_id' and 'student_id' in progress collection")
+        if 'student_id_1_completed_at_1' not in progress_indexes:
+            await progress_collection.create_index([('student_id', 1), ('completed_at', 1)])
+            logger.info("Created compound index on 'student_id' and 'completed_at' in progress collection")
         
         # Student Stats collection - student_id unique index
         student_stats_collection = database['student_stats']
@@ -81,16 +115,69 @@ async def initialize_collections():
             await student_stats_collection.create_index('student_id', unique=True)
             logger.info("Created unique index on 'student_id' field in student_stats collection")
         
+        # Activity rollups - one document per course and day
+        activity_daily_collection = database['activity_daily']
+        activity_daily_indexes = await activity_daily_collection.index_information()
+        if 'course_id_1_day_1' not in activity_daily_indexes:
+            await activity_daily_collection.create_index([('course_id', 1), ('day', 1)], unique=True)
+            logger.info("Created unique compound index on 'course_id' and 'day' in activity_daily collection")
+        
+        # Activity markers - one document per course, day and active student, expired by TTL
+        activity_markers_collection = database['activity_daily_students']
+        activity_markers_indexes = await activity_markers_collection.index_information()
+        if 'course_id_1_day_1_student_id_1' not in activity_markers_indexes:
+            await activity_markers_collection.create_index(
+                [('course_id', 1), ('day', 1), ('student_id', 1)], unique=True
+            )
+            logger.info("Created unique compound index on 'course_id', 'day' and 'student_id' in activity_daily_students collection")
+        if 'day_1' not in activity_markers_indexes:
+            await activity_markers_collection.create_index('day', expireAfterSeconds=ACTIVITY_MARKER_TTL_SECONDS)
+            logger.info("Created TTL index on 'day' field in activity_daily_students collection")
+        
+        # Course search - one weighted text index over course and lesson documents
+        search_collection = database['course_search']
+        search_indexes = await search_collection.index_information()
+        if 'search_text' not in search_indexes:
+            await search_collection.create_index(
+                [('title', 'text'), ('description', 'text'), ('ngrams', 'text')],
+                weights={'title': 10, 'ngrams': 4, 'description': 2},
+                name='search_text'
+            )
+            logger.info("Created weighted text index on 'title', 'description' and 'ngrams' in course_search collection")
+        if 'course_id_1' not in search_indexes:
+            await search_collection.create_index('course_id')
+            logger.info("Created index on 'course_id' field in course_search collection")
+        
+        # Leaderboards - entries kept sorted per scope for top-K and rank reads
+        leaderboard_collection = database['leaderboard_entries']
+        leaderboard_indexes = await leaderboard_collection.index_information()
+        if 'leaderboard_ranking' not in leaderboard_indexes:
+            await leaderboard_collection.create_index(
+                [('scope', 1), ('score', -1), ('reached_at', 1), ('student_id', 1)],
+                name='leaderboard_ranking'
+            )
+            logger.info("Created ranking index on 'scope', 'score', 'reached_at' and 'student_id' in leaderboard_entries collection")
+        
+        # Cache invalidation events - capped so every worker can follow it with a tailable cursor
+        if 'cache_invalidations' not in await database.list_collection_names():
+            try:
+                await database.create_collection(
+                    'cache_invalidations', capped=True, size=CACHE_INVALIDATIONS_SIZE_BYTES
+                )
+                logger.info("Created capped cache_invalidations collection")
+            except CollectionInvalid:
+                pass  # Another worker created it first
+        
         logger.info("Database initialization completed successfully!")
         
     except Exception as e:
-        logger.error(f"Error initializing collections: {e}")
+        logger.error("Error initializing collections: %s", e)
         raise
 
 
 async def connect_mongodb():
     """Attempt to connect to MongoDB and set the global client and database."""
-    global client, database
+    global client, database, initialization_task
     try:
         mongo_db_host = os.getenv('MONGO_HOST')
         mongo_db_port = os.getenv('MONGO_PORT')
@@ -101,23 +188,32 @@ async def connect_mongodb():
             raise ValueError("MONGO_DB_URL is not set")
 
         # Initialize the MongoDB client
-        client = motor.motor_asyncio.AsyncIOMotorClient(mongo_db_url)
+        client = motor.motor_asyncio.AsyncIOMotorClient(
+            mongo_db_url,
+            event_listeners=[query_monitor, pool_monitor]
+        )
         database = client[mongo_db_name]
+        query_monitor.bind(database, asyncio.get_running_loop())
 
         # Verify the connection by listing collections or similar operation
         await client.server_info()
         logger.info("Database connected successfully!")
         
-        # Initialize collections and indexes
-        await initialize_collections()
+        # Initialize collections and indexes; readiness reports DOWN until this finishes
+        initialization_task = asyncio.create_task(
+            _initialize_collections_in_background(),
+            name="initialize_collections"
+        )
         
     except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
         raise
 
 async def disconnect_mongodb():
     """Disconnect from MongoDB."""
     global client
+    if initialization_task and not initialization_task.done():
+        initialization_task.cancel()
     if client:
         client.close()
         logger.info("Database disconnected successfully!")
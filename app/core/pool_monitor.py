@@ -0,0 +1,101 @@
+import threading
+from pymongo import monitoring
+from core.histogram import Histogram
+
+# pymongo's default when maxPoolSize is not configured
+DEFAULT_MAX_POOL_SIZE = 100
+
+# Smoothing factor for the recent checkout wait moving average
+CHECKOUT_WAIT_EWMA_ALPHA = 0.2
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener tracking open and checked-out connections,
+    waiting checkouts and checkout wait time.
+
+    Pool events fire on Motor's executor threads, so counters are guarded
+    by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.max_pool_size = DEFAULT_MAX_POOL_SIZE
+        self.open_connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait = Histogram()
+        self.recent_checkout_wait_ms = 0.0
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self._lock:
+            self.max_pool_size = event.options.get("maxPoolSize", DEFAULT_MAX_POOL_SIZE)
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+            self.checkouts += 1
+            if event.duration is not None:
+                wait_ms = event.duration * 1000
+                self.checkout_wait.observe(wait_ms)
+                self.recent_checkout_wait_ms += CHECKOUT_WAIT_EWMA_ALPHA * (wait_ms - self.recent_checkout_wait_ms)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    @property
+    def saturated(self) -> bool:
+        """True when every pooled connection is in use and operations are queueing"""
+        with self._lock:
+            return self.checked_out >= self.max_pool_size and self.waiting > 0
+
+    def snapshot(self) -> dict:
+        """Return current pool gauges and the checkout wait histogram state"""
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "recent_checkout_wait_ms": round(self.recent_checkout_wait_ms, 3),
+                "checkout_wait_ms": self.checkout_wait.state(),
+            }
+
+
+# Create singleton instance
+pool_monitor = PoolMonitor()
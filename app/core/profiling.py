@@ -0,0 +1,249 @@
+import os
+import hmac
+import time
+import uuid
+import random
+import pstats
+import cProfile
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Profiling configuration - the middleware is only installed when enabled
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile").lower().encode("latin-1")
+# Shared secret clients send as the PROFILE_HEADER value to trigger a profile and to read
+# /management/profiles; when unset only PROFILE_SAMPLE_RATE profiles and the store is closed
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "").encode("latin-1")
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", 50))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", 25))
+
+
+def is_profile_token(value: Optional[bytes]) -> bool:
+    """Whether a PROFILE_HEADER value carries the configured PROFILE_TOKEN"""
+    if not PROFILE_TOKEN or value is None:
+        return False
+    return hmac.compare_digest(value, PROFILE_TOKEN)
+
+
+class RequestProfile:
+    """Wall-clock profile of a single request, split into named sections"""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.sections: dict = {}
+        self.functions: Optional[List[dict]] = None
+        # Sections are also recorded from Motor's executor threads
+        self._lock = threading.Lock()
+
+    def add(self, section: str, duration_ms: float) -> None:
+        with self._lock:
+            entry = self.sections.get(section)
+            if entry is None:
+                entry = self.sections[section] = {"count": 0, "total_ms": 0.0}
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall_ms, 3),
+        }
+
+    def to_dict(self) -> dict:
+        sections = {
+            name: {"count": entry["count"], "total_ms": round(entry["total_ms"], 3)}
+            for name, entry in self.sections.items()
+        }
+        return {
+            **self.summary(),
+            "sections": sections,
+            "functions": self.functions,
+        }
+
+
+# Profile of the request being handled; None (the fast path) when not profiling
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+class _Section:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoopSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SECTION = _NoopSection()
+
+
+def profile_section(name: str):
+    """
+    Context manager timing a block into the current request profile.
+    Costs a single contextvar lookup when the request is not profiled.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return _NOOP_SECTION
+    return _Section(profile, name)
+
+
+def record_section(name: str, duration_ms: float) -> None:
+    """Add an externally measured duration (e.g. a Mongo command) to the current profile"""
+    profile = current_profile.get()
+    if profile is not None:
+        profile.add(name, duration_ms)
+
+
+class ProfileStore:
+    """Bounded ring buffer of recent request profiles"""
+
+    def __init__(self, size: int = PROFILE_BUFFER_SIZE):
+        self._profiles = deque(maxlen=size)
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles.append(profile)
+
+    def list(self) -> List[dict]:
+        return [profile.summary() for profile in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile.to_dict()
+        return None
+
+
+# Create singleton instance
+profile_store = ProfileStore()
+
+
+def _short_location(filename: str) -> str:
+    for marker in ("site-packages/", "/app/"):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+def _function_stats(profiler: cProfile.Profile, profile: RequestProfile) -> List[dict]:
+    """Attribute Pydantic CPU time to its own section and return the top functions by own time"""
+    stats = pstats.Stats(profiler).stats
+
+    # bcrypt, JWT and Mongo are timed explicitly; model construction is spread
+    # across the codebase, so it is measured from the pydantic(-core) entries
+    pydantic_calls, pydantic_time = 0, 0.0
+    for (filename, _, function_name), (_, calls, own_time, _, _) in stats.items():
+        if "pydantic" in filename or "pydantic" in function_name:
+            pydantic_calls += calls
+            pydantic_time += own_time
+    if pydantic_calls:
+        profile.sections["pydantic"] = {"count": pydantic_calls, "total_ms": pydantic_time * 1000}
+
+    top = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:PROFILE_TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{_short_location(filename)}:{line}({function_name})",
+            "calls": calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+        }
+        for (filename, line, function_name), (_, calls, own_time, cumulative_time, _) in top
+    ]
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-request profiler, triggered by the PROFILE_HEADER request
+    header carrying PROFILE_TOKEN or by PROFILE_SAMPLE_RATE. Profiled
+    responses carry an X-Profile-Id header; the result is kept in
+    profile_store. Reads of the store itself are never profiled.
+
+    Only one request at a time runs under cProfile. Since cProfile follows
+    the event loop thread, its function table can include work interleaved
+    from other concurrent requests; the named sections cannot.
+    """
+
+    _cprofile_busy = False
+
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> bool:
+        if scope["path"].startswith("/management/profiles"):
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return is_profile_token(value)
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        profiler = None
+        if not ProfilingMiddleware._cprofile_busy:
+            ProfilingMiddleware._cprofile_busy = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.wall_ms = (time.perf_counter() - start) * 1000
+            if profiler is not None:
+                profiler.disable()
+                ProfilingMiddleware._cprofile_busy = False
+                try:
+                    profile.functions = _function_stats(profiler, profile)
+                except Exception as e:
+                    logger.error("Error collecting profile stats: %s", e)
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None)
+            current_profile.reset(token)
+            profile_store.add(profile)
+            logger.info("Profiled %s %s in %.1fms (profile %s)", profile.method, profile.path, profile.wall_ms, profile.id)
@@ -0,0 +1,292 @@
+import os
+import json
+import time
+import asyncio
+import functools
+import inspect
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional, Dict, Tuple
+from bson import json_util
+from pymongo import monitoring
+from core.histogram import Histogram
+from core.profiling import record_section
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Slow query configuration
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", 100))
+EXPLAIN_SLOW_QUERIES = os.getenv("MONGO_EXPLAIN_SLOW_QUERIES", "true").lower() == "true"
+EXPLAIN_INTERVAL_SECONDS = float(os.getenv("MONGO_EXPLAIN_INTERVAL_SECONDS", 300))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("MONGO_SLOW_QUERY_LOG_SIZE", 100))
+
+# Commands that carry the target collection name as their first value
+COLLECTION_COMMANDS = {
+    "find", "insert", "update", "delete", "aggregate", "count",
+    "distinct", "findAndModify", "createIndexes", "listIndexes",
+}
+
+# Commands for which the server can produce an explain() plan
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+# Driver-managed fields that must not be forwarded inside an explain command
+DRIVER_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "autocommit", "startTransaction"}
+
+# Repository method issuing the current Mongo command, e.g. "CourseRepository.get_course_by_id".
+# Motor copies the context into its executor threads, so listener callbacks can read it.
+current_query_caller: ContextVar[Optional[str]] = ContextVar("current_query_caller", default=None)
+
+
+def monitor_repository(cls):
+    """
+    Class decorator tagging every public async method (or async generator)
+    of a repository so the Mongo commands it issues are attributed to it.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(method):
+            setattr(cls, name, _tag_caller(method, f"{cls.__name__}.{name}"))
+        elif inspect.isasyncgenfunction(method):
+            setattr(cls, name, _tag_caller_stream(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _tag_caller(method, caller: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_query_caller.set(caller)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_query_caller.reset(token)
+    return wrapper
+
+
+def _tag_caller_stream(method, caller: str):
+    """Like _tag_caller for async generators; the caller is only set while the generator runs"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        stream = method(*args, **kwargs)
+        try:
+            while True:
+                token = current_query_caller.set(caller)
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_query_caller.reset(token)
+                yield item
+        finally:
+            await stream.aclose()
+    return wrapper
+
+
+def _to_json(document) -> dict:
+    """Convert a BSON document into plain JSON types (ObjectId, datetime, ...)"""
+    return json.loads(json_util.dumps(document))
+
+
+def _plan_stages(plan: dict) -> str:
+    """Flatten a winning plan into a readable stage chain, e.g. 'FETCH > IXSCAN'"""
+    stages = []
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage = f"{stage}({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " > ".join(stages)
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """
+    Command listener recording per collection/operation latency histograms,
+    per repository method totals and a bounded log of slow queries with
+    their explain() plans.
+
+    Listener callbacks run on Motor's executor threads, so shared state is
+    guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple, Tuple[str, str, Optional[str], Optional[dict]]] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._failures: Dict[Tuple[str, str], int] = {}
+        self._callers: Dict[str, dict] = {}
+        self._slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._last_explained: Dict[Tuple[str, str, Optional[str]], float] = {}
+        self._database = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, database, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the database and event loop used to run explain() plans"""
+        self._database = database
+        self._loop = loop
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        command_name = event.command_name
+        if command_name == "getMore":
+            collection = event.command.get("collection")
+        elif command_name in COLLECTION_COMMANDS:
+            collection = event.command.get(command_name)
+        else:
+            return
+        if not isinstance(collection, str):
+            return
+
+        explain_command = None
+        if EXPLAIN_SLOW_QUERIES and command_name in EXPLAINABLE_COMMANDS:
+            explain_command = {k: v for k, v in event.command.items() if k not in DRIVER_FIELDS}
+
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                collection, command_name, current_query_caller.get(), explain_command
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        duration_ms = event.duration_micros / 1000
+        record_section("mongo", duration_ms)
+
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            collection, command_name, caller, explain_command = pending
+            key = (collection, command_name)
+
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(duration_ms)
+            if failed:
+                self._failures[key] = self._failures.get(key, 0) + 1
+
+            caller_name = caller or "unknown"
+            caller_stats = self._callers.get(caller_name)
+            if caller_stats is None:
+                caller_stats = self._callers[caller_name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            caller_stats["count"] += 1
+            caller_stats["total_ms"] += duration_ms
+            caller_stats["max_ms"] = max(caller_stats["max_ms"], duration_ms)
+
+            if duration_ms < SLOW_QUERY_THRESHOLD_MS:
+                return
+
+            entry = {
+                "collection": collection,
+                "operation": command_name,
+                "caller": caller,
+                "duration_ms": round(duration_ms, 3),
+                "failed": failed,
+                "timestamp": time.time(),
+                "command": _to_json(explain_command) if explain_command else None,
+                "plan": None,
+            }
+            self._slow_queries.append(entry)
+            should_explain = explain_command is not None and self._claim_explain(
+                (collection, command_name, caller)
+            )
+
+        logger.warning(
+            "Slow query: %s on %s from %s took %.1fms", command_name, collection, caller, duration_ms
+        )
+        if should_explain and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._schedule_explain, entry, explain_command)
+
+    def _claim_explain(self, key) -> bool:
+        """Rate-limit explain() to once per interval per query shape (lock held)"""
+        now = time.monotonic()
+        last = self._last_explained.get(key)
+        if last is not None and now - last < EXPLAIN_INTERVAL_SECONDS:
+            return False
+        self._last_explained[key] = now
+        return True
+
+    def _schedule_explain(self, entry: dict, command: dict) -> None:
+        asyncio.ensure_future(self._explain(entry, command))
+
+    async def _explain(self, entry: dict, command: dict) -> None:
+        """Run explain() for a slow command and attach the winning plan"""
+        if self._database is None:
+            return
+        try:
+            result = await self._database.command({"explain": command, "verbosity": "queryPlanner"})
+            planner = result.get("queryPlanner") or result.get("stages", [{}])[0].get("$cursor", {}).get("queryPlanner", {})
+            winning_plan = planner.get("winningPlan", {})
+            stages = _plan_stages(winning_plan)
+            with self._lock:
+                entry["plan"] = {"stages": stages, "winning_plan": _to_json(winning_plan)}
+            logger.warning(
+                "Explain for slow %s on %s from %s: %s",
+                entry["operation"], entry["collection"], entry["caller"], stages
+            )
+        except Exception as e:
+            logger.error("Error explaining slow query on %s: %s", entry["collection"], e)
+
+    def snapshot(self) -> dict:
+        """Return histograms, per-caller totals and recent slow queries"""
+        with self._lock:
+            operations = [
+                {
+                    "collection": collection,
+                    "operation": operation,
+                    "failures": self._failures.get((collection, operation), 0),
+                    **histogram.snapshot(),
+                }
+                for (collection, operation), histogram in sorted(self._histograms.items())
+            ]
+            callers = [
+                {
+                    "caller": caller,
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                }
+                for caller, stats in sorted(self._callers.items(), key=lambda item: -item[1]["total_ms"])
+            ]
+            slow_queries = [dict(entry) for entry in reversed(self._slow_queries)]
+
+        return {
+            "slow_query_threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+            "operations": operations,
+            "callers": callers,
+            "slow_queries": slow_queries,
+        }
+
+    def histogram_states(self) -> list:
+        """Return raw per collection/operation histogram state for metrics export"""
+        with self._lock:
+            return [
+                {
+                    "collection": collection,
+                    "operation": operation,
+                    "failures": self._failures.get((collection, operation), 0),
+                    "latency": histogram.state(),
+                }
+                for (collection, operation), histogram in self._histograms.items()
+            ]
+
+    def reset(self) -> None:
+        """Clear all recorded statistics"""
+        with self._lock:
+            self._histograms.clear()
+            self._failures.clear()
+            self._callers.clear()
+            self._slow_queries.clear()
+            self._last_explained.clear()
+
+
+# Create singleton instance
+query_monitor = QueryMonitor()
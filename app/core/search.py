@@ -0,0 +1,57 @@
+import re
+import json
+import base64
+from typing import List
+
+# Edge n-grams of title words are indexed so partial words ("pyth") match
+NGRAM_MIN_LENGTH = 2
+NGRAM_MAX_LENGTH = 15
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of `text`"""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def edge_ngrams(text: str) -> List[str]:
+    """
+    Proper prefixes of every word in `text`, NGRAM_MIN_LENGTH characters and up.
+    
+    Whole words are left out; they are matched through the original field
+    with a higher weight, so complete words outrank partial ones.
+    """
+    ngrams = {}
+    for word in tokenize(text):
+        for length in range(NGRAM_MIN_LENGTH, min(len(word), NGRAM_MAX_LENGTH + 1)):
+            ngrams[word[:length]] = True
+    return list(ngrams)
+
+
+def search_terms(query: str) -> str:
+    """
+    Normalize a user query for $text.
+    
+    Only word tokens are kept, so quotes and leading '-' can't turn into
+    phrase or negation operators.
+    """
+    return " ".join(tokenize(query))
+
+
+def encode_cursor(position: dict) -> str:
+    """Opaque, URL-safe cursor for a position in a ranked result list"""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
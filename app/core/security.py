@@ -6,10 +6,15 @@ import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from models.user import TokenData, UserRole
-from core.log_config import logger
+import logging
+from core.profiling import profile_section
+
+logger = logging.getLogger(__name__)
 
 # HTTP Bearer token security
 security = HTTPBearer()
+# Same scheme for endpoints that are public but personalize for signed-in users
+optional_security = HTTPBearer(auto_error=False)
 
 # JWT Configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -30,8 +35,9 @@ def hash_password(password: str) -> str:
     """
     # Encode password to bytes and hash with bcrypt
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with profile_section("bcrypt"):
+        salt = bcrypt.gensalt()
+        hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
@@ -49,7 +55,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Encode both to bytes and verify
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    with profile_section("bcrypt"):
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -71,7 +78,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    with profile_section("jwt"):
+        encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -88,7 +96,8 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    with profile_section("jwt"):
+        encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -113,7 +122,8 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
     )
     
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        with profile_section("jwt"):
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         user_id: str = payload.get("user_id")
         email: str = payload.get("email")
         role: str = payload.get("role")
@@ -124,7 +134,7 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
             raise credentials_exception
         
         if token_type_from_payload != token_type:
-            logger.error(f"Invalid token type. Expected {token_type}, got {token_type_from_payload}")
+            logger.error("Invalid token type. Expected %s, got %s", token_type, token_type_from_payload)
             raise credentials_exception
         
         token_data = TokenData(
@@ -135,7 +145,7 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
         return token_data
         
     except JWTError as e:
-        logger.error(f"JWT validation error: {e}")
+        logger.error("JWT validation error: %s", e)
         raise credentials_exception
 
 
@@ -153,6 +163,29 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return verify_token(token, token_type="access")
 
 
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[TokenData]:
+    """
+    Dependency to get the current user if a valid bearer token was sent
+    
+    For public endpoints: an expired or invalid token is treated as
+    anonymous instead of failing the request with 401.
+    
+    Args:
+        credentials: HTTP Bearer credentials, if any
+        
+    Returns:
+        TokenData of current user, or None for anonymous requests
+    """
+    if credentials is None:
+        return None
+    try:
+        return verify_token(credentials.credentials, token_type="access")
+    except HTTPException:
+        return None
+
+
 async def get_current_user_with_role(
     required_role: UserRole,
     current_user: TokenData = Depends(get_current_user)
@@ -0,0 +1,87 @@
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+# Off runs every call on its own, e.g. to measure what coalescing saves
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution.
+
+    The first caller for a key awaits the work itself, so a call with
+    nothing to share costs no extra task; callers arriving while it is
+    still running await a future the first caller resolves instead of
+    repeating it. Nothing is cached: once the work finishes the key is
+    forgotten and the next call runs again. Waiters are shielded, so one
+    of them disconnecting does not cancel the result for the others; if
+    the first caller is cancelled, the waiters run the work again.
+    """
+
+    def __init__(self, name: str, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.name = name
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of factory(), sharing an in-flight call for `key` if there is one"""
+        if not self.enabled:
+            self.executed += 1
+            return await factory()
+
+        call = self._calls.get(key)
+        if call is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                # The first caller was cancelled before finishing; start over
+                return await self.do(key, factory)
+
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.executed += 1
+        try:
+            result = await factory()
+        except Exception as e:
+            call.set_exception(e)
+            # There may be no waiters; mark the exception as retrieved
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            if not call.done():
+                call.cancel()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently executing"""
+        return len(self._calls)
+
+    def snapshot(self) -> dict:
+        """Return executed/shared counters and the in-flight key count"""
+        return {"name": self.name, "in_flight": self.in_flight, "executed": self.executed, "shared": self.shared}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight for `name`, so services reading the same data share one"""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def single_flight_snapshots() -> List[dict]:
+    """Return counters for every named SingleFlight"""
+    return [group.snapshot() for group in _groups.values()]
@@ -0,0 +1,324 @@
+"""
+Synthetic data generator for benchmarking and index testing
+Run this script: python data_generator.py --drop --students 10000 --courses 2000 --lessons 50
+
+Generates users, courses, lessons, enrollments and progress with Zipf-skewed
+course popularity. Output is deterministic for a given --seed and --now
+(bcrypt salts aside). Documents are streamed into MongoDB with chunked
+insert_many calls, and password hashes are computed in parallel over a
+process pool. Derived collections (search index, activity rollups,
+embedded progress, leaderboards) are not generated; the scripts to build
+them are printed at the end.
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Load environment variables
+load_dotenv()
+
+# Import after loading env
+from core.security import hash_password
+from models.user import UserRole
+from models.lesson import LessonType
+from models.enrollment import EnrollmentStatus
+
+# MongoDB connection details
+MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
+MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
+MONGO_DB = os.getenv('MONGO_DB', 'progress_db')
+
+DEFAULT_PASSWORD = "bench123"
+GENERATED_COLLECTIONS = ("users", "courses", "lessons", "enrollments", "progress", "student_stats")
+# Derived from the generated data; dropped with it and rebuilt by FOLLOW_UP_SCRIPTS
+DERIVED_COLLECTIONS = (
+    "leaderboard_entries", "course_search", "activity_daily", "activity_daily_students", "cache_versions"
+)
+# Jobs that build the derived data for documents inserted directly (the API maintains it otherwise)
+FOLLOW_UP_SCRIPTS = (
+    "python rebuild_search_index.py",
+    "python backfill_activity.py",
+    "python backfill_embedded_progress.py",
+    "python rebuild_leaderboards.py",
+)
+
+
+def student_email(index: int) -> str:
+    return f"bench-student-{index}@progress.test"
+
+
+def mentor_email(index: int) -> str:
+    return f"bench-mentor-{index}@progress.test"
+
+
+def hash_passwords(password: str, count: int, workers: int = None) -> list:
+    """
+    Hash `password` `count` times (distinct salts) across a process pool.
+    Users are assigned hashes round-robin, so login cost stays realistic
+    without paying bcrypt once per generated user.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(hash_password, [password] * count))
+
+
+class BatchWriter:
+    """Buffers documents per collection and writes them with insert_many, a few chunks in flight"""
+
+    def __init__(self, db, chunk_size: int, concurrency: int):
+        self.db = db
+        self.chunk_size = chunk_size
+        self._buffers = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending = set()
+        self.counts = {}
+
+    async def add(self, collection: str, document: dict) -> None:
+        buffer = self._buffers.setdefault(collection, [])
+        buffer.append(document)
+        if len(buffer) >= self.chunk_size:
+            await self._flush(collection)
+
+    async def _flush(self, collection: str) -> None:
+        chunk = self._buffers.pop(collection, [])
+        if not chunk:
+            return
+        self.counts[collection] = self.counts.get(collection, 0) + len(chunk)
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._write(collection, chunk))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _write(self, collection: str, chunk: list) -> None:
+        try:
+            await self.db[collection].insert_many(chunk, ordered=False)
+        finally:
+            self._semaphore.release()
+
+    async def close(self) -> None:
+        for collection in list(self._buffers):
+            await self._flush(collection)
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+
+class DataGenerator:
+    """Builds the synthetic dataset described by the parsed CLI arguments"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = args.now
+        self.lesson_types = [lesson_type.value for lesson_type in LessonType]
+
+    def object_id(self) -> ObjectId:
+        """ObjectId drawn from the seeded RNG so reruns produce identical ids"""
+        return ObjectId(self.rng.randbytes(12))
+
+    def popularity(self, course_ids: list) -> tuple:
+        """Zipf weights over a shuffled course order, as cumulative weights for bisect"""
+        ranked = list(course_ids)
+        self.rng.shuffle(ranked)
+        weights = [1.0 / (rank ** self.args.skew) for rank in range(1, len(ranked) + 1)]
+        return ranked, list(itertools.accumulate(weights))
+
+    def pick_courses(self, ranked: list, cum_weights: list, count: int) -> list:
+        """Draw `count` distinct courses; a dict keeps draw order so output stays deterministic"""
+        chosen = {}
+        total = cum_weights[-1]
+        while len(chosen) < count:
+            chosen[ranked[bisect.bisect_left(cum_weights, self.rng.random() * total)]] = True
+        return list(chosen)
+
+    async def generate(self, writer: BatchWriter, password_hashes: list) -> None:
+        args, rng = self.args, self.rng
+
+        mentor_ids = []
+        for i in range(args.mentors):
+            mentor_id = self.object_id()
+            mentor_ids.append(str(mentor_id))
+            await writer.add("users", {
+                "_id": mentor_id,
+                "email": mentor_email(i),
+                "role": UserRole.MENTOR.value,
+                "hashed_password": password_hashes[i % len(password_hashes)],
+                "created_at": self.now - timedelta(days=rng.randint(30, 720)),
+            })
+
+        student_ids = []
+        for i in range(args.students):
+            student_id = self.object_id()
+            student_ids.append(str(student_id))
+            await writer.add("users", {
+                "_id": student_id,
+                "email": student_email(i),
+                "role": UserRole.STUDENT.value,
+                "hashed_password": password_hashes[(args.mentors + i) % len(password_hashes)],
+                "created_at": self.now - timedelta(days=rng.randint(1, 365)),
+            })
+
+        lessons_by_course = {}
+        mentor_by_course = {}
+        for i in range(args.courses):
+            course_id = self.object_id()
+            created_at = self.now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1439))
+            mentor_id = mentor_ids[i % len(mentor_ids)]
+            mentor_by_course[str(course_id)] = mentor_id
+            await writer.add("courses", {
+                "_id": course_id,
+                "title": f"Course {i}",
+                "description": f"Synthetic course {i} generated for benchmarking",
+                "mentor_id": mentor_id,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            lesson_ids = []
+            for order in range(rng.randint(args.min_lessons, args.max_lessons)):
+                lesson_id = self.object_id()
+                lesson_ids.append(str(lesson_id))
+                await writer.add("lessons", {
+                    "_id": lesson_id,
+                    "course_id": str(course_id),
+                    "title": f"Lesson {order + 1}",
+                    "description": f"Synthetic lesson {order + 1} of course {i}",
+                    "type": rng.choice(self.lesson_types),
+                    "order": order,
+                    "duration": rng.randint(5, 60),
+                    "created_at": created_at,
+                })
+            lessons_by_course[str(course_id)] = lesson_ids
+
+        ranked, cum_weights = self.popularity(list(lessons_by_course))
+        max_enrollments = min(args.max_enrollments, len(ranked))
+        for student_id in student_ids:
+            count = min(max_enrollments, max(1, round(rng.expovariate(1 / args.enrollments))))
+            for course_id in self.pick_courses(ranked, cum_weights, count):
+                requested_at = self.now - timedelta(days=rng.randint(1, 180), minutes=rng.randint(0, 1439))
+                roll = rng.random()
+                if roll < args.pending_ratio:
+                    status = EnrollmentStatus.PENDING
+                elif roll < args.pending_ratio + args.rejected_ratio:
+                    status = EnrollmentStatus.REJECTED
+                else:
+                    status = EnrollmentStatus.APPROVED
+                enrollment = {
+                    "_id": self.object_id(),
+                    "student_id": student_id,
+                    "course_id": course_id,
+                    "status": status.value,
+                    "requested_at": requested_at,
+                }
+                if status == EnrollmentStatus.APPROVED:
+                    approved_at = requested_at + timedelta(hours=rng.randint(1, 72))
+                    enrollment["approved_at"] = approved_at
+                    enrollment["approved_by"] = mentor_by_course[course_id]
+                    await self._progress(writer, student_id, course_id, lessons_by_course[course_id], approved_at)
+                await writer.add("enrollments", enrollment)
+
+    async def _progress(self, writer: BatchWriter, student_id: str, course_id: str,
+                        lesson_ids: list, approved_at: datetime) -> None:
+        """Students work through lessons in order; most stop part-way (Beta-distributed)"""
+        completed = int(len(lesson_ids) * self.rng.betavariate(self.args.progress_alpha, self.args.progress_beta))
+        span_hours = max(1, int((self.now - approved_at).total_seconds() // 3600))
+        offsets = sorted(self.rng.randint(1, span_hours) for _ in range(completed))
+        for lesson_id, offset in zip(lesson_ids, offsets):
+            await writer.add("progress", {
+                "_id": self.object_id(),
+                "student_id": student_id,
+                "lesson_id": lesson_id,
+                "course_id": course_id,
+                "completed": True,
+                "completed_at": approved_at + timedelta(hours=offset),
+            })
+
+
+async def generate_data(args) -> dict:
+    """Generate the dataset described by `args` and return a summary"""
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(f"mongodb://{MONGO_HOST}:{MONGO_PORT}")
+    db = client[args.database or MONGO_DB]
+
+    try:
+        if args.drop:
+            for name in GENERATED_COLLECTIONS + DERIVED_COLLECTIONS:
+                await db.drop_collection(name)
+
+        # Hash while nothing else is running; the pool uses every core
+        loop = asyncio.get_running_loop()
+        password_hashes = await loop.run_in_executor(
+            None, hash_passwords, args.password, args.password_pool, args.workers
+        )
+        hashed_at = time.perf_counter()
+
+        writer = BatchWriter(db, args.chunk_size, args.insert_concurrency)
+        await DataGenerator(args).generate(writer, password_hashes)
+        await writer.close()
+
+        # Direct inserts bypass the API; move the catalog counter so cached pages revalidate.
+        # --drop restarts it, so use a value no earlier counter or run can have produced
+        await db.cache_versions.update_one(
+            {"_id": "catalog"},
+            {"$set": {"version": time.time_ns(), "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+    finally:
+        client.close()
+
+    return {
+        **writer.counts,
+        "seed": args.seed,
+        "hash_seconds": round(hashed_at - started, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--mentors", type=int, default=200)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--lessons", type=int, help="Lessons per course (sets both --min-lessons and --max-lessons)")
+    parser.add_argument("--min-lessons", type=int, default=20)
+    parser.add_argument("--max-lessons", type=int, default=60)
+    parser.add_argument("--enrollments", type=float, default=5, help="Mean enrollments per student")
+    parser.add_argument("--max-enrollments", type=int, default=50)
+    parser.add_argument("--pending-ratio", type=float, default=0.15)
+    parser.add_argument("--rejected-ratio", type=float, default=0.05)
+    parser.add_argument("--progress-alpha", type=float, default=1.5, help="Beta distribution alpha for completion")
+    parser.add_argument("--progress-beta", type=float, default=2.5, help="Beta distribution beta for completion")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for course popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        default=datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0),
+                        help="Reference time for generated timestamps (ISO format, default today 00:00 UTC)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password shared by all generated users")
+    parser.add_argument("--password-pool", type=int, default=16, help="Number of distinct bcrypt hashes")
+    parser.add_argument("--workers", type=int, help="Processes used for bcrypt (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Documents per insert_many")
+    parser.add_argument("--insert-concurrency", type=int, default=4, help="insert_many calls in flight")
+    parser.add_argument("--database", help="Database name (defaults to MONGO_DB)")
+    parser.add_argument("--drop", action="store_true", help="Drop the generated and derived collections first")
+    args = parser.parse_args(argv)
+    if args.lessons is not None:
+        args.min_lessons = args.max_lessons = args.lessons
+    if args.mentors < 1 or args.courses < 1:
+        parser.error("--mentors and --courses must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    summary = asyncio.run(generate_data(parse_args()))
+    print("🎉 Data generation completed")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
+    print("\n📝 Build the derived collections next:")
+    for command in FOLLOW_UP_SCRIPTS:
+        print(f"   {command}")
@@ -4,6 +4,12 @@ from fastapi import FastAPI
 import uvicorn
 from api.router_config import api_router
 from core import mongodb
+from core.metrics import MetricsMiddleware, start_metrics_flusher, flush_worker_snapshot
+from core.background import background_tasks
+from core.profiling import ProfilingMiddleware, PROFILING_ENABLED
+from core.compression import CompressionMiddleware, COMPRESSION_ENABLED
+from core.log_config import setup_logging, shutdown_logging
+from services.authorization_service import authorization_service
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
@@ -12,8 +18,8 @@ import asyncio
 
 SERVER_PORT = int(os.getenv("SERVER_PORT", 5001))
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queue-based, see core/log_config.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -23,11 +29,19 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting FastAPI application.")
     await mongodb.connect_mongodb()
+    metrics_flusher = start_metrics_flusher()
+    authz_listener = authorization_service.start_listener()
 
     yield 
 
+    authz_listener.cancel()
+    if metrics_flusher:
+        metrics_flusher.cancel()
+        await flush_worker_snapshot()
+    await background_tasks.drain()
     await mongodb.disconnect_mongodb()
     logger.info("Stopping FastAPI application.")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -50,6 +64,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Only installed when enabled, so there is no per-request cost otherwise
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outermost middleware so latency covers the whole request
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, Field
 from models.progress import CourseProgress
 from models.enrollment import Enrollment
@@ -38,6 +38,9 @@ class CourseInDB(BaseModel):
     mentor_id: str
     created_at: datetime
     updated_at: datetime
+    # Bumped on every lesson create/update/delete; lessons have no updated_at
+    lessons_version: int = 0
+    lessons_updated_at: Optional[datetime] = None
     
     class Config:
         populate_by_name = True
@@ -48,3 +51,14 @@ class CourseWithProgress(Course):
     progress: Optional[CourseProgress] = None
     enrollment: Optional[Enrollment] = None
 
+
+
+class CourseWithEnrollment(Course):
+    """Catalog course annotated with the caller's enrollment, if any"""
+    enrollment: Optional[Enrollment] = None
+
+
+class CourseSearchResult(CourseWithEnrollment):
+    """Course matched by a search, with its relevance rank"""
+    score: float
+    matched_lessons: List[str] = []
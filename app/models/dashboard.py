@@ -0,0 +1,38 @@
+from typing import List
+from pydantic import BaseModel
+from models.course import Course, CourseWithProgress, CourseWithEnrollment
+from models.enrollment import Enrollment
+from models.pagination import PaginatedResponse
+from models.student_stats import StudentStats
+
+
+class StudentDashboard(BaseModel):
+    """Everything the student dashboard renders, in one response"""
+    stats: StudentStats
+    courses: PaginatedResponse[CourseWithProgress]
+    pending_requests: List[CourseWithEnrollment]
+
+
+class EnrollmentCounts(BaseModel):
+    """Enrollments in a course by status"""
+    pending: int = 0
+    approved: int = 0
+    rejected: int = 0
+
+
+class MentorCourseSummary(Course):
+    """Mentor's course with its enrollment totals"""
+    enrollment_counts: EnrollmentCounts
+
+
+class PendingEnrollment(Enrollment):
+    """Pending enrollment request with the title of the requested course"""
+    course_title: str
+
+
+class MentorDashboard(BaseModel):
+    """Everything the mentor dashboard renders, in one response"""
+    courses: PaginatedResponse[MentorCourseSummary]
+    pending_requests: List[PendingEnrollment]
+    pending_total: int
+    enrolled_students: int
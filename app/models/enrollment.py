@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 from pydantic import BaseModel, Field
 
@@ -22,6 +22,19 @@ class EnrollmentUpdate(BaseModel):
     approved_by: Optional[str] = None
 
 
+class BulkEnrollmentAction(str, Enum):
+    """Bulk enrollment decision"""
+    APPROVE = "approve"
+    REJECT = "reject"
+
+
+class BulkEnrollmentUpdate(BaseModel):
+    """Bulk approve/reject request; give enrollment_ids, course_id (all pending in the course) or both"""
+    action: BulkEnrollmentAction
+    enrollment_ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    course_id: Optional[str] = None
+
+
 class Enrollment(BaseModel):
     """Enrollment response model"""
     id: str = Field(..., alias="_id")
@@ -31,6 +44,7 @@ class Enrollment(BaseModel):
     requested_at: datetime
     approved_at: Optional[datetime] = None
     approved_by: Optional[str] = None
+    version: int = 0
     
     class Config:
         populate_by_name = True
@@ -45,7 +59,29 @@ class EnrollmentInDB(BaseModel):
     requested_at: datetime
     approved_at: Optional[datetime] = None
     approved_by: Optional[str] = None
+    version: int = 0
     
     class Config:
         populate_by_name = True
 
+
+
+class TransitionOutcome(str, Enum):
+    """Result of a conditional enrollment status change"""
+    UPDATED = "UPDATED"
+    CONFLICT = "CONFLICT"
+    NOT_FOUND = "NOT_FOUND"
+
+
+class EnrollmentTransition(BaseModel):
+    """Conditional status change result: the updated enrollment, or the current one on conflict"""
+    outcome: TransitionOutcome
+    enrollment: Optional[EnrollmentInDB] = None
+
+
+class BulkEnrollmentResult(BaseModel):
+    """Outcome of a bulk approve/reject"""
+    status: EnrollmentStatus
+    updated: int
+    skipped: int = 0
+    enrollments: List[Enrollment] = []
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    """A student's position on a leaderboard"""
+    rank: int
+    student_id: str
+    score: int
+    reached_at: datetime
+
+
+class Leaderboard(BaseModel):
+    """Top learners of a course (or all courses when course_id is None)
+
+    Score is the number of completed lessons; students with the same score
+    are ranked by who reached it first.
+    """
+    course_id: Optional[str] = None
+    total_students: int
+    entries: List[LeaderboardEntry]
+    me: Optional[LeaderboardEntry] = None
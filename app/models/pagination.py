@@ -1,9 +1,16 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Optional
+from enum import Enum
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
 
 
+class SortOrder(str, Enum):
+    """Sort direction for list endpoints"""
+    ASC = "asc"
+    DESC = "desc"
+
+
 class PaginationParams(BaseModel):
     """Pagination parameters for API requests"""
     page: int = Field(default=1, ge=1, description="Page number (starts at 1)")
@@ -39,3 +46,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
             has_prev=page > 1
         )
 
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Cursor-paginated response; pass next_cursor back to get the following page"""
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
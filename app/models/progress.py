@@ -1,8 +1,21 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, date
+from typing import Optional, List
+from enum import Enum
 from pydantic import BaseModel, Field
 
 
+class ExportFormat(str, Enum):
+    """Course progress export format"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class HistoryBucket(str, Enum):
+    """Width of the buckets in a progress history"""
+    DAY = "day"
+    WEEK = "week"
+
+
 class ProgressCreate(BaseModel):
     """Progress creation model"""
     lesson_id: str
@@ -41,3 +54,56 @@ class CourseProgress(BaseModel):
     completed_lessons: int
     completion_percentage: float
 
+
+class LessonFunnelStep(BaseModel):
+    """Completions of one lesson within a course funnel"""
+    lesson_id: str
+    title: str
+    order: int
+    completed_students: int
+    completion_rate: float
+
+
+class CourseAnalytics(BaseModel):
+    """Completion funnel and activity summary for a course"""
+    course_id: str
+    total_lessons: int
+    enrolled_students: int
+    started_students: int
+    active_students: int
+    active_window_days: int
+    median_hours_between_completions: Optional[float] = None
+    lessons: List[LessonFunnelStep]
+    generated_at: datetime
+
+
+class ActivityDay(BaseModel):
+    """Activity of a course on one UTC day, read from the daily rollups"""
+    day: date
+    completions: int = 0
+    active_students: int = 0
+    new_enrollments: int = 0
+
+
+class StudentCourseProgress(CourseProgress):
+    """Course progress summary for one student (mentor cohort view)"""
+    student_id: str
+
+
+class ProgressHistoryPoint(BaseModel):
+    """Completions of a student in one UTC day or ISO week (starting Monday)"""
+    start: date
+    completions: int = 0
+    courses: int = 0
+
+
+class ProgressHistory(BaseModel):
+    """A student's completions over time across all courses, with streaks in UTC days"""
+    bucket: HistoryBucket
+    start: date
+    end: date
+    points: List[ProgressHistoryPoint]
+    total_completions: int
+    active_days: int
+    current_streak_days: int
+    longest_streak_days: int
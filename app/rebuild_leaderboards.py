@@ -0,0 +1,132 @@
+"""
+Rebuild job for the course and global leaderboards
+Run this script: python rebuild_leaderboards.py [--batch-size 200] [--write-batch 1000]
+
+Recomputes `leaderboard_entries` from the `progress` collection: course
+scores a batch of courses at a time, then global scores in one grouped
+pass written in batches. Scores are overwritten, so the job can be rerun
+safely. Entries that received no score are removed, except those the API
+updated after the job started; a completion recorded by the API for a
+student the job has already written may be overwritten, so rerun the job
+if it overlapped heavy traffic.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Load environment variables
+load_dotenv()
+
+# Import after loading env
+from core import mongodb
+from repository.leaderboard_repository import leaderboard_repository, GLOBAL_SCOPE
+
+# MongoDB connection details
+MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
+MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
+MONGO_DB = os.getenv('MONGO_DB', 'progress_db')
+
+
+def scores_pipeline(group_id, match: dict) -> list:
+    """Completed lessons and latest completion per group"""
+    return [
+        {"$match": {**match, "completed": True}},
+        {"$group": {
+            "_id": group_id,
+            "score": {"$sum": 1},
+            "reached_at": {"$max": "$completed_at"}
+        }}
+    ]
+
+
+async def rebuild_course_batch(db, course_ids: list, rebuilt_at: datetime) -> int:
+    """Rebuild the leaderboards of one batch of courses, returning the number of entries written"""
+    pipeline = scores_pipeline(
+        {"course_id": "$course_id", "student_id": "$student_id"},
+        {"course_id": {"$in": course_ids}}
+    )
+    entries = [{
+        "scope": row["_id"]["course_id"],
+        "student_id": row["_id"]["student_id"],
+        "score": row["score"],
+        "reached_at": row["reached_at"] or rebuilt_at
+    } async for row in db.progress.aggregate(pipeline)]
+
+    written = await leaderboard_repository.replace_scores(entries, rebuilt_at)
+    await leaderboard_repository.delete_stale(course_ids, rebuilt_at)
+    return written
+
+
+async def rebuild_global(db, write_batch: int, rebuilt_at: datetime) -> int:
+    """Rebuild the global leaderboard, returning the number of entries written"""
+    written = 0
+    entries = []
+    cursor = db.progress.aggregate(scores_pipeline("$student_id", {}), allowDiskUse=True)
+    async for row in cursor:
+        entries.append({
+            "scope": GLOBAL_SCOPE,
+            "student_id": row["_id"],
+            "score": row["score"],
+            "reached_at": row["reached_at"] or rebuilt_at
+        })
+        if len(entries) >= write_batch:
+            written += await leaderboard_repository.replace_scores(entries, rebuilt_at)
+            entries = []
+    written += await leaderboard_repository.replace_scores(entries, rebuilt_at)
+    await leaderboard_repository.delete_stale([GLOBAL_SCOPE], rebuilt_at)
+    return written
+
+
+async def rebuild_leaderboards(args) -> dict:
+    """Rebuild every leaderboard and return a summary"""
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(f"mongodb://{MONGO_HOST}:{MONGO_PORT}")
+    db = client[args.database or MONGO_DB]
+    # The repositories read the module-level database
+    mongodb.database = db
+
+    rebuilt_at = datetime.utcnow()
+    courses = course_entries = 0
+
+    try:
+        batch = []
+        async for course in db.courses.find({}, {"_id": 1}).sort("_id", 1):
+            batch.append(str(course["_id"]))
+            if len(batch) >= args.batch_size:
+                course_entries += await rebuild_course_batch(db, batch, rebuilt_at)
+                courses += len(batch)
+                print(f"   ... {courses} courses, {course_entries} entries")
+                batch = []
+        if batch:
+            course_entries += await rebuild_course_batch(db, batch, rebuilt_at)
+            courses += len(batch)
+
+        global_entries = await rebuild_global(db, args.write_batch, rebuilt_at)
+    finally:
+        client.close()
+
+    return {
+        "courses": courses,
+        "course_entries": course_entries,
+        "global_entries": global_entries,
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the course and global leaderboards from progress")
+    parser.add_argument("--batch-size", type=int, default=200, help="Courses per aggregation batch")
+    parser.add_argument("--write-batch", type=int, default=1000, help="Global entries per bulk write")
+    parser.add_argument("--database", help="Database name (defaults to MONGO_DB)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    summary = asyncio.run(rebuild_leaderboards(parse_args()))
+    print("🎉 Leaderboard rebuild completed")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
@@ -0,0 +1,109 @@
+"""
+Rebuild the course search index
+Run this script: python rebuild_search_index.py [--batch-size 500]
+
+Upserts a search document for every course and lesson and removes search
+documents whose course or lesson no longer exists. Safe to rerun; the API
+keeps the index current afterwards.
+"""
+import argparse
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Load environment variables
+load_dotenv()
+
+# Import after loading env
+from core import mongodb
+from models.course import CourseInDB
+from models.lesson import LessonInDB
+from repository.search_repository import search_repository
+
+# MongoDB connection details
+MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
+MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
+MONGO_DB = os.getenv('MONGO_DB', 'progress_db')
+
+
+async def rebuild_search_index(args) -> dict:
+    """Index every course and lesson and return a summary"""
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(f"mongodb://{MONGO_HOST}:{MONGO_PORT}")
+    db = client[args.database or MONGO_DB]
+    # The repositories read the module-level database
+    mongodb.database = db
+    await mongodb.initialize_collections()
+
+    created_at_by_course = {}
+    indexed_ids = set()
+    batch = []
+
+    async def add(document: dict) -> None:
+        nonlocal batch
+        indexed_ids.add(document["_id"])
+        batch.append(document)
+        if len(batch) >= args.batch_size:
+            await search_repository.upsert_documents(batch)
+            batch = []
+
+    try:
+        async for course in db.courses.find({}):
+            course_in_db = CourseInDB(
+                _id=str(course["_id"]),
+                title=course["title"],
+                description=course["description"],
+                mentor_id=course["mentor_id"],
+                created_at=course["created_at"],
+                updated_at=course["updated_at"]
+            )
+            created_at_by_course[course_in_db.id] = course_in_db.created_at
+            await add(search_repository.course_document(course_in_db))
+
+        async for lesson in db.lessons.find({}):
+            course_created_at = created_at_by_course.get(lesson["course_id"])
+            if course_created_at is None:
+                continue
+            lesson_in_db = LessonInDB(
+                _id=str(lesson["_id"]),
+                course_id=lesson["course_id"],
+                title=lesson["title"],
+                description=lesson.get("description", ""),
+                type=lesson["type"],
+                order=lesson["order"],
+                duration=lesson.get("duration"),
+                created_at=lesson["created_at"]
+            )
+            await add(search_repository.lesson_document(lesson_in_db, course_created_at))
+
+        await search_repository.upsert_documents(batch)
+
+        stale = [d["_id"] async for d in search_repository.collection.find({}, {"_id": 1})
+                 if d["_id"] not in indexed_ids]
+        if stale:
+            await search_repository.collection.delete_many({"_id": {"$in": stale}})
+    finally:
+        client.close()
+
+    return {
+        "courses": len(created_at_by_course),
+        "documents": len(indexed_ids),
+        "removed": len(stale),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the course search index")
+    parser.add_argument("--batch-size", type=int, default=500, help="Search documents per bulk write")
+    parser.add_argument("--database", help="Database name (defaults to MONGO_DB)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    summary = asyncio.run(rebuild_search_index(parse_args()))
+    print("🎉 Search index rebuilt")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
@@ -0,0 +1,120 @@
+from typing import List, Dict
+from datetime import datetime
+from pymongo import UpdateOne
+from core.mongodb import get_database
+import logging
+from core.query_monitor import monitor_repository
+
+logger = logging.getLogger(__name__)
+
+
+def day_start(at: datetime) -> datetime:
+    """Truncate a naive UTC datetime to midnight, the rollup bucket key"""
+    return datetime(at.year, at.month, at.day)
+
+
+@monitor_repository
+class ActivityRepository:
+    """
+    Repository for the per-course daily activity rollups.
+    
+    `activity_daily` holds one small document per course and UTC day with
+    completion, active student and new enrollment counters. Distinct active
+    students are counted through `activity_daily_students` markers: the
+    counter is only incremented when the marker upsert inserts a new document.
+    Markers expire through a TTL index once their day can no longer change.
+    """
+    
+    def __init__(self):
+        self.collection_name = "activity_daily"
+        self.markers_collection_name = "activity_daily_students"
+    
+    @property
+    def collection(self):
+        """Get activity_daily collection - lazily fetches database"""
+        db = get_database()
+        return db[self.collection_name]
+    
+    @property
+    def markers_collection(self):
+        """Get activity_daily_students collection - lazily fetches database"""
+        db = get_database()
+        return db[self.markers_collection_name]
+    
+    async def _increment(self, course_id: str, day: datetime, completions: int = 0,
+                         active_students: int = 0, new_enrollments: int = 0) -> None:
+        # All counters are $inc'ed (some by 0) so a freshly upserted day has every field
+        await self.collection.update_one(
+            {"course_id": course_id, "day": day},
+            {"$inc": {
+                "completions": completions,
+                "active_students": active_students,
+                "new_enrollments": new_enrollments
+            }},
+            upsert=True
+        )
+    
+    async def record_completion(self, course_id: str, student_id: str, at: datetime) -> None:
+        """Count a new lesson completion, and the student as active if first that day"""
+        day = day_start(at)
+        marker = await self.markers_collection.update_one(
+            {"course_id": course_id, "day": day, "student_id": student_id},
+            {"$setOnInsert": {"created_at": at}},
+            upsert=True
+        )
+        await self._increment(
+            course_id, day,
+            completions=1,
+            active_students=1 if marker.upserted_id is not None else 0
+        )
+    
+    async def record_enrollment_approved(self, course_id: str, at: datetime, count: int = 1) -> None:
+        """Count `count` enrollments approved on the given day"""
+        await self._increment(course_id, day_start(at), new_enrollments=count)
+    
+    async def get_daily(self, course_id: str, start: datetime, end: datetime) -> List[Dict]:
+        """Get rollup documents for a course with start <= day < end, oldest first"""
+        cursor = self.collection.find(
+            {"course_id": course_id, "day": {"$gte": start, "$lt": end}},
+            {"_id": 0, "day": 1, "completions": 1, "active_students": 1, "new_enrollments": 1}
+        ).sort("day", 1)
+        return await cursor.to_list(length=None)
+    
+    async def replace_days(self, days: List[Dict]) -> int:
+        """
+        Overwrite the counters of the given (course_id, day) documents.
+        
+        Used by the backfill job; setting rather than incrementing makes
+        reruns idempotent.
+        """
+        if not days:
+            return 0
+        result = await self.collection.bulk_write([
+            UpdateOne(
+                {"course_id": d["course_id"], "day": d["day"]},
+                {"$set": {
+                    "completions": d.get("completions", 0),
+                    "active_students": d.get("active_students", 0),
+                    "new_enrollments": d.get("new_enrollments", 0)
+                }},
+                upsert=True
+            ) for d in days
+        ], ordered=False)
+        return result.upserted_count + result.modified_count
+    
+    async def add_markers(self, course_id: str, day: datetime, student_ids: List[str]) -> None:
+        """Create active-student markers so live updates don't recount backfilled students"""
+        if not student_ids:
+            return
+        created_at = datetime.utcnow()
+        await self.markers_collection.bulk_write([
+            UpdateOne(
+                {"course_id": course_id, "day": day, "student_id": student_id},
+                {"$setOnInsert": {"created_at": created_at}},
+                upsert=True
+            ) for student_id in student_ids
+        ], ordered=False)
+
+
+# Create singleton instance
+activity_repository = ActivityRepository()
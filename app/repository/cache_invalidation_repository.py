@@ -0,0 +1,63 @@
+from typing import AsyncIterator, Optional
+from datetime import datetime
+from bson import ObjectId
+from pymongo import CursorType, DESCENDING
+from core.mongodb import get_database
+import logging
+from core.query_monitor import monitor_repository
+
+logger = logging.getLogger(__name__)
+
+
+@monitor_repository
+class CacheInvalidationRepository:
+    """
+    Repository for cache invalidation events shared between workers.
+
+    The collection is capped (see initialize_collections), so it keeps only
+    recent events and can be followed with a tailable cursor. Each document
+    is {kind, key fields..., origin, at}; origin identifies the publishing
+    process so it can skip its own events.
+    """
+
+    def __init__(self):
+        self.collection_name = "cache_invalidations"
+
+    @property
+    def collection(self):
+        """Get cache_invalidations collection - lazily fetches database"""
+        db = get_database()
+        return db[self.collection_name]
+
+    async def publish(self, kind: str, origin: str, **fields) -> None:
+        """Append an invalidation event"""
+        await self.collection.insert_one({
+            "kind": kind,
+            **fields,
+            "origin": origin,
+            "at": datetime.utcnow()
+        })
+
+    async def latest_id(self) -> Optional[ObjectId]:
+        """Id of the newest event, so a new listener starts after it"""
+        document = await self.collection.find_one({}, {"_id": 1}, sort=[("$natural", DESCENDING)])
+        return document["_id"] if document else None
+
+    async def tail(self, after_id: Optional[ObjectId]) -> AsyncIterator[dict]:
+        """Yield events newer than after_id as they are inserted
+
+        The cursor waits on the server for new documents; it ends when the
+        cursor dies (e.g. the capped collection wrapped past it).
+        """
+        query = {"_id": {"$gt": after_id}} if after_id is not None else {}
+        cursor = self.collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+        try:
+            while cursor.alive:
+                async for event in cursor:
+                    yield event
+        finally:
+            await cursor.close()
+
+
+# Create singleton instance
+cache_invalidation_repository = CacheInvalidationRepository()
@@ -0,0 +1,48 @@
+from typing import Tuple, Optional
+from datetime import datetime
+from pymongo import ReturnDocument
+from core.mongodb import get_database
+import logging
+from core.query_monitor import monitor_repository
+
+logger = logging.getLogger(__name__)
+
+
+@monitor_repository
+class CacheVersionRepository:
+    """
+    Repository for named version counters used as HTTP cache validators.
+    
+    Each document is {_id: name, version, updated_at}; writers bump the
+    counter for data whose responses are cached, readers derive ETags from it.
+    """
+    
+    def __init__(self):
+        self.collection_name = "cache_versions"
+    
+    @property
+    def collection(self):
+        """Get cache_versions collection - lazily fetches database"""
+        db = get_database()
+        return db[self.collection_name]
+    
+    async def get_version(self, name: str) -> Tuple[int, Optional[datetime]]:
+        """Get (version, updated_at) for a counter; (0, None) if never bumped"""
+        document = await self.collection.find_one({"_id": name})
+        if not document:
+            return 0, None
+        return document["version"], document.get("updated_at")
+    
+    async def bump(self, name: str) -> int:
+        """Increment a counter, returning the new version"""
+        document = await self.collection.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return document["version"]
+
+
+# Create singleton instance
+cache_version_repository = CacheVersionRepository()
@@ -1,11 +1,17 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from datetime import datetime
 from bson import ObjectId
 from models.course import CourseCreate, CourseUpdate, CourseInDB
+from models.enrollment import EnrollmentInDB, EnrollmentStatus
 from core.mongodb import get_database
-from core.log_config import logger
+from repository.enrollment_repository import enrollment_repository
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+@monitor_repository
 class CourseRepository:
     """Repository for course database operations"""
     
@@ -31,7 +37,7 @@ class CourseRepository:
         result = await self.collection.insert_one(course_dict)
         created_course = await self.collection.find_one({"_id": result.inserted_id})
         
-        logger.info(f"Created course: {course.title} by mentor: {mentor_id}")
+        logger.info("Created course: %s by mentor: %s", course.title, mentor_id)
         
         return CourseInDB(
             _id=str(created_course["_id"]),
@@ -54,13 +60,36 @@ class CourseRepository:
                     description=course["description"],
                     mentor_id=course["mentor_id"],
                     created_at=course["created_at"],
-                    updated_at=course["updated_at"]
+                    updated_at=course["updated_at"],
+                    lessons_version=course.get("lessons_version", 0),
+                    lessons_updated_at=course.get("lessons_updated_at")
                 )
         except Exception as e:
-            logger.error(f"Error getting course by ID {course_id}: {e}")
+            logger.error("Error getting course by ID %s: %s", course_id, e)
         
         return None
     
+    async def get_courses_by_ids(self, course_ids: List[str]) -> Dict[str, CourseInDB]:
+        """Get several courses in one query, keyed by ID; unknown or invalid IDs are left out"""
+        object_ids = [ObjectId(course_id) for course_id in course_ids if ObjectId.is_valid(course_id)]
+        if not object_ids:
+            return {}
+        
+        courses = {}
+        async for course in self.collection.find({"_id": {"$in": object_ids}}):
+            courses[str(course["_id"])] = CourseInDB(
+                _id=str(course["_id"]),
+                title=course["title"],
+                description=course["description"],
+                mentor_id=course["mentor_id"],
+                created_at=course["created_at"],
+                updated_at=course["updated_at"],
+                lessons_version=course.get("lessons_version", 0),
+                lessons_updated_at=course.get("lessons_updated_at")
+            )
+        
+        return courses
+    
     async def get_courses_by_mentor(self, mentor_id: str, skip: int = 0, limit: int = 10) -> Tuple[List[CourseInDB], int]:
         """Get courses by a mentor with pagination
         
@@ -88,6 +117,39 @@ class CourseRepository:
         
         return courses, total
     
+    async def get_mentor_courses_overview(
+        self, mentor_id: str, skip: int = 0, limit: int = 10
+    ) -> Tuple[List[CourseInDB], int, Dict[str, str]]:
+        """Get a page of a mentor's courses, their total and every course's title in one $facet
+        
+        Returns:
+            Tuple of (courses page, total count, {course_id: title} for all the mentor's courses)
+        """
+        pipeline = [
+            {"$match": {"mentor_id": mentor_id}},
+            {"$sort": {"created_at": -1}},
+            {"$facet": {
+                "page": [{"$skip": skip}, {"$limit": limit}],
+                "titles": [{"$project": {"title": 1}}]
+            }}
+        ]
+        
+        result = {"page": [], "titles": []}
+        async for row in self.collection.aggregate(pipeline):
+            result = row
+        
+        courses = [CourseInDB(
+            _id=str(course["_id"]),
+            title=course["title"],
+            description=course["description"],
+            mentor_id=course["mentor_id"],
+            created_at=course["created_at"],
+            updated_at=course["updated_at"]
+        ) for course in result["page"]]
+        titles = {str(course["_id"]): course["title"] for course in result["titles"]}
+        
+        return courses, len(titles), titles
+    
     async def get_all_courses(self, skip: int = 0, limit: int = 10) -> Tuple[List[CourseInDB], int]:
         """Get all courses with pagination
         
@@ -114,6 +176,59 @@ class CourseRepository:
             ))
         
         return courses, total
+
+    async def get_catalog_stats(self) -> Tuple[int, Optional[datetime]]:
+        """Get (course count, latest updated_at) over all courses; (0, None) if there are none"""
+        cursor = self.collection.aggregate([
+            {"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}}
+        ])
+        stats = await cursor.to_list(length=1)
+        if not stats:
+            return 0, None
+        return stats[0]["count"], stats[0]["updated_at"]
+
+    async def get_all_courses_with_enrollment(
+        self, student_id: str, skip: int = 0, limit: int = 10
+    ) -> Tuple[List[Tuple[CourseInDB, Optional[EnrollmentInDB]]], int]:
+        """Get all courses with pagination, each with the student's enrollment if any
+        
+        Returns:
+            Tuple of ([(course, enrollment or None)], total count)
+        """
+        total = await self.collection.count_documents({})
+        
+        pipeline = [
+            {"$sort": {"created_at": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            enrollment_repository.student_lookup_stage(student_id, {"$toString": "$_id"})
+        ]
+        
+        courses = []
+        async for course in self.collection.aggregate(pipeline):
+            enrollment = course["enrollment"][0] if course["enrollment"] else None
+            courses.append((
+                CourseInDB(
+                    _id=str(course["_id"]),
+                    title=course["title"],
+                    description=course["description"],
+                    mentor_id=course["mentor_id"],
+                    created_at=course["created_at"],
+                    updated_at=course["updated_at"]
+                ),
+                EnrollmentInDB(
+                    _id=str(enrollment["_id"]),
+                    student_id=enrollment["student_id"],
+                    course_id=enrollment["course_id"],
+                    status=EnrollmentStatus(enrollment["status"]),
+                    requested_at=enrollment["requested_at"],
+                    approved_at=enrollment.get("approved_at"),
+                    approved_by=enrollment.get("approved_by"),
+                    version=enrollment.get("version", 0)
+                ) if enrollment else None
+            ))
+        
+        return courses, total
     
     async def update_course(self, course_id: str, course_update: CourseUpdate) -> Optional[CourseInDB]:
         """Update course"""
@@ -135,23 +250,33 @@ class CourseRepository:
             )
             
             if result.modified_count > 0:
-                logger.info(f"Updated course: {course_id}")
+                logger.info("Updated course: %s", course_id)
                 return await self.get_course_by_id(course_id)
         except Exception as e:
-            logger.error(f"Error updating course {course_id}: {e}")
+            logger.error("Error updating course %s: %s", course_id, e)
         
         return None
     
+    async def bump_lessons_version(self, course_id: str) -> None:
+        """Record that the course's lesson set changed (for HTTP cache validators)"""
+        try:
+            await self.collection.update_one(
+                {"_id": ObjectId(course_id)},
+                {"$inc": {"lessons_version": 1}, "$set": {"lessons_updated_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.error("Error bumping lessons version of course %s: %s", course_id, e)
+    
     async def delete_course(self, course_id: str) -> bool:
         """Delete course"""
         try:
             result = await self.collection.delete_one({"_id": ObjectId(course_id)})
             
             if result.deleted_count > 0:
-                logger.info(f"Deleted course: {course_id}")
+                logger.info("Deleted course: %s", course_id)
                 return True
         except Exception as e:
-            logger.error(f"Error deleting course {course_id}: {e}")
+            logger.error("Error deleting course %s: %s", course_id, e)
         
         return False
 
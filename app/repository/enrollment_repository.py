@@ -1,11 +1,30 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 from bson import ObjectId
-from models.enrollment import EnrollmentCreate, EnrollmentStatus, EnrollmentInDB
+from pymongo import ReturnDocument, UpdateOne
+from models.enrollment import (
+    EnrollmentCreate,
+    EnrollmentStatus,
+    EnrollmentInDB,
+    EnrollmentTransition,
+    TransitionOutcome,
+)
+from models.progress import ProgressInDB
 from core.mongodb import get_database
-from core.log_config import logger
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+async def _next_or_none(cursor) -> Optional[dict]:
+    try:
+        return await cursor.next()
+    except StopAsyncIteration:
+        return None
+
+
+@monitor_repository
 class EnrollmentRepository:
     """Repository for enrollment database operations"""
     
@@ -18,6 +37,26 @@ class EnrollmentRepository:
         db = get_database()
         return db[self.collection_name]
     
+    def student_lookup_stage(self, student_id: str, course_id_expression, as_field: str = "enrollment") -> dict:
+        """
+        $lookup stage joining a student's enrollment onto course documents.
+        
+        The student_id equality is a literal, so each lookup is a point read
+        on the (student_id, course_id) index.
+        """
+        return {"$lookup": {
+            "from": self.collection_name,
+            "let": {"course_id": course_id_expression},
+            "pipeline": [
+                {"$match": {
+                    "student_id": student_id,
+                    "$expr": {"$eq": ["$course_id", "$$course_id"]}
+                }},
+                {"$limit": 1}
+            ],
+            "as": as_field
+        }}
+    
     async def create_enrollment_request(self, enrollment: EnrollmentCreate, student_id: str) -> EnrollmentInDB:
         """Create a new enrollment request"""
         enrollment_dict = {
@@ -26,13 +65,18 @@ class EnrollmentRepository:
             "status": EnrollmentStatus.PENDING.value,
             "requested_at": datetime.utcnow(),
             "approved_at": None,
-            "approved_by": None
+            "approved_by": None,
+            "version": 0,
+            # Nothing can be completed yet, so the embedded progress starts in sync
+            "completed_lessons": [],
+            "completed_count": 0,
+            "progress_embedded": True
         }
         
         result = await self.collection.insert_one(enrollment_dict)
         created_enrollment = await self.collection.find_one({"_id": result.inserted_id})
         
-        logger.info(f"Created enrollment request: student {student_id} for course {enrollment.course_id}")
+        logger.info("Created enrollment request: student %s for course %s", student_id, enrollment.course_id)
         
         return EnrollmentInDB(
             _id=str(created_enrollment["_id"]),
@@ -41,16 +85,25 @@ class EnrollmentRepository:
             status=EnrollmentStatus(created_enrollment["status"]),
             requested_at=created_enrollment["requested_at"],
             approved_at=created_enrollment.get("approved_at"),
-            approved_by=created_enrollment.get("approved_by")
+            approved_by=created_enrollment.get("approved_by"),
+            version=created_enrollment.get("version", 0)
         )
     
-    async def get_enrollments_by_student(self, student_id: str, skip: int = 0, limit: int = 10) -> Tuple[List[EnrollmentInDB], int]:
-        """Get enrollments for a student with pagination
+    async def get_enrollments_by_student(
+        self,
+        student_id: str,
+        skip: int = 0,
+        limit: int = 10,
+        status: Optional[EnrollmentStatus] = None
+    ) -> Tuple[List[EnrollmentInDB], int]:
+        """Get enrollments for a student with pagination, optionally only those in `status`
         
         Returns:
             Tuple of (enrollments list, total count)
         """
         query = {"student_id": student_id}
+        if status is not None:
+            query["status"] = status.value
         
         # Get total count
         total = await self.collection.count_documents(query)
@@ -67,7 +120,8 @@ class EnrollmentRepository:
                 status=EnrollmentStatus(enrollment["status"]),
                 requested_at=enrollment["requested_at"],
                 approved_at=enrollment.get("approved_at"),
-                approved_by=enrollment.get("approved_by")
+                approved_by=enrollment.get("approved_by"),
+                version=enrollment.get("version", 0)
             ))
         
         return enrollments, total
@@ -85,7 +139,8 @@ class EnrollmentRepository:
                 status=EnrollmentStatus(enrollment["status"]),
                 requested_at=enrollment["requested_at"],
                 approved_at=enrollment.get("approved_at"),
-                approved_by=enrollment.get("approved_by")
+                approved_by=enrollment.get("approved_by"),
+                version=enrollment.get("version", 0)
             ))
         
         return enrollments
@@ -103,42 +158,119 @@ class EnrollmentRepository:
                     status=EnrollmentStatus(enrollment["status"]),
                     requested_at=enrollment["requested_at"],
                     approved_at=enrollment.get("approved_at"),
-                    approved_by=enrollment.get("approved_by")
+                    approved_by=enrollment.get("approved_by"),
+                    version=enrollment.get("version", 0)
                 )
         except Exception as e:
-            logger.error(f"Error getting enrollment by ID {enrollment_id}: {e}")
+            logger.error("Error getting enrollment by ID %s: %s", enrollment_id, e)
         
         return None
     
-    async def update_enrollment_status(
-        self, 
-        enrollment_id: str, 
-        status: EnrollmentStatus, 
-        approved_by: Optional[str] = None
-    ) -> Optional[EnrollmentInDB]:
-        """Update enrollment status"""
-        update_dict = {
-            "status": status.value
-        }
+    async def transition_status(
+        self,
+        enrollment_id: str,
+        to_status: EnrollmentStatus,
+        approved_by: str,
+        expected_version: Optional[int] = None,
+        from_status: EnrollmentStatus = EnrollmentStatus.PENDING
+    ) -> EnrollmentTransition:
+        """Move an enrollment from `from_status` to `to_status` atomically
         
-        if status in [EnrollmentStatus.APPROVED, EnrollmentStatus.REJECTED]:
-            update_dict["approved_at"] = datetime.utcnow()
-            if approved_by:
-                update_dict["approved_by"] = approved_by
+        The status (and expected_version, when given) is part of the update
+        filter, so of two concurrent transitions exactly one succeeds. The
+        other gets CONFLICT with the enrollment as it now is; only that
+        failure path costs a second read.
+        """
+        if not ObjectId.is_valid(enrollment_id):
+            return EnrollmentTransition(outcome=TransitionOutcome.NOT_FOUND)
         
-        try:
-            result = await self.collection.update_one(
-                {"_id": ObjectId(enrollment_id)},
-                {"$set": update_dict}
-            )
-            
-            if result.modified_count > 0:
-                logger.info(f"Updated enrollment {enrollment_id} status to {status.value}")
-                return await self.get_enrollment_by_id(enrollment_id)
-        except Exception as e:
-            logger.error(f"Error updating enrollment {enrollment_id}: {e}")
+        query = {"_id": ObjectId(enrollment_id), "status": from_status.value}
+        if expected_version is not None:
+            # Enrollments created before versioning have no field until their first change
+            query["version"] = expected_version if expected_version else {"$in": [0, None]}
         
-        return None
+        enrollment = await self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {"status": to_status.value, "approved_at": datetime.utcnow(), "approved_by": approved_by},
+                "$inc": {"version": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        outcome = TransitionOutcome.UPDATED
+        
+        if enrollment is None:
+            enrollment = await self.collection.find_one({"_id": ObjectId(enrollment_id)})
+            if enrollment is None:
+                return EnrollmentTransition(outcome=TransitionOutcome.NOT_FOUND)
+            outcome = TransitionOutcome.CONFLICT
+        else:
+            logger.info("Updated enrollment %s status to %s", enrollment_id, to_status.value)
+        
+        return EnrollmentTransition(outcome=outcome, enrollment=EnrollmentInDB(
+            _id=str(enrollment["_id"]),
+            student_id=enrollment["student_id"],
+            course_id=enrollment["course_id"],
+            status=EnrollmentStatus(enrollment["status"]),
+            requested_at=enrollment["requested_at"],
+            approved_at=enrollment.get("approved_at"),
+            approved_by=enrollment.get("approved_by"),
+            version=enrollment.get("version", 0)
+        ))
+    
+    async def get_pending_course_ids(self, enrollment_ids: List[str]) -> List[str]:
+        """Get the distinct course ids of the given enrollments that are still pending"""
+        return await self.collection.distinct("course_id", {
+            "_id": {"$in": [ObjectId(enrollment_id) for enrollment_id in enrollment_ids]},
+            "status": EnrollmentStatus.PENDING.value
+        })
+    
+    async def bulk_update_pending_status(
+        self,
+        query: dict,
+        status: EnrollmentStatus,
+        approved_by: str
+    ) -> List[EnrollmentInDB]:
+        """Move every pending enrollment matching `query` to `status` with one update_many
+        
+        Returns:
+            The enrollments this call changed. They are re-read by the exact
+            decision timestamp and mentor, so enrollments decided concurrently
+            by someone else are not reported as ours.
+        """
+        # Mongo stores milliseconds; truncate so the re-read matches exactly
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        
+        result = await self.collection.update_many(
+            {**query, "status": EnrollmentStatus.PENDING.value},
+            {"$set": {"status": status.value, "approved_at": now, "approved_by": approved_by}, "$inc": {"version": 1}}
+        )
+        if result.modified_count == 0:
+            return []
+        
+        logger.info("Bulk updated %s enrollments to %s", result.modified_count, status.value)
+        
+        enrollments = []
+        cursor = self.collection.find({
+            **query,
+            "status": status.value,
+            "approved_at": now,
+            "approved_by": approved_by
+        })
+        async for enrollment in cursor:
+            enrollments.append(EnrollmentInDB(
+                _id=str(enrollment["_id"]),
+                student_id=enrollment["student_id"],
+                course_id=enrollment["course_id"],
+                status=EnrollmentStatus(enrollment["status"]),
+                requested_at=enrollment["requested_at"],
+                approved_at=enrollment.get("approved_at"),
+                approved_by=enrollment.get("approved_by"),
+                version=enrollment.get("version", 0)
+            ))
+        
+        return enrollments
     
     async def check_enrollment_exists(self, student_id: str, course_id: str) -> Optional[EnrollmentInDB]:
         """Check if enrollment exists for student and course"""
@@ -155,10 +287,229 @@ class EnrollmentRepository:
                 status=EnrollmentStatus(enrollment["status"]),
                 requested_at=enrollment["requested_at"],
                 approved_at=enrollment.get("approved_at"),
-                approved_by=enrollment.get("approved_by")
+                approved_by=enrollment.get("approved_by"),
+                version=enrollment.get("version", 0)
             )
         
         return None
+    
+    async def record_lesson_completion(self, progress: ProgressInDB) -> None:
+        """Mirror a completed progress record into the enrollment's embedded progress
+        
+        completed_lessons holds {lesson_id, progress_id, completed_at} per
+        completed lesson and completed_count its length. A lesson is pushed
+        (and the counter incremented) only if it is not in the list yet, so
+        retries, concurrent requests and repeat completions (which keep
+        the first completed_at) add it once.
+        """
+        await self.collection.update_one(
+            {
+                "student_id": progress.student_id,
+                "course_id": progress.course_id,
+                "completed_lessons.lesson_id": {"$ne": progress.lesson_id}
+            },
+            {
+                "$push": {"completed_lessons": {
+                    "lesson_id": progress.lesson_id,
+                    "progress_id": progress.id,
+                    "completed_at": progress.completed_at
+                }},
+                "$inc": {"completed_count": 1}
+            }
+        )
+    
+    async def get_embedded_completed_count(self, student_id: str, course_id: str) -> Optional[int]:
+        """Completed lesson count from the enrollment, or None if its embedded progress is not in sync"""
+        enrollment = await self.collection.find_one(
+            {"student_id": student_id, "course_id": course_id, "progress_embedded": True},
+            {"completed_count": 1}
+        )
+        return enrollment.get("completed_count", 0) if enrollment else None
+    
+    async def get_embedded_progress(self, student_id: str, course_id: str) -> Optional[List[ProgressInDB]]:
+        """Completed lessons from the enrollment, or None if its embedded progress is not in sync"""
+        enrollment = await self.collection.find_one(
+            {"student_id": student_id, "course_id": course_id, "progress_embedded": True},
+            {"completed_lessons": 1}
+        )
+        
+        if not enrollment:
+            return None
+        
+        return [ProgressInDB(
+            _id=entry["progress_id"],
+            student_id=student_id,
+            lesson_id=entry["lesson_id"],
+            course_id=course_id,
+            completed=True,
+            completed_at=entry.get("completed_at")
+        ) for entry in enrollment.get("completed_lessons", [])]
+    
+    async def merge_embedded_progress(self, completed: dict) -> int:
+        """Merge completed lessons from the progress collection into enrollments and mark them in sync
+        
+        Args:
+            completed: {(student_id, course_id): [{lesson_id, progress_id, completed_at}]};
+                enrollments with nothing completed map to an empty list
+        
+        Entries already embedded are kept, so completions recorded by the
+        API while this runs are never lost. Returns the number of
+        enrollments modified.
+        """
+        if not completed:
+            return 0
+        
+        operations = []
+        for (student_id, course_id), entries in completed.items():
+            operations.append(UpdateOne(
+                {"student_id": student_id, "course_id": course_id},
+                [
+                    {"$set": {"completed_lessons": {"$let": {
+                        "vars": {"current": {"$ifNull": ["$completed_lessons", []]}},
+                        "in": {"$concatArrays": [
+                            "$$current",
+                            {"$filter": {
+                                "input": {"$literal": entries},
+                                "cond": {"$not": [{"$in": ["$$this.lesson_id", "$$current.lesson_id"]}]}
+                            }}
+                        ]}
+                    }}}},
+                    {"$set": {
+                        "completed_count": {"$size": "$completed_lessons"},
+                        "progress_embedded": True
+                    }}
+                ]
+            ))
+        
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+    
+    async def count_approved_by_course(self, course_id: str) -> int:
+        """Count approved enrollments in a course"""
+        return await self.collection.count_documents({
+            "course_id": course_id,
+            "status": EnrollmentStatus.APPROVED.value
+        })
+    
+    async def get_mentor_summary(self, course_ids: List[str], pending_limit: int = 20) -> dict:
+        """Summarize enrollments across a mentor's courses with one $facet
+        
+        Returns:
+            Dict with pending (newest first, at most pending_limit), pending_total,
+            student_count (distinct approved students) and per_course
+            ({course_id: {status: count}})
+        """
+        pending = {"status": EnrollmentStatus.PENDING.value}
+        pipeline = [
+            {"$match": {"course_id": {"$in": course_ids}}},
+            {"$facet": {
+                "pending": [{"$match": pending}, {"$sort": {"requested_at": -1}}, {"$limit": pending_limit}],
+                "pending_total": [{"$match": pending}, {"$count": "count"}],
+                "students": [
+                    {"$match": {"status": EnrollmentStatus.APPROVED.value}},
+                    {"$group": {"_id": "$student_id"}},
+                    {"$count": "count"}
+                ],
+                "per_course": [
+                    {"$group": {"_id": {"course_id": "$course_id", "status": "$status"}, "count": {"$sum": 1}}}
+                ]
+            }}
+        ]
+        
+        result = {"pending": [], "pending_total": [], "students": [], "per_course": []}
+        if course_ids:
+            async for row in self.collection.aggregate(pipeline):
+                result = row
+        
+        per_course = {}
+        for row in result["per_course"]:
+            per_course.setdefault(row["_id"]["course_id"], {})[row["_id"]["status"]] = row["count"]
+        
+        return {
+            "pending": [EnrollmentInDB(
+                _id=str(enrollment["_id"]),
+                student_id=enrollment["student_id"],
+                course_id=enrollment["course_id"],
+                status=EnrollmentStatus(enrollment["status"]),
+                requested_at=enrollment["requested_at"],
+                approved_at=enrollment.get("approved_at"),
+                approved_by=enrollment.get("approved_by"),
+                version=enrollment.get("version", 0)
+            ) for enrollment in result["pending"]],
+            "pending_total": result["pending_total"][0]["count"] if result["pending_total"] else 0,
+            "student_count": result["students"][0]["count"] if result["students"] else 0,
+            "per_course": per_course,
+        }
+    
+    async def get_approved_student_ids(
+        self,
+        course_id: str,
+        student_ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Get ids of students with an approved enrollment in a course, optionally restricted to `student_ids`"""
+        query = {"course_id": course_id, "status": EnrollmentStatus.APPROVED.value}
+        if student_ids is not None:
+            query["student_id"] = {"$in": student_ids}
+        return await self.collection.distinct("student_id", query)
+    
+    async def stream_course_progress(self, course_id: str, batch_size: int = 500) -> AsyncIterator[dict]:
+        """Stream approved enrollments of a course joined with student email and completed lessons
+        
+        Yields one document per student: student_id, email, approved_at and
+        progress (list of {lesson_id, completed, completed_at}). Enrollments
+        and the course's progress are read as two cursors sorted by
+        student_id (progress on its (course_id, student_id) index) and merged
+        here, so each progress document is read once whatever the cohort
+        size. Both cursors fetch `batch_size` documents per round trip and
+        only ask for the next batch once the consumer has drained the
+        previous one.
+        """
+        pipeline = [
+            {"$match": {"course_id": course_id, "status": EnrollmentStatus.APPROVED.value}},
+            {"$sort": {"student_id": 1}},
+            # localField joins use the users _id index; $expr lookups do not on MongoDB 4.4
+            {"$addFields": {"user_id": {"$toObjectId": "$student_id"}}},
+            {"$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "_id",
+                "as": "user"
+            }},
+            {"$project": {
+                "_id": 0,
+                "student_id": 1,
+                "approved_at": 1,
+                "email": {"$arrayElemAt": ["$user.email", 0]}
+            }}
+        ]
+        
+        students = self.collection.aggregate(pipeline, batchSize=batch_size, allowDiskUse=True)
+        progress = get_database()["progress"].find(
+            {"course_id": course_id},
+            {"_id": 0, "student_id": 1, "lesson_id": 1, "completed": 1, "completed_at": 1},
+            batch_size=batch_size
+        ).sort("student_id", 1)
+        
+        pending = None
+        try:
+            async for student in students:
+                student_progress = []
+                while True:
+                    if pending is None:
+                        pending = await _next_or_none(progress)
+                        if pending is None:
+                            break
+                    if pending["student_id"] > student["student_id"]:
+                        break
+                    if pending["student_id"] == student["student_id"]:
+                        student_progress.append({key: value for key, value in pending.items() if key != "student_id"})
+                    # Progress of students not approved in the course is skipped
+                    pending = None
+                student["progress"] = student_progress
+                yield student
+        finally:
+            await students.close()
+            await progress.close()
 
 
 # Create singleton instance
@@ -0,0 +1,116 @@
+from typing import Optional, List
+from datetime import datetime
+from pymongo import UpdateOne, ASCENDING, DESCENDING
+from core.mongodb import get_database
+import logging
+from core.query_monitor import monitor_repository
+
+logger = logging.getLogger(__name__)
+
+# Scope of the leaderboard across all courses; course leaderboards use the course id
+GLOBAL_SCOPE = "global"
+
+# Matches the (scope, score, reached_at, student_id) index, best first
+RANKING_SORT = [("score", DESCENDING), ("reached_at", ASCENDING), ("student_id", ASCENDING)]
+
+
+@monitor_repository
+class LeaderboardRepository:
+    """
+    Repository for ranked leaderboard scores.
+
+    One document per scope and student: {_id: "<scope>:<student_id>", scope,
+    student_id, score, reached_at, updated_at}. score is the number of
+    completed lessons and reached_at the time of the latest completion, i.e.
+    when the score was reached; the compound index keeps every scope sorted
+    so top-K reads K index entries and a rank counts only the entries ahead.
+    """
+
+    def __init__(self):
+        self.collection_name = "leaderboard_entries"
+
+    @property
+    def collection(self):
+        """Get leaderboard_entries collection - lazily fetches database"""
+        db = get_database()
+        return db[self.collection_name]
+
+    async def record_completion(self, student_id: str, course_id: str, completed_at: datetime) -> None:
+        """Add one completed lesson to the student's course and global scores"""
+        now = datetime.utcnow()
+        await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": f"{scope}:{student_id}"},
+                {
+                    "$inc": {"score": 1},
+                    # Concurrent completions may land out of order
+                    "$max": {"reached_at": completed_at},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"scope": scope, "student_id": student_id}
+                },
+                upsert=True
+            )
+            for scope in (course_id, GLOBAL_SCOPE)
+        ], ordered=False)
+
+    async def get_top(self, scope: str, limit: int) -> List[dict]:
+        """Get the best `limit` entries of a scope, best first"""
+        cursor = self.collection.find({"scope": scope}).sort(RANKING_SORT).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_entry(self, scope: str, student_id: str) -> Optional[dict]:
+        """Get a student's entry in a scope"""
+        return await self.collection.find_one({"_id": f"{scope}:{student_id}"})
+
+    async def count_ahead(self, scope: str, entry: dict) -> int:
+        """Count entries ranked before `entry` in its scope, from the index alone"""
+        return await self.collection.count_documents({
+            "scope": scope,
+            "$or": [
+                {"score": {"$gt": entry["score"]}},
+                {"score": entry["score"], "reached_at": {"$lt": entry["reached_at"]}},
+                {"score": entry["score"], "reached_at": entry["reached_at"], "student_id": {"$lt": entry["student_id"]}}
+            ]
+        })
+
+    async def count_scope(self, scope: str) -> int:
+        """Count students on a leaderboard"""
+        return await self.collection.count_documents({"scope": scope})
+
+    async def replace_scores(self, entries: List[dict], rebuilt_at: datetime) -> int:
+        """Overwrite scores computed by a rebuild
+
+        Args:
+            entries: [{scope, student_id, score, reached_at}]
+            rebuilt_at: Start of the rebuild; stored as updated_at so
+                delete_stale can tell untouched entries apart
+        """
+        if not entries:
+            return 0
+
+        result = await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": f"{entry['scope']}:{entry['student_id']}"},
+                {
+                    "$set": {"score": entry["score"], "reached_at": entry["reached_at"], "updated_at": rebuilt_at},
+                    "$setOnInsert": {"scope": entry["scope"], "student_id": entry["student_id"]}
+                },
+                upsert=True
+            )
+            for entry in entries
+        ], ordered=False)
+        return result.upserted_count + result.modified_count
+
+    async def delete_stale(self, scopes: List[str], before: datetime) -> int:
+        """Delete entries of these scopes neither rebuilt nor updated since `before`"""
+        result = await self.collection.delete_many({"scope": {"$in": scopes}, "updated_at": {"$lt": before}})
+        return result.deleted_count
+
+    async def delete_scope(self, scope: str) -> int:
+        """Delete a whole leaderboard, e.g. when its course is deleted"""
+        result = await self.collection.delete_many({"scope": scope})
+        return result.deleted_count
+
+
+# Create singleton instance
+leaderboard_repository = LeaderboardRepository()
@@ -1,11 +1,15 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from bson import ObjectId
 from models.lesson import LessonCreate, LessonUpdate, LessonInDB
 from core.mongodb import get_database
-from core.log_config import logger
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+@monitor_repository
 class LessonRepository:
     """Repository for lesson database operations"""
     
@@ -33,7 +37,7 @@ class LessonRepository:
         result = await self.collection.insert_one(lesson_dict)
         created_lesson = await self.collection.find_one({"_id": result.inserted_id})
         
-        logger.info(f"Created lesson: {lesson.title} for course: {course_id}")
+        logger.info("Created lesson: %s for course: %s", lesson.title, course_id)
         
         return LessonInDB(
             _id=str(created_lesson["_id"]),
@@ -65,6 +69,22 @@ class LessonRepository:
         
         return lessons
     
+    async def count_lessons_by_course(self, course_id: str) -> int:
+        """Count lessons in a course"""
+        return await self.collection.count_documents({"course_id": course_id})
+    
+    async def count_lessons_by_courses(self, course_ids: List[str]) -> Dict[str, int]:
+        """Count lessons for several courses with a single $group; courses without lessons are absent"""
+        pipeline = [
+            {"$match": {"course_id": {"$in": course_ids}}},
+            {"$group": {"_id": "$course_id", "lessons": {"$sum": 1}}}
+        ]
+        
+        counts = {}
+        async for row in self.collection.aggregate(pipeline):
+            counts[row["_id"]] = row["lessons"]
+        return counts
+    
     async def get_lesson_by_id(self, lesson_id: str) -> Optional[LessonInDB]:
         """Get lesson by ID"""
         try:
@@ -82,7 +102,7 @@ class LessonRepository:
                     created_at=lesson["created_at"]
                 )
         except Exception as e:
-            logger.error(f"Error getting lesson by ID {lesson_id}: {e}")
+            logger.error("Error getting lesson by ID %s: %s", lesson_id, e)
         
         return None
     
@@ -110,10 +130,10 @@ class LessonRepository:
             )
             
             if result.modified_count > 0:
-                logger.info(f"Updated lesson: {lesson_id}")
+                logger.info("Updated lesson: %s", lesson_id)
                 return await self.get_lesson_by_id(lesson_id)
         except Exception as e:
-            logger.error(f"Error updating lesson {lesson_id}: {e}")
+            logger.error("Error updating lesson %s: %s", lesson_id, e)
         
         return None
     
@@ -123,10 +143,10 @@ class LessonRepository:
             result = await self.collection.delete_one({"_id": ObjectId(lesson_id)})
             
             if result.deleted_count > 0:
-                logger.info(f"Deleted lesson: {lesson_id}")
+                logger.info("Deleted lesson: %s", lesson_id)
                 return True
         except Exception as e:
-            logger.error(f"Error deleting lesson {lesson_id}: {e}")
+            logger.error("Error deleting lesson %s: %s", lesson_id, e)
         
         return False
     
@@ -134,10 +154,10 @@ class LessonRepository:
         """Delete all lessons for a course"""
         try:
             result = await self.collection.delete_many({"course_id": course_id})
-            logger.info(f"Deleted {result.deleted_count} lessons for course: {course_id}")
+            logger.info("Deleted %s lessons for course: %s", result.deleted_count, course_id)
             return result.deleted_count
         except Exception as e:
-            logger.error(f"Error deleting lessons for course {course_id}: {e}")
+            logger.error("Error deleting lessons for course %s: %s", course_id, e)
             return 0
 
 
@@ -1,11 +1,32 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 from bson import ObjectId
-from models.progress import ProgressInDB, CourseProgress
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from models.progress import ProgressInDB, CourseProgress, HistoryBucket
 from core.mongodb import get_database
-from core.log_config import logger
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+def _bucket_expression(field: str, bucket: HistoryBucket) -> dict:
+    """Truncate a date field to UTC midnight or its ISO week's Monday ($dateTrunc needs MongoDB 5.0)"""
+    if bucket == HistoryBucket.WEEK:
+        return {"$dateFromParts": {
+            "isoWeekYear": {"$isoWeekYear": field},
+            "isoWeek": {"$isoWeek": field},
+            "isoDayOfWeek": 1
+        }}
+    return {"$dateFromParts": {
+        "year": {"$year": field},
+        "month": {"$month": field},
+        "day": {"$dayOfMonth": field}
+    }}
+
+
+@monitor_repository
 class ProgressRepository:
     """Repository for progress database operations"""
     
@@ -18,51 +39,50 @@ class ProgressRepository:
         db = get_database()
         return db[self.collection_name]
     
-    async def mark_lesson_complete(self, student_id: str, lesson_id: str, course_id: str) -> ProgressInDB:
-        """Mark a lesson as complete"""
-        # Check if already exists
-        existing = await self.collection.find_one({
-            "student_id": student_id,
-            "lesson_id": lesson_id
-        })
+    async def mark_lesson_complete(self, student_id: str, lesson_id: str, course_id: str) -> Tuple[ProgressInDB, bool]:
+        """Mark a lesson as complete with a single upsert
+        
+        Completing a lesson again keeps its original completed_at.
+        
+        Returns:
+            Tuple of (progress, newly_completed) where newly_completed is False
+            if the lesson had already been completed before this call
+        """
+        now = datetime.utcnow()
+        # _id is generated here so the document can be returned without re-reading it.
+        # completed_at keeps the first completion, matching the rollups and leaderboards
+        # that only count it once
+        update = {
+            "$set": {"completed": True},
+            "$min": {"completed_at": now},
+            "$setOnInsert": {"_id": ObjectId(), "course_id": course_id}
+        }
+        query = {"student_id": student_id, "lesson_id": lesson_id}
         
-        if existing:
-            # Update existing
-            await self.collection.update_one(
-                {"_id": existing["_id"]},
-                {"$set": {
-                    "completed": True,
-                    "completed_at": datetime.utcnow()
-                }}
+        try:
+            before = await self.collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.BEFORE
             )
-            logger.info(f"Updated progress for student {student_id}, lesson {lesson_id}")
+        except DuplicateKeyError:
+            # A concurrent request inserted the same (student, lesson) first
+            before = await self.collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.BEFORE
+            )
+        
+        if before:
+            logger.info("Updated progress for student %s, lesson %s", student_id, lesson_id)
         else:
-            # Create new
-            progress_dict = {
-                "student_id": student_id,
-                "lesson_id": lesson_id,
-                "course_id": course_id,
-                "completed": True,
-                "completed_at": datetime.utcnow()
-            }
-            
-            result = await self.collection.insert_one(progress_dict)
-            logger.info(f"Created progress for student {student_id}, lesson {lesson_id}")
-        
-        # Get and return the progress
-        progress = await self.collection.find_one({
-            "student_id": student_id,
-            "lesson_id": lesson_id
-        })
+            logger.info("Created progress for student %s, lesson %s", student_id, lesson_id)
         
-        return ProgressInDB(
-            _id=str(progress["_id"]),
-            student_id=progress["student_id"],
-            lesson_id=progress["lesson_id"],
-            course_id=progress["course_id"],
-            completed=progress["completed"],
-            completed_at=progress.get("completed_at")
+        progress = ProgressInDB(
+            _id=str(before["_id"]) if before else str(update["$setOnInsert"]["_id"]),
+            student_id=student_id,
+            lesson_id=lesson_id,
+            course_id=before["course_id"] if before else course_id,
+            completed=True,
+            completed_at=(before.get("completed_at") or now) if before else now
         )
+        return progress, not (before and before.get("completed"))
     
     async def get_student_progress_for_course(self, student_id: str, course_id: str) -> List[ProgressInDB]:
         """Get student's progress for a specific course"""
@@ -123,6 +143,150 @@ class ProgressRepository:
             completion_percentage=round(percentage, 2)
         )
     
+    async def count_completed_by_student(
+        self,
+        course_id: str,
+        student_ids: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """Count completed lessons per student in a course with a single $group"""
+        match = {"course_id": course_id, "completed": True}
+        if student_ids is not None:
+            match["student_id"] = {"$in": student_ids}
+        
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": "$student_id", "completed": {"$sum": 1}}}
+        ]
+        
+        counts = {}
+        async for row in self.collection.aggregate(pipeline):
+            counts[row["_id"]] = row["completed"]
+        return counts
+    
+    async def count_completed_by_course(self, student_id: str, course_ids: List[str]) -> Dict[str, int]:
+        """Count a student's completed lessons in several courses with a single $group"""
+        pipeline = [
+            {"$match": {"student_id": student_id, "course_id": {"$in": course_ids}, "completed": True}},
+            {"$group": {"_id": "$course_id", "completed": {"$sum": 1}}}
+        ]
+        
+        counts = {}
+        async for row in self.collection.aggregate(pipeline):
+            counts[row["_id"]] = row["completed"]
+        return counts
+    
+    async def get_course_funnel(self, course_id: str, active_since: datetime) -> dict:
+        """Aggregate completion analytics for a course in one pass over its progress
+        
+        Returns:
+            Dict with lesson_counts ({lesson_id: completions}), started_students,
+            active_students (completed something since `active_since`) and
+            median_gap_ms, the median over students of their average time
+            between consecutive completions (None if no student has two).
+        """
+        pipeline = [
+            {"$match": {"course_id": course_id, "completed": True}},
+            {"$facet": {
+                "lessons": [
+                    {"$group": {"_id": "$lesson_id", "completed": {"$sum": 1}}}
+                ],
+                "students": [
+                    {"$group": {
+                        "_id": "$student_id",
+                        "first": {"$min": "$completed_at"},
+                        "last": {"$max": "$completed_at"},
+                        "count": {"$sum": 1}
+                    }},
+                    {"$project": {
+                        "last": 1,
+                        "gap": {"$cond": [
+                            {"$gt": ["$count", 1]},
+                            {"$divide": [{"$subtract": ["$last", "$first"]}, {"$subtract": ["$count", 1]}]},
+                            None
+                        ]}
+                    }},
+                    # Sorted before $push so the median can be picked by position
+                    {"$sort": {"gap": 1}},
+                    {"$group": {
+                        "_id": None,
+                        "started": {"$sum": 1},
+                        "active": {"$sum": {"$cond": [{"$gte": ["$last", active_since]}, 1, 0]}},
+                        "gaps": {"$push": "$gap"}
+                    }},
+                    {"$project": {
+                        "started": 1,
+                        "active": 1,
+                        "gaps": {"$filter": {"input": "$gaps", "cond": {"$ne": ["$$this", None]}}}
+                    }},
+                    {"$project": {
+                        "started": 1,
+                        "active": 1,
+                        "median_gap": {"$cond": [
+                            {"$eq": [{"$size": "$gaps"}, 0]},
+                            None,
+                            {"$avg": [
+                                {"$arrayElemAt": ["$gaps", {"$floor": {"$divide": [{"$subtract": [{"$size": "$gaps"}, 1]}, 2]}}]},
+                                {"$arrayElemAt": ["$gaps", {"$floor": {"$divide": [{"$size": "$gaps"}, 2]}}]}
+                            ]}
+                        ]}
+                    }}
+                ]
+            }}
+        ]
+        
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {"lessons": [], "students": []}
+        students = facets["students"][0] if facets["students"] else {}
+        
+        return {
+            "lesson_counts": {row["_id"]: row["completed"] for row in facets["lessons"]},
+            "started_students": students.get("started", 0),
+            "active_students": students.get("active", 0),
+            "median_gap_ms": students.get("median_gap")
+        }
+    
+    async def get_completion_history(self, student_id: str, since: datetime, bucket: HistoryBucket) -> dict:
+        """Bucket a student's completions across all courses in one aggregation
+        
+        Runs on the (student_id, completed_at) index and returns only grouped
+        rows, however many completions the student has.
+        
+        Returns:
+            Dict with points ([{start, completions, courses}] for buckets
+            starting at or after `since`, oldest first) and days (every
+            UTC day with a completion, oldest first, for streaks)
+        """
+        pipeline = [
+            {"$match": {"student_id": student_id, "completed_at": {"$type": "date"}, "completed": True}},
+            {"$facet": {
+                "points": [
+                    {"$match": {"completed_at": {"$gte": since}}},
+                    {"$group": {
+                        "_id": _bucket_expression("$completed_at", bucket),
+                        "completions": {"$sum": 1},
+                        "courses": {"$addToSet": "$course_id"}
+                    }},
+                    {"$project": {"completions": 1, "courses": {"$size": "$courses"}}},
+                    {"$sort": {"_id": 1}}
+                ],
+                "days": [
+                    {"$group": {"_id": _bucket_expression("$completed_at", HistoryBucket.DAY)}},
+                    {"$sort": {"_id": 1}}
+                ]
+            }}
+        ]
+        
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {"points": [], "days": []}
+        
+        return {
+            "points": [
+                {"start": row["_id"], "completions": row["completions"], "courses": row["courses"]}
+                for row in facets["points"]
+            ],
+            "days": [row["_id"] for row in facets["days"]]
+        }
+    
     async def is_lesson_completed(self, student_id: str, lesson_id: str) -> bool:
         """Check if a lesson is completed by a student"""
         progress = await self.collection.find_one({
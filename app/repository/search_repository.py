@@ -0,0 +1,150 @@
+from typing import Optional, List, Dict
+from datetime import datetime
+from pymongo import UpdateOne
+from models.course import CourseInDB
+from models.lesson import LessonInDB
+from core.mongodb import get_database
+from core.search import edge_ngrams
+from repository.enrollment_repository import enrollment_repository
+import logging
+from core.query_monitor import monitor_repository
+
+logger = logging.getLogger(__name__)
+
+COURSE_KIND = "course"
+LESSON_KIND = "lesson"
+
+
+@monitor_repository
+class SearchRepository:
+    """
+    Repository for the course search index.
+    
+    `course_search` holds one document per course and one per lesson, each
+    with the searchable text, edge n-grams of its title and the course's
+    created_at. A single weighted text index covers all of them, so a search
+    is one $text aggregation grouped back to courses.
+    """
+    
+    def __init__(self):
+        self.collection_name = "course_search"
+    
+    @property
+    def collection(self):
+        """Get course_search collection - lazily fetches database"""
+        db = get_database()
+        return db[self.collection_name]
+    
+    @staticmethod
+    def course_document(course: CourseInDB) -> Dict:
+        return {
+            "_id": f"{COURSE_KIND}:{course.id}",
+            "kind": COURSE_KIND,
+            "course_id": course.id,
+            "title": course.title,
+            "description": course.description,
+            "ngrams": edge_ngrams(course.title),
+            "created_at": course.created_at
+        }
+    
+    @staticmethod
+    def lesson_document(lesson: LessonInDB, course_created_at: datetime) -> Dict:
+        return {
+            "_id": f"{LESSON_KIND}:{lesson.id}",
+            "kind": LESSON_KIND,
+            "course_id": lesson.course_id,
+            "title": lesson.title,
+            "ngrams": edge_ngrams(lesson.title),
+            "created_at": course_created_at
+        }
+    
+    async def upsert_documents(self, documents: List[Dict]) -> None:
+        """Insert or replace search documents by _id"""
+        if not documents:
+            return
+        await self.collection.bulk_write([
+            UpdateOne({"_id": d["_id"]}, {"$set": d}, upsert=True) for d in documents
+        ], ordered=False)
+    
+    async def delete_course(self, course_id: str) -> None:
+        """Remove a course and all of its lessons from the index"""
+        await self.collection.delete_many({"course_id": course_id})
+    
+    async def delete_lesson(self, lesson_id: str) -> None:
+        await self.collection.delete_one({"_id": f"{LESSON_KIND}:{lesson_id}"})
+    
+    async def search(
+        self,
+        terms: str,
+        include_lessons: bool,
+        lesson_weight: float,
+        recency_weight: float,
+        half_life_ms: float,
+        now: datetime,
+        after: Optional[Dict],
+        limit: int,
+        student_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Rank courses matching `terms`, best first.
+        
+        rank = text score (lesson matches scaled by lesson_weight, summed per
+        course) + recency_weight * 0.5 ^ (course age / half-life). Results
+        are ordered by (rank desc, course_id asc); `after` is the
+        {"rank", "id"} of the last course already returned.
+        
+        Returns rows with course_id, rank, matched_lessons and the course
+        document under "course" (missing if the course was deleted), plus
+        the enrollment of `student_id` under "enrollment" when given.
+        """
+        kinds = [COURSE_KIND, LESSON_KIND] if include_lessons else [COURSE_KIND]
+        pipeline = [
+            {"$match": {"$text": {"$search": terms}, "kind": {"$in": kinds}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+            {"$group": {
+                "_id": "$course_id",
+                "score": {"$sum": {"$cond": [
+                    {"$eq": ["$kind", LESSON_KIND]},
+                    {"$multiply": ["$score", lesson_weight]},
+                    "$score"
+                ]}},
+                "created_at": {"$max": "$created_at"},
+                "matched_lessons": {"$push": {"$cond": [{"$eq": ["$kind", LESSON_KIND]}, "$title", None]}}
+            }},
+            {"$addFields": {"rank": {"$add": [
+                "$score",
+                {"$multiply": [recency_weight, {"$pow": [0.5, {"$divide": [
+                    {"$max": [0, {"$subtract": [now, "$created_at"]}]}, half_life_ms
+                ]}]}]}
+            ]}}}
+        ]
+        if after:
+            pipeline.append({"$match": {"$or": [
+                {"rank": {"$lt": after["rank"]}},
+                {"rank": after["rank"], "_id": {"$gt": after["id"]}}
+            ]}})
+        pipeline += [
+            {"$sort": {"rank": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$addFields": {"course_oid": {"$toObjectId": "$_id"}}},
+            {"$lookup": {"from": "courses", "localField": "course_oid", "foreignField": "_id", "as": "course"}}
+        ]
+        if student_id:
+            pipeline.append(enrollment_repository.student_lookup_stage(student_id, "$_id"))
+        pipeline += [
+            {"$project": {
+                "_id": 0,
+                "course_id": "$_id",
+                "rank": 1,
+                "matched_lessons": {"$filter": {
+                    "input": "$matched_lessons", "cond": {"$ne": ["$$this", None]}
+                }},
+                "course": {"$arrayElemAt": ["$course", 0]},
+                "enrollment": {"$arrayElemAt": ["$enrollment", 0]}
+            }}
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+
+# Create singleton instance
+search_repository = SearchRepository()
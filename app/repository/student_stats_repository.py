@@ -3,9 +3,13 @@ from datetime import datetime
 from bson import ObjectId
 from models.student_stats import StudentStatsInDB
 from core.mongodb import get_database
-from core.log_config import logger
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+@monitor_repository
 class StudentStatsRepository:
     """Repository for student statistics database operations"""
     
@@ -35,7 +39,7 @@ class StudentStatsRepository:
                     last_updated=stats.get("last_updated", datetime.utcnow())
                 )
         except Exception as e:
-            logger.error(f"Error getting student stats for {student_id}: {e}")
+            logger.error("Error getting student stats for %s: %s", student_id, e)
         
         return None
     
@@ -69,7 +73,7 @@ class StudentStatsRepository:
             # Get the updated/created document
             stats = await self.collection.find_one({"student_id": student_id})
             
-            logger.info(f"Updated student stats for {student_id}")
+            logger.info("Updated student stats for %s", student_id)
             
             return StudentStatsInDB(
                 _id=str(stats["_id"]),
@@ -82,7 +86,7 @@ class StudentStatsRepository:
                 last_updated=stats["last_updated"]
             )
         except Exception as e:
-            logger.error(f"Error creating/updating student stats for {student_id}: {e}")
+            logger.error("Error creating/updating student stats for %s: %s", student_id, e)
             raise
     
     async def delete_by_student_id(self, student_id: str) -> bool:
@@ -91,10 +95,10 @@ class StudentStatsRepository:
             result = await self.collection.delete_one({"student_id": student_id})
             
             if result.deleted_count > 0:
-                logger.info(f"Deleted student stats for {student_id}")
+                logger.info("Deleted student stats for %s", student_id)
                 return True
         except Exception as e:
-            logger.error(f"Error deleting student stats for {student_id}: {e}")
+            logger.error("Error deleting student stats for %s: %s", student_id, e)
         
         return False
 
@@ -3,9 +3,13 @@ from datetime import datetime
 from bson import ObjectId
 from models.user import UserCreate, UserInDB, UserRole
 from core.mongodb import get_database
-from core.log_config import logger
+import logging
+from core.query_monitor import monitor_repository
 
+logger = logging.getLogger(__name__)
 
+
+@monitor_repository
 class UserRepository:
     """Repository for user database operations"""
     
@@ -39,7 +43,7 @@ class UserRepository:
         result = await self.collection.insert_one(user_dict)
         created_user = await self.collection.find_one({"_id": result.inserted_id})
         
-        logger.info(f"Created user with email: {user.email}, role: {user.role}")
+        logger.info("Created user with email: %s, role: %s", user.email, user.role)
         
         return UserInDB(
             _id=str(created_user["_id"]),
@@ -93,7 +97,7 @@ class UserRepository:
                     created_at=user["created_at"]
                 )
         except Exception as e:
-            logger.error(f"Error getting user by ID {user_id}: {e}")
+            logger.error("Error getting user by ID %s: %s", user_id, e)
         
         return None
     
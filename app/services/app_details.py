@@ -1,5 +1,7 @@
 import os
-from core.log_config import logger
+import logging
+
+logger = logging.getLogger(__name__)
 
 APP_NAME = os.getenv("APP_NAME")
 
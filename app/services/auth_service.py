@@ -9,7 +9,9 @@ from core.security import (
     create_refresh_token,
     verify_token
 )
-from core.log_config import logger
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -30,7 +32,7 @@ class AuthService:
         """
         # Check if email already exists
         if await user_repository.email_exists(user_data.email):
-            logger.warning(f"Registration attempt with existing email: {user_data.email}")
+            logger.warning("Registration attempt with existing email: %s", user_data.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -60,7 +62,7 @@ class AuthService:
             created_at=user_in_db.created_at
         )
         
-        logger.info(f"User registered successfully: {user_in_db.email}")
+        logger.info("User registered successfully: %s", user_in_db.email)
         
         return TokenResponse(
             access_token=access_token,
@@ -85,7 +87,7 @@ class AuthService:
         user_in_db = await user_repository.get_user_by_email(login_data.email)
         
         if not user_in_db:
-            logger.warning(f"Login attempt with non-existent email: {login_data.email}")
+            logger.warning("Login attempt with non-existent email: %s", login_data.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -93,7 +95,7 @@ class AuthService:
         
         # Verify password
         if not verify_password(login_data.password, user_in_db.hashed_password):
-            logger.warning(f"Failed login attempt for email: {login_data.email}")
+            logger.warning("Failed login attempt for email: %s", login_data.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -102,8 +104,8 @@ class AuthService:
         # Verify role matches
         if user_in_db.role != login_data.role:
             logger.warning(
-                f"Role mismatch for {login_data.email}. "
-                f"Attempted: {login_data.role}, Actual: {user_in_db.role}"
+                "Role mismatch for %s. Attempted: %s, Actual: %s",
+                login_data.email, login_data.role, user_in_db.role
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -128,7 +130,7 @@ class AuthService:
             created_at=user_in_db.created_at
         )
         
-        logger.info(f"User logged in successfully: {user_in_db.email} as {user_in_db.role}")
+        logger.info("User logged in successfully: %s as %s", user_in_db.email, user_in_db.role)
         
         return TokenResponse(
             access_token=access_token,
@@ -156,7 +158,7 @@ class AuthService:
         user_in_db = await user_repository.get_user_by_id(token_data.user_id)
         
         if not user_in_db:
-            logger.error(f"Refresh token for non-existent user: {token_data.user_id}")
+            logger.error("Refresh token for non-existent user: %s", token_data.user_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
@@ -171,7 +173,7 @@ class AuthService:
         
         new_access_token = create_access_token(new_token_data)
         
-        logger.info(f"Access token refreshed for user: {user_in_db.email}")
+        logger.info("Access token refreshed for user: %s", user_in_db.email)
         
         return {
             "access_token": new_access_token,
@@ -0,0 +1,117 @@
+import os
+import uuid
+import asyncio
+from fastapi import HTTPException, status
+from models.enrollment import EnrollmentStatus
+from repository.enrollment_repository import enrollment_repository
+from repository.course_repository import course_repository
+from repository.cache_invalidation_repository import cache_invalidation_repository
+from core.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Approved (student, course) pairs. Approval is final until the course is deleted, which
+# invalidates here immediately and in other workers through cache_invalidations; the TTL
+# bounds anything missed
+AUTHZ_CACHE_SECONDS = float(os.getenv("AUTHZ_CACHE_SECONDS", 30))
+AUTHZ_CACHE_MAX_ENTRIES = int(os.getenv("AUTHZ_CACHE_MAX_ENTRIES", 50000))
+# Wait before re-opening the invalidation cursor after it dies or errors
+AUTHZ_LISTENER_RETRY_SECONDS = float(os.getenv("AUTHZ_LISTENER_RETRY_SECONDS", 1))
+
+ENROLLMENT_EVENT = "enrollment"
+
+
+class AuthorizationService:
+    """Service answering "may this student use this course?" from a short-lived cache
+
+    Only approvals are cached. Any other status can still change, and a
+    read racing with that change could cache it after the invalidation and
+    deny the student for the whole TTL; so denials always read the database.
+    """
+
+    def __init__(self):
+        self.cache = TTLCache(AUTHZ_CACHE_SECONDS, max_entries=AUTHZ_CACHE_MAX_ENTRIES)
+        # Identifies this process's own events on the shared collection
+        self.origin = uuid.uuid4().hex
+
+    async def require_approved_enrollment(
+        self,
+        student_id: str,
+        course_id: str,
+        detail: str,
+        verify_course: bool = True
+    ) -> None:
+        """Raise 403 with `detail` unless the student's enrollment is approved
+
+        On a cache miss the course is checked first (404 if it does not
+        exist, unless the caller already knows it does) and the enrollment
+        is loaded; an approval is cached, so a hit costs no database round trip.
+        """
+        key = (student_id, course_id)
+        if self.cache.get(key):
+            return
+
+        if verify_course:
+            course = await course_repository.get_course_by_id(course_id)
+
+            if not course:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Course not found"
+                )
+
+        enrollment = await enrollment_repository.check_enrollment_exists(student_id, course_id)
+        if not enrollment or enrollment.status != EnrollmentStatus.APPROVED:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+
+        self.cache.set(key, True)
+
+    async def invalidate_course(self, course_id: str) -> None:
+        """Forget every cached approval for a course here and tell the other workers"""
+        self._drop_course(course_id)
+        try:
+            await cache_invalidation_repository.publish(ENROLLMENT_EVENT, self.origin, course_id=course_id)
+        except Exception as e:
+            # Other workers fall back to the TTL
+            logger.error("Error publishing enrollment invalidation for course %s: %s", course_id, e)
+
+    def _drop_course(self, course_id: str) -> None:
+        self.cache.invalidate_matching(lambda key: key[1] == course_id)
+
+    def _apply(self, event: dict) -> None:
+        if event.get("kind") != ENROLLMENT_EVENT or event.get("origin") == self.origin:
+            return
+        self._drop_course(event["course_id"])
+
+    async def listen(self) -> None:
+        """Apply invalidations published by other workers until cancelled"""
+        last_id = None
+        started = False
+        while True:
+            try:
+                if not started:
+                    last_id = await cache_invalidation_repository.latest_id()
+                    started = True
+                async for event in cache_invalidation_repository.tail(last_id):
+                    last_id = event["_id"]
+                    self._apply(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error following cache invalidations: %s", e)
+                # Events may have been missed while the cursor was down
+                self.cache.clear()
+            # A tailable cursor also ends on its own, e.g. while the collection is still empty
+            await asyncio.sleep(AUTHZ_LISTENER_RETRY_SECONDS)
+
+    def start_listener(self) -> asyncio.Task:
+        """Start following invalidations from other workers"""
+        return asyncio.create_task(self.listen(), name="authz_invalidations")
+
+
+# Create singleton instance
+authorization_service = AuthorizationService()
@@ -0,0 +1,110 @@
+import os
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from typing import List
+from models.progress import CourseAnalytics, LessonFunnelStep, ActivityDay
+from repository.course_repository import course_repository
+from repository.lesson_repository import lesson_repository
+from repository.enrollment_repository import enrollment_repository
+from repository.progress_repository import progress_repository
+from repository.activity_repository import activity_repository, day_start
+from core.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Analytics are cached per course; completions in this worker invalidate immediately,
+# the TTL bounds staleness from other workers
+ANALYTICS_CACHE_SECONDS = float(os.getenv("ANALYTICS_CACHE_SECONDS", 60))
+ANALYTICS_ACTIVE_DAYS = int(os.getenv("ANALYTICS_ACTIVE_DAYS", 7))
+
+
+class CourseAnalyticsService:
+    """Service for course completion analytics"""
+
+    def __init__(self):
+        self.cache = TTLCache(ANALYTICS_CACHE_SECONDS, max_entries=1000)
+
+    async def _check_course_owner(self, course_id: str, mentor_id: str) -> None:
+        course = await course_repository.get_course_by_id(course_id)
+
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+
+        if course.mentor_id != mentor_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view this course's analytics"
+            )
+
+    async def get_course_analytics(self, course_id: str, mentor_id: str) -> CourseAnalytics:
+        """Get the lesson completion funnel for a mentor's course (mentor only)"""
+        await self._check_course_owner(course_id, mentor_id)
+
+        analytics = self.cache.get(course_id)
+        if analytics is None:
+            analytics = await self._compute(course_id)
+            self.cache.set(course_id, analytics)
+        return analytics
+
+    async def _compute(self, course_id: str) -> CourseAnalytics:
+        now = datetime.utcnow()
+        lessons = await lesson_repository.get_lessons_by_course(course_id)
+        enrolled = await enrollment_repository.count_approved_by_course(course_id)
+        funnel = await progress_repository.get_course_funnel(
+            course_id,
+            active_since=now - timedelta(days=ANALYTICS_ACTIVE_DAYS)
+        )
+
+        lesson_counts = funnel["lesson_counts"]
+        steps = [LessonFunnelStep(
+            lesson_id=lesson.id,
+            title=lesson.title,
+            order=lesson.order,
+            completed_students=lesson_counts.get(lesson.id, 0),
+            completion_rate=round(lesson_counts.get(lesson.id, 0) / enrolled * 100, 2) if enrolled else 0.0
+        ) for lesson in lessons]
+
+        median_gap_ms = funnel["median_gap_ms"]
+        return CourseAnalytics(
+            course_id=course_id,
+            total_lessons=len(lessons),
+            enrolled_students=enrolled,
+            started_students=funnel["started_students"],
+            active_students=funnel["active_students"],
+            active_window_days=ANALYTICS_ACTIVE_DAYS,
+            median_hours_between_completions=round(median_gap_ms / 3_600_000, 2) if median_gap_ms is not None else None,
+            lessons=steps,
+            generated_at=now
+        )
+
+    async def get_course_activity(self, course_id: str, mentor_id: str, days: int) -> List[ActivityDay]:
+        """Get daily activity for the last `days` UTC days, oldest first, zero-filled (mentor only)"""
+        await self._check_course_owner(course_id, mentor_id)
+
+        end = day_start(datetime.utcnow()) + timedelta(days=1)
+        start = end - timedelta(days=days)
+        rollups = {d["day"]: d for d in await activity_repository.get_daily(course_id, start, end)}
+
+        activity = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            rollup = rollups.get(day, {})
+            activity.append(ActivityDay(
+                day=day.date(),
+                completions=rollup.get("completions", 0),
+                active_students=rollup.get("active_students", 0),
+                new_enrollments=rollup.get("new_enrollments", 0)
+            ))
+        return activity
+
+    def invalidate(self, course_id: str) -> None:
+        """Drop cached analytics after a completion or lesson change in the course"""
+        self.cache.invalidate(course_id)
+
+
+# Create singleton instance
+course_analytics_service = CourseAnalyticsService()
@@ -1,11 +1,29 @@
-from typing import List, Tuple
+from typing import List, Tuple, Optional
+from datetime import datetime
 from fastapi import HTTPException, status
-from models.course import CourseCreate, CourseUpdate, Course
+from models.course import CourseCreate, CourseUpdate, Course, CourseWithEnrollment
+from models.enrollment import Enrollment
 from models.user import UserRole
 from models.pagination import PaginatedResponse
 from repository.course_repository import course_repository
 from repository.lesson_repository import lesson_repository
-from core.log_config import logger
+from repository.cache_version_repository import cache_version_repository
+from services.search_service import search_service
+from services.authorization_service import authorization_service
+from services.leaderboard_service import leaderboard_service
+import logging
+from core.background import background_tasks
+from core.http_cache import make_etag
+from core.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+# Cache version counter bumped whenever the public catalog changes
+CATALOG_VERSION = "catalog"
+
+# Concurrent identical reads (a class opening the same course at once) share one query
+course_reads = get_single_flight("courses")
+catalog_reads = get_single_flight("catalog")
 
 
 class CourseService:
@@ -14,6 +32,8 @@ class CourseService:
     async def create_course(self, course_data: CourseCreate, mentor_id: str) -> Course:
         """Create a new course"""
         course_in_db = await course_repository.create_course(course_data, mentor_id)
+        await cache_version_repository.bump(CATALOG_VERSION)
+        background_tasks.spawn(search_service.index_course(course_in_db), name="index_search")
         
         return Course(
             _id=course_in_db.id,
@@ -26,7 +46,7 @@ class CourseService:
     
     async def get_course_by_id(self, course_id: str) -> Course:
         """Get course by ID"""
-        course_in_db = await course_repository.get_course_by_id(course_id)
+        course_in_db = await course_reads.do(course_id, lambda: course_repository.get_course_by_id(course_id))
         
         if not course_in_db:
             raise HTTPException(
@@ -43,19 +63,48 @@ class CourseService:
             updated_at=course_in_db.updated_at
         )
     
-    async def get_all_courses(self, page: int = 1, limit: int = 10) -> PaginatedResponse[Course]:
-        """Get all courses with pagination"""
+    async def get_catalog_cache_validators(self, page: int, limit: int) -> Tuple[str, Optional[datetime]]:
+        """ETag and Last-Modified for a public catalog page, without loading it"""
+        version, updated_at = await cache_version_repository.get_version(CATALOG_VERSION)
+        if updated_at is None:
+            # No write through the API yet (e.g. freshly seeded); derive the validators from the data
+            count, updated_at = await course_repository.get_catalog_stats()
+            return make_etag(CATALOG_VERSION, "data", count, updated_at, page, limit), updated_at
+        return make_etag(CATALOG_VERSION, version, page, limit), updated_at
+    
+    async def get_all_courses(
+        self, page: int = 1, limit: int = 10, student_id: str = None
+    ) -> PaginatedResponse[CourseWithEnrollment]:
+        """Get all courses with pagination, with the student's enrollments if student_id is given"""
         skip = (page - 1) * limit
-        courses_in_db, total = await course_repository.get_all_courses(skip=skip, limit=limit)
+        if student_id:
+            courses_with_enrollments, total = await course_repository.get_all_courses_with_enrollment(
+                student_id, skip=skip, limit=limit
+            )
+        else:
+            courses_in_db, total = await catalog_reads.do(
+                (page, limit), lambda: course_repository.get_all_courses(skip=skip, limit=limit)
+            )
+            courses_with_enrollments = [(c, None) for c in courses_in_db]
         
-        courses = [Course(
+        courses = [CourseWithEnrollment(
             _id=c.id,
             title=c.title,
             description=c.description,
             mentor_id=c.mentor_id,
             created_at=c.created_at,
-            updated_at=c.updated_at
-        ) for c in courses_in_db]
+            updated_at=c.updated_at,
+            enrollment=Enrollment(
+                _id=e.id,
+                student_id=e.student_id,
+                course_id=e.course_id,
+                status=e.status,
+                requested_at=e.requested_at,
+                approved_at=e.approved_at,
+                approved_by=e.approved_by,
+                version=e.version
+            ) if e else None
+        ) for c, e in courses_with_enrollments]
         
         return PaginatedResponse.create(
             items=courses,
@@ -110,6 +159,7 @@ class CourseService:
         
         # Update course
         updated_course = await course_repository.update_course(course_id, course_update)
+        await cache_version_repository.bump(CATALOG_VERSION)
         
         if not updated_course:
             raise HTTPException(
@@ -117,6 +167,8 @@ class CourseService:
                 detail="Failed to update course"
             )
         
+        background_tasks.spawn(search_service.index_course(updated_course), name="index_search")
+        
         return Course(
             _id=updated_course.id,
             title=updated_course.title,
@@ -149,6 +201,7 @@ class CourseService:
         
         # Delete course
         success = await course_repository.delete_course(course_id)
+        await cache_version_repository.bump(CATALOG_VERSION)
         
         if not success:
             raise HTTPException(
@@ -156,6 +209,10 @@ class CourseService:
                 detail="Failed to delete course"
             )
         
+        background_tasks.spawn(search_service.remove_course(course_id), name="index_search")
+        background_tasks.spawn(leaderboard_service.remove_course(course_id), name="leaderboard")
+        await authorization_service.invalidate_course(course_id)
+        
         return {"message": "Course deleted successfully"}
 
 
@@ -0,0 +1,180 @@
+import os
+import asyncio
+from typing import Optional, Dict
+from models.dashboard import (
+    StudentDashboard,
+    MentorDashboard,
+    MentorCourseSummary,
+    PendingEnrollment,
+    EnrollmentCounts,
+)
+from models.enrollment import EnrollmentStatus, Enrollment, EnrollmentInDB
+from models.course import CourseWithProgress, CourseWithEnrollment, CourseInDB
+from models.progress import CourseProgress
+from models.pagination import PaginatedResponse
+from repository.enrollment_repository import enrollment_repository
+from repository.course_repository import course_repository
+from repository.lesson_repository import lesson_repository
+from repository.progress_repository import progress_repository
+from services.student_stats_service import student_stats_service
+from core.single_flight import get_single_flight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pending requests shown on the dashboards, newest first
+DASHBOARD_PENDING_LIMIT = int(os.getenv("DASHBOARD_PENDING_LIMIT", 20))
+
+
+def _enrollment(enrollment: EnrollmentInDB) -> Enrollment:
+    return Enrollment(
+        _id=enrollment.id,
+        student_id=enrollment.student_id,
+        course_id=enrollment.course_id,
+        status=enrollment.status,
+        requested_at=enrollment.requested_at,
+        approved_at=enrollment.approved_at,
+        approved_by=enrollment.approved_by,
+        version=enrollment.version
+    )
+
+
+class DashboardService:
+    """Service assembling dashboard pages from several sub-queries in one request"""
+
+    def __init__(self):
+        # Double-clicks and React effects firing twice send the same request concurrently
+        self.single_flight = get_single_flight("dashboard")
+
+    async def get_student_dashboard(
+        self,
+        student_id: str,
+        status_filter: Optional[EnrollmentStatus] = None,
+        page: int = 1,
+        limit: int = 6
+    ) -> StudentDashboard:
+        """Get stats, a page of enrolled courses with progress and pending requests for a student"""
+        key = ("student", student_id, status_filter, page, limit)
+        return await self.single_flight.do(
+            key, lambda: self._build_student_dashboard(student_id, status_filter, page, limit)
+        )
+
+    async def _build_student_dashboard(
+        self,
+        student_id: str,
+        status_filter: Optional[EnrollmentStatus],
+        page: int,
+        limit: int
+    ) -> StudentDashboard:
+        skip = (page - 1) * limit
+        stats, (enrollments, total), (pending, _) = await asyncio.gather(
+            student_stats_service.get_student_stats(student_id),
+            enrollment_repository.get_enrollments_by_student(
+                student_id, skip=skip, limit=limit, status=status_filter
+            ),
+            enrollment_repository.get_enrollments_by_student(
+                student_id, skip=0, limit=DASHBOARD_PENDING_LIMIT, status=EnrollmentStatus.PENDING
+            )
+        )
+
+        # Progress only exists for approved enrollments
+        approved_ids = [e.course_id for e in enrollments if e.status == EnrollmentStatus.APPROVED]
+        course_ids = list(dict.fromkeys([e.course_id for e in enrollments] + [e.course_id for e in pending]))
+        courses, lesson_counts, completed_counts = await asyncio.gather(
+            course_repository.get_courses_by_ids(course_ids),
+            lesson_repository.count_lessons_by_courses(approved_ids) if approved_ids else _empty(),
+            progress_repository.count_completed_by_course(student_id, approved_ids) if approved_ids else _empty()
+        )
+
+        items = []
+        for enrollment in enrollments:
+            course = courses.get(enrollment.course_id)
+            if not course:
+                continue
+
+            progress = None
+            if enrollment.status == EnrollmentStatus.APPROVED:
+                total_lessons = lesson_counts.get(course.id, 0)
+                completed = completed_counts.get(course.id, 0)
+                progress = CourseProgress(
+                    course_id=course.id,
+                    total_lessons=total_lessons,
+                    completed_lessons=completed,
+                    completion_percentage=round(completed / total_lessons * 100, 2) if total_lessons else 0.0
+                )
+
+            items.append(CourseWithProgress(
+                **_course_fields(course),
+                enrollment=_enrollment(enrollment),
+                progress=progress
+            ))
+
+        pending_requests = [
+            CourseWithEnrollment(**_course_fields(courses[e.course_id]), enrollment=_enrollment(e))
+            for e in pending
+            if e.course_id in courses
+        ]
+
+        return StudentDashboard(
+            stats=stats,
+            courses=PaginatedResponse[CourseWithProgress].create(items=items, total=total, page=page, limit=limit),
+            pending_requests=pending_requests
+        )
+
+    async def get_mentor_dashboard(self, mentor_id: str, page: int = 1, limit: int = 6) -> MentorDashboard:
+        """Get a page of the mentor's courses with enrollment totals, pending requests and student count"""
+        key = ("mentor", mentor_id, page, limit)
+        return await self.single_flight.do(key, lambda: self._build_mentor_dashboard(mentor_id, page, limit))
+
+    async def _build_mentor_dashboard(self, mentor_id: str, page: int, limit: int) -> MentorDashboard:
+        # The course id list is loaded once and shared by every enrollment figure
+        courses, total, titles = await course_repository.get_mentor_courses_overview(
+            mentor_id, skip=(page - 1) * limit, limit=limit
+        )
+        summary = await enrollment_repository.get_mentor_summary(list(titles), DASHBOARD_PENDING_LIMIT)
+
+        items = []
+        for course in courses:
+            counts = summary["per_course"].get(course.id, {})
+            items.append(MentorCourseSummary(
+                **_course_fields(course),
+                enrollment_counts=EnrollmentCounts(
+                    pending=counts.get(EnrollmentStatus.PENDING.value, 0),
+                    approved=counts.get(EnrollmentStatus.APPROVED.value, 0),
+                    rejected=counts.get(EnrollmentStatus.REJECTED.value, 0)
+                )
+            ))
+
+        pending_requests = [
+            PendingEnrollment(
+                **enrollment.model_dump(by_alias=True),
+                course_title=titles.get(enrollment.course_id, "")
+            )
+            for enrollment in summary["pending"]
+        ]
+
+        return MentorDashboard(
+            courses=PaginatedResponse[MentorCourseSummary].create(items=items, total=total, page=page, limit=limit),
+            pending_requests=pending_requests,
+            pending_total=summary["pending_total"],
+            enrolled_students=summary["student_count"]
+        )
+
+
+async def _empty() -> Dict[str, int]:
+    return {}
+
+
+def _course_fields(course: CourseInDB) -> dict:
+    return {
+        "_id": course.id,
+        "title": course.title,
+        "description": course.description,
+        "mentor_id": course.mentor_id,
+        "created_at": course.created_at,
+        "updated_at": course.updated_at,
+    }
+
+
+# Create singleton instance
+dashboard_service = DashboardService()
@@ -1,12 +1,31 @@
-from typing import List
+import os
+import asyncio
+from typing import List, Dict, Optional
+from datetime import datetime
+from bson import ObjectId
 from fastapi import HTTPException, status
-from models.enrollment import EnrollmentCreate, EnrollmentStatus, Enrollment
+from models.enrollment import (
+    EnrollmentCreate,
+    EnrollmentStatus,
+    Enrollment,
+    EnrollmentInDB,
+    TransitionOutcome,
+    BulkEnrollmentUpdate,
+    BulkEnrollmentAction,
+    BulkEnrollmentResult,
+)
 from models.course import CourseWithProgress, Course
 from models.pagination import PaginatedResponse
 from repository.enrollment_repository import enrollment_repository
 from repository.course_repository import course_repository
-from core.log_config import logger
-import asyncio
+from repository.activity_repository import activity_repository
+import logging
+from core.background import background_tasks
+
+logger = logging.getLogger(__name__)
+
+# Student stats recalculations run at most this many at a time after a bulk approval
+BULK_STATS_CONCURRENCY = int(os.getenv("BULK_STATS_CONCURRENCY", 4))
 
 
 class EnrollmentService:
@@ -48,7 +67,8 @@ class EnrollmentService:
             status=enrollment_in_db.status,
             requested_at=enrollment_in_db.requested_at,
             approved_at=enrollment_in_db.approved_at,
-            approved_by=enrollment_in_db.approved_by
+            approved_by=enrollment_in_db.approved_by,
+            version=enrollment_in_db.version
         )
     
     async def get_student_enrollments(self, student_id: str) -> List[Enrollment]:
@@ -63,7 +83,8 @@ class EnrollmentService:
             status=e.status,
             requested_at=e.requested_at,
             approved_at=e.approved_at,
-            approved_by=e.approved_by
+            approved_by=e.approved_by,
+            version=e.version
         ) for e in enrollments_in_db]
     
     async def get_course_enrollments(self, course_id: str, user_id: str) -> List[Enrollment]:
@@ -92,11 +113,50 @@ class EnrollmentService:
             status=e.status,
             requested_at=e.requested_at,
             approved_at=e.approved_at,
-            approved_by=e.approved_by
+            approved_by=e.approved_by,
+            version=e.version
         ) for e in enrollments_in_db]
     
-    async def approve_enrollment(self, enrollment_id: str, user_id: str) -> Enrollment:
+    async def approve_enrollment(self, enrollment_id: str, user_id: str, expected_version: Optional[int] = None) -> Enrollment:
         """Approve an enrollment request (only course owner)"""
+        updated_enrollment = await self._decide(enrollment_id, user_id, EnrollmentStatus.APPROVED, expected_version)
+        
+        background_tasks.spawn(
+            self._record_approval_async(updated_enrollment.course_id, updated_enrollment.approved_at),
+            name="record_activity"
+        )
+        
+        # Trigger stats recalculation in background
+        background_tasks.spawn(
+            self._recalculate_stats_async(updated_enrollment.student_id),
+            name="recalculate_stats"
+        )
+        
+        return Enrollment(
+            _id=updated_enrollment.id,
+            student_id=updated_enrollment.student_id,
+            course_id=updated_enrollment.course_id,
+            status=updated_enrollment.status,
+            requested_at=updated_enrollment.requested_at,
+            approved_at=updated_enrollment.approved_at,
+            approved_by=updated_enrollment.approved_by,
+            version=updated_enrollment.version
+        )
+    
+    async def _decide(
+        self,
+        enrollment_id: str,
+        user_id: str,
+        new_status: EnrollmentStatus,
+        expected_version: Optional[int]
+    ) -> EnrollmentInDB:
+        """Move a pending enrollment to new_status after checking course ownership
+        
+        The change itself is a conditional update on status PENDING (and the
+        expected version), so a concurrent decision surfaces as 409 Conflict.
+        """
+        action = "approve" if new_status == EnrollmentStatus.APPROVED else "reject"
+        
         # Get enrollment
         enrollment_in_db = await enrollment_repository.get_enrollment_by_id(enrollment_id)
         
@@ -112,41 +172,35 @@ class EnrollmentService:
         if not course or course.mentor_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to approve this enrollment"
+                detail=f"You don't have permission to {action} this enrollment"
             )
         
-        # Check if already processed
-        if enrollment_in_db.status != EnrollmentStatus.PENDING:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Enrollment is already {enrollment_in_db.status.value}"
-            )
-        
-        # Approve enrollment
-        updated_enrollment = await enrollment_repository.update_enrollment_status(
+        transition = await enrollment_repository.transition_status(
             enrollment_id,
-            EnrollmentStatus.APPROVED,
-            user_id
+            new_status,
+            user_id,
+            expected_version=expected_version
         )
         
-        if not updated_enrollment:
+        if transition.outcome == TransitionOutcome.NOT_FOUND:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to approve enrollment"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Enrollment not found"
             )
         
-        # Trigger stats recalculation in background
-        asyncio.create_task(self._recalculate_stats_async(updated_enrollment.student_id))
+        if transition.outcome == TransitionOutcome.CONFLICT:
+            current = transition.enrollment
+            detail = (
+                f"Enrollment is already {current.status.value}"
+                if current.status != EnrollmentStatus.PENDING
+                else f"Enrollment was modified (now version {current.version})"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=detail
+            )
         
-        return Enrollment(
-            _id=updated_enrollment.id,
-            student_id=updated_enrollment.student_id,
-            course_id=updated_enrollment.course_id,
-            status=updated_enrollment.status,
-            requested_at=updated_enrollment.requested_at,
-            approved_at=updated_enrollment.approved_at,
-            approved_by=updated_enrollment.approved_by
-        )
+        return transition.enrollment
     
     async def _recalculate_stats_async(self, student_id: str):
         """Recalculate student stats asynchronously"""
@@ -154,57 +208,116 @@ class EnrollmentService:
             from services.student_stats_service import student_stats_service
             await student_stats_service.recalculate_student_stats(student_id)
         except Exception as e:
-            logger.error(f"Error recalculating stats for student {student_id}: {e}")
+            logger.error("Error recalculating stats for student %s: %s", student_id, e)
+    
+    async def _record_approval_async(self, course_id: str, approved_at: datetime, count: int = 1):
+        """Update the daily activity rollup asynchronously"""
+        try:
+            await activity_repository.record_enrollment_approved(course_id, approved_at or datetime.utcnow(), count)
+        except Exception as e:
+            logger.error("Error recording activity for course %s: %s", course_id, e)
     
-    async def reject_enrollment(self, enrollment_id: str, user_id: str) -> Enrollment:
+    async def reject_enrollment(self, enrollment_id: str, user_id: str, expected_version: Optional[int] = None) -> Enrollment:
         """Reject an enrollment request (only course owner)"""
-        # Get enrollment
-        enrollment_in_db = await enrollment_repository.get_enrollment_by_id(enrollment_id)
+        updated_enrollment = await self._decide(enrollment_id, user_id, EnrollmentStatus.REJECTED, expected_version)
         
-        if not enrollment_in_db:
+        return Enrollment(
+            _id=updated_enrollment.id,
+            student_id=updated_enrollment.student_id,
+            course_id=updated_enrollment.course_id,
+            status=updated_enrollment.status,
+            requested_at=updated_enrollment.requested_at,
+            approved_at=updated_enrollment.approved_at,
+            approved_by=updated_enrollment.approved_by,
+            version=updated_enrollment.version
+        )
+    
+    async def bulk_update_enrollments(self, request: BulkEnrollmentUpdate, user_id: str) -> BulkEnrollmentResult:
+        """Approve or reject many pending enrollments at once (only course owner)
+        
+        Ownership is checked once per distinct course; a single update_many
+        then moves every matching enrollment that is still pending.
+        """
+        if request.enrollment_ids is None and request.course_id is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Enrollment not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide enrollment_ids, course_id or both"
             )
         
-        # Verify course ownership
-        course = await course_repository.get_course_by_id(enrollment_in_db.course_id)
-        
-        if not course or course.mentor_id != user_id:
+        query = {}
+        if request.enrollment_ids is not None:
+            if not all(ObjectId.is_valid(enrollment_id) for enrollment_id in request.enrollment_ids):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid enrollment ID"
+                )
+            enrollment_ids = list(dict.fromkeys(request.enrollment_ids))
+            query["_id"] = {"$in": [ObjectId(enrollment_id) for enrollment_id in enrollment_ids]}
+        
+        if request.course_id is not None:
+            query["course_id"] = request.course_id
+            course_ids = [request.course_id]
+        else:
+            course_ids = await enrollment_repository.get_pending_course_ids(enrollment_ids)
+            # Only courses whose ownership was checked below can be touched
+            query["course_id"] = {"$in": course_ids}
+        
+        courses = await course_repository.get_courses_by_ids(course_ids)
+        if request.course_id is not None and request.course_id not in courses:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        if any(course_id not in courses or courses[course_id].mentor_id != user_id for course_id in course_ids):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to reject this enrollment"
+                detail="You don't have permission to update these enrollments"
             )
         
-        # Check if already processed
-        if enrollment_in_db.status != EnrollmentStatus.PENDING:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Enrollment is already {enrollment_in_db.status.value}"
+        new_status = EnrollmentStatus.APPROVED if request.action == BulkEnrollmentAction.APPROVE else EnrollmentStatus.REJECTED
+        updated = await enrollment_repository.bulk_update_pending_status(query, new_status, user_id)
+        
+        if updated and new_status == EnrollmentStatus.APPROVED:
+            approved_per_course: Dict[str, int] = {}
+            for enrollment in updated:
+                approved_per_course[enrollment.course_id] = approved_per_course.get(enrollment.course_id, 0) + 1
+            for course_id, count in approved_per_course.items():
+                background_tasks.spawn(
+                    self._record_approval_async(course_id, updated[0].approved_at, count),
+                    name="record_activity"
+                )
+            # One recalculation per student, however many of their enrollments changed
+            student_ids = list(dict.fromkeys(enrollment.student_id for enrollment in updated))
+            background_tasks.spawn(
+                self._recalculate_many_stats_async(student_ids),
+                name="recalculate_stats_bulk"
             )
         
-        # Reject enrollment
-        updated_enrollment = await enrollment_repository.update_enrollment_status(
-            enrollment_id,
-            EnrollmentStatus.REJECTED,
-            user_id
+        return BulkEnrollmentResult(
+            status=new_status,
+            updated=len(updated),
+            skipped=len(enrollment_ids) - len(updated) if request.enrollment_ids is not None else 0,
+            enrollments=[Enrollment(
+                _id=e.id,
+                student_id=e.student_id,
+                course_id=e.course_id,
+                status=e.status,
+                requested_at=e.requested_at,
+                approved_at=e.approved_at,
+                approved_by=e.approved_by,
+                version=e.version
+            ) for e in updated]
         )
+    
+    async def _recalculate_many_stats_async(self, student_ids: List[str]):
+        """Recalculate stats for many students, a few at a time"""
+        semaphore = asyncio.Semaphore(BULK_STATS_CONCURRENCY)
         
-        if not updated_enrollment:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to reject enrollment"
-            )
+        async def recalculate(student_id: str):
+            async with semaphore:
+                await self._recalculate_stats_async(student_id)
         
-        return Enrollment(
-            _id=updated_enrollment.id,
-            student_id=updated_enrollment.student_id,
-            course_id=updated_enrollment.course_id,
-            status=updated_enrollment.status,
-            requested_at=updated_enrollment.requested_at,
-            approved_at=updated_enrollment.approved_at,
-            approved_by=updated_enrollment.approved_by
-        )
+        await asyncio.gather(*(recalculate(student_id) for student_id in student_ids))
     
     async def check_student_enrolled(self, student_id: str, course_id: str) -> bool:
         """Check if student is enrolled (approved) in a course"""
@@ -244,7 +357,8 @@ class EnrollmentService:
                 status=enrollment.status,
                 requested_at=enrollment.requested_at,
                 approved_at=enrollment.approved_at,
-                approved_by=enrollment.approved_by
+                approved_by=enrollment.approved_by,
+                version=enrollment.version
             )
             
             # Create CourseWithProgress
@@ -288,7 +402,8 @@ class EnrollmentService:
                     status=e.status,
                     requested_at=e.requested_at,
                     approved_at=e.approved_at,
-                    approved_by=e.approved_by
+                    approved_by=e.approved_by,
+                    version=e.version
                 )
                 for e in enrollments_in_db
                 if e.status == EnrollmentStatus.PENDING
@@ -0,0 +1,117 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from models.leaderboard import Leaderboard, LeaderboardEntry
+from models.user import TokenData, UserRole
+from repository.leaderboard_repository import leaderboard_repository, GLOBAL_SCOPE
+from repository.course_repository import course_repository
+from services.authorization_service import authorization_service
+from core.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Student counts per leaderboard are the only reads that grow with its size; keep them briefly
+LEADERBOARD_TOTAL_CACHE_SECONDS = float(os.getenv("LEADERBOARD_TOTAL_CACHE_SECONDS", 60))
+
+
+def _entry(document: dict, rank: int) -> LeaderboardEntry:
+    return LeaderboardEntry(
+        rank=rank,
+        student_id=document["student_id"],
+        score=document["score"],
+        reached_at=document["reached_at"]
+    )
+
+
+class LeaderboardService:
+    """Service for course and global leaderboards"""
+
+    def __init__(self):
+        self.totals = TTLCache(LEADERBOARD_TOTAL_CACHE_SECONDS, max_entries=10000)
+
+    async def get_course_leaderboard(self, course_id: str, user: TokenData, limit: int = 10) -> Leaderboard:
+        """Get the top students of a course (approved students and the course owner)"""
+        if user.role == UserRole.MENTOR:
+            course = await course_repository.get_course_by_id(course_id)
+
+            if not course:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Course not found"
+                )
+
+            if course.mentor_id != user.user_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You don't have permission to view this course's leaderboard"
+                )
+        else:
+            await authorization_service.require_approved_enrollment(
+                user.user_id,
+                course_id,
+                detail="You must be enrolled in this course to view its leaderboard"
+            )
+
+        return await self._leaderboard(course_id, user, limit)
+
+    async def get_global_leaderboard(self, user: TokenData, limit: int = 10) -> Leaderboard:
+        """Get the top students across all courses"""
+        return await self._leaderboard(GLOBAL_SCOPE, user, limit)
+
+    async def _leaderboard(self, scope: str, user: TokenData, limit: int) -> Leaderboard:
+        top, total = await asyncio.gather(
+            leaderboard_repository.get_top(scope, limit),
+            self._total(scope)
+        )
+        entries = [_entry(document, rank) for rank, document in enumerate(top, start=1)]
+
+        me = None
+        if user.role == UserRole.STUDENT:
+            me = next((entry for entry in entries if entry.student_id == user.user_id), None)
+            if me is None:
+                me = await self._rank(scope, user.user_id)
+
+        # The cached total may predate students who just joined the board
+        total = max(total, len(entries), me.rank if me else 0)
+        return Leaderboard(
+            course_id=scope if scope != GLOBAL_SCOPE else None,
+            total_students=total,
+            entries=entries,
+            me=me
+        )
+
+    async def _rank(self, scope: str, student_id: str) -> Optional[LeaderboardEntry]:
+        document = await leaderboard_repository.get_entry(scope, student_id)
+        if not document:
+            return None
+        ahead = await leaderboard_repository.count_ahead(scope, document)
+        return _entry(document, ahead + 1)
+
+    async def _total(self, scope: str) -> int:
+        total = self.totals.get(scope)
+        if total is None:
+            total = await leaderboard_repository.count_scope(scope)
+            self.totals.set(scope, total)
+        return total
+
+    async def record_completion(self, student_id: str, course_id: str, completed_at: datetime) -> None:
+        """Add a newly completed lesson to the student's course and global scores"""
+        try:
+            await leaderboard_repository.record_completion(student_id, course_id, completed_at)
+        except Exception as e:
+            logger.error("Error updating leaderboards for student %s: %s", student_id, e)
+
+    async def remove_course(self, course_id: str) -> None:
+        """Drop a deleted course's leaderboard"""
+        try:
+            await leaderboard_repository.delete_scope(course_id)
+            self.totals.invalidate(course_id)
+        except Exception as e:
+            logger.error("Error removing leaderboard for course %s: %s", course_id, e)
+
+
+# Create singleton instance
+leaderboard_service = LeaderboardService()
@@ -1,10 +1,22 @@
-from typing import List
+from typing import List, Tuple, Optional
+from datetime import datetime
 from fastapi import HTTPException, status
 from models.lesson import LessonCreate, LessonUpdate, Lesson
 from repository.lesson_repository import lesson_repository
 from repository.course_repository import course_repository
 from repository.progress_repository import progress_repository
-from core.log_config import logger
+from services.course_analytics_service import course_analytics_service
+from services.search_service import search_service
+from core.background import background_tasks
+from core.http_cache import make_etag
+from core.single_flight import get_single_flight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shared with CourseService, so course lookups from either service coalesce
+course_reads = get_single_flight("courses")
+lesson_reads = get_single_flight("lessons")
 
 
 class LessonService:
@@ -34,6 +46,9 @@ class LessonService:
         
         # Create lesson
         lesson_in_db = await lesson_repository.create_lesson(lesson_data, course_id)
+        await course_repository.bump_lessons_version(course_id)
+        course_analytics_service.invalidate(course_id)
+        background_tasks.spawn(search_service.index_lesson(lesson_in_db, course.created_at), name="index_search")
         
         return Lesson(
             _id=lesson_in_db.id,
@@ -46,10 +61,25 @@ class LessonService:
             created_at=lesson_in_db.created_at
         )
     
+    async def get_lessons_cache_validators(self, course_id: str) -> Tuple[str, Optional[datetime]]:
+        """ETag and Last-Modified for a course's lesson list, from the course's lessons version"""
+        course = await course_reads.do(course_id, lambda: course_repository.get_course_by_id(course_id))
+        
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        
+        return (
+            make_etag("lessons", course_id, course.lessons_version),
+            course.lessons_updated_at or course.created_at
+        )
+    
     async def get_lessons_by_course(self, course_id: str) -> List[Lesson]:
         """Get all lessons for a course"""
         # Verify course exists
-        course = await course_repository.get_course_by_id(course_id)
+        course = await course_reads.do(course_id, lambda: course_repository.get_course_by_id(course_id))
         
         if not course:
             raise HTTPException(
@@ -57,7 +87,9 @@ class LessonService:
                 detail="Course not found"
             )
         
-        lessons_in_db = await lesson_repository.get_lessons_by_course(course_id)
+        lessons_in_db = await lesson_reads.do(
+            ("course", course_id), lambda: lesson_repository.get_lessons_by_course(course_id)
+        )
         
         return [Lesson(
             _id=l.id,
@@ -72,7 +104,7 @@ class LessonService:
     
     async def get_lesson_by_id(self, lesson_id: str) -> Lesson:
         """Get lesson by ID"""
-        lesson_in_db = await lesson_repository.get_lesson_by_id(lesson_id)
+        lesson_in_db = await lesson_reads.do(("lesson", lesson_id), lambda: lesson_repository.get_lesson_by_id(lesson_id))
         
         if not lesson_in_db:
             raise HTTPException(
@@ -118,6 +150,8 @@ class LessonService:
         
         # Update lesson
         updated_lesson = await lesson_repository.update_lesson(lesson_id, lesson_update)
+        await course_repository.bump_lessons_version(lesson_in_db.course_id)
+        course_analytics_service.invalidate(lesson_in_db.course_id)
         
         if not updated_lesson:
             raise HTTPException(
@@ -125,6 +159,8 @@ class LessonService:
                 detail="Failed to update lesson"
             )
         
+        background_tasks.spawn(search_service.index_lesson(updated_lesson, course.created_at), name="index_search")
+        
         return Lesson(
             _id=updated_lesson.id,
             course_id=updated_lesson.course_id,
@@ -158,6 +194,8 @@ class LessonService:
         
         # Delete lesson
         success = await lesson_repository.delete_lesson(lesson_id)
+        await course_repository.bump_lessons_version(lesson_in_db.course_id)
+        course_analytics_service.invalidate(lesson_in_db.course_id)
         
         if not success:
             raise HTTPException(
@@ -165,6 +203,8 @@ class LessonService:
                 detail="Failed to delete lesson"
             )
         
+        background_tasks.spawn(search_service.remove_lesson(lesson_id), name="index_search")
+        
         return {"message": "Lesson deleted successfully"}
 
 
@@ -1,13 +1,46 @@
-from typing import List
+import io
+import os
+import csv
+import json
+from datetime import datetime, date, timedelta
+from typing import List, Optional, AsyncIterator, Tuple
 from fastapi import HTTPException, status
-from models.progress import Progress, CourseProgress
+from models.progress import (
+    Progress,
+    CourseProgress,
+    StudentCourseProgress,
+    ExportFormat,
+    HistoryBucket,
+    ProgressHistory,
+    ProgressHistoryPoint,
+)
+from models.pagination import PaginatedResponse, SortOrder
+from models.lesson import LessonInDB
 from repository.progress_repository import progress_repository
 from repository.lesson_repository import lesson_repository
 from repository.enrollment_repository import enrollment_repository
 from repository.course_repository import course_repository
-from models.enrollment import EnrollmentStatus
-from core.log_config import logger
-import asyncio
+from repository.activity_repository import activity_repository, day_start
+import logging
+from core.background import background_tasks
+from services.course_analytics_service import course_analytics_service
+from services.authorization_service import authorization_service
+from services.leaderboard_service import leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+# Course progress export: documents per cursor batch and bytes buffered per response chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", 64 * 1024))
+# Serve a student's own course progress from the counters embedded in the enrollment
+# (falls back to the progress collection for enrollments not backfilled yet)
+EMBEDDED_PROGRESS_READS = os.getenv("EMBEDDED_PROGRESS_READS", "true").lower() == "true"
+
+EXPORT_COLUMNS = [
+    "student_id", "student_email", "approved_at",
+    "lesson_id", "lesson_order", "lesson_title",
+    "completed", "completed_at"
+]
 
 
 class ProgressService:
@@ -24,29 +57,38 @@ class ProgressService:
                 detail="Lesson not found"
             )
         
-        # Check if student is enrolled in the course
-        enrollment = await enrollment_repository.check_enrollment_exists(
-            student_id, 
-            lesson.course_id
+        # Check if student is enrolled in the course (the lesson proves it exists)
+        await authorization_service.require_approved_enrollment(
+            student_id,
+            lesson.course_id,
+            detail="You must be enrolled in this course to mark lessons as complete",
+            verify_course=False
         )
         
-        if not enrollment or enrollment.status != EnrollmentStatus.APPROVED:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You must be enrolled in this course to mark lessons as complete"
-            )
-        
         # Mark lesson complete
-        progress_in_db = await progress_repository.mark_lesson_complete(
+        progress_in_db, newly_completed = await progress_repository.mark_lesson_complete(
             student_id, 
             lesson_id, 
             lesson.course_id
         )
         
-        logger.info(f"Student {student_id} completed lesson {lesson_id}")
+        await enrollment_repository.record_lesson_completion(progress_in_db)
+        
+        logger.info("Student %s completed lesson %s", student_id, lesson_id)
+        
+        if newly_completed:
+            course_analytics_service.invalidate(lesson.course_id)
+            background_tasks.spawn(
+                self._record_activity_async(lesson.course_id, student_id, progress_in_db.completed_at),
+                name="record_activity"
+            )
+            background_tasks.spawn(
+                leaderboard_service.record_completion(student_id, lesson.course_id, progress_in_db.completed_at),
+                name="leaderboard"
+            )
         
         # Trigger stats recalculation in background
-        asyncio.create_task(self._recalculate_stats_async(student_id))
+        background_tasks.spawn(self._recalculate_stats_async(student_id), name="recalculate_stats")
         
         return Progress(
             _id=progress_in_db.id,
@@ -63,32 +105,40 @@ class ProgressService:
             from services.student_stats_service import student_stats_service
             await student_stats_service.recalculate_student_stats(student_id)
         except Exception as e:
-            logger.error(f"Error recalculating stats for student {student_id}: {e}")
+            logger.error("Error recalculating stats for student %s: %s", student_id, e)
+    
+    async def _record_activity_async(self, course_id: str, student_id: str, completed_at: datetime):
+        """Update the daily activity rollup asynchronously"""
+        try:
+            await activity_repository.record_completion(course_id, student_id, completed_at)
+        except Exception as e:
+            logger.error("Error recording activity for course %s: %s", course_id, e)
     
     async def get_student_course_progress(self, course_id: str, student_id: str) -> CourseProgress:
         """Get student's progress for a specific course"""
-        # Verify course exists
-        course = await course_repository.get_course_by_id(course_id)
+        # Verify course exists and check enrollment; both are skipped on a cache hit
+        await authorization_service.require_approved_enrollment(
+            student_id,
+            course_id,
+            detail="You must be enrolled in this course to view progress"
+        )
         
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found"
-            )
+        # Get total lessons
+        total_lessons = await lesson_repository.count_lessons_by_course(course_id)
         
-        # Check enrollment
-        enrollment = await enrollment_repository.check_enrollment_exists(student_id, course_id)
+        completed = None
+        if EMBEDDED_PROGRESS_READS:
+            completed = await enrollment_repository.get_embedded_completed_count(student_id, course_id)
         
-        if not enrollment or enrollment.status != EnrollmentStatus.APPROVED:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You must be enrolled in this course to view progress"
+        if completed is not None:
+            percentage = (completed / total_lessons * 100) if total_lessons > 0 else 0
+            return CourseProgress(
+                course_id=course_id,
+                total_lessons=total_lessons,
+                completed_lessons=completed,
+                completion_percentage=round(percentage, 2)
             )
         
-        # Get total lessons
-        lessons = await lesson_repository.get_lessons_by_course(course_id)
-        total_lessons = len(lessons)
-        
         # Calculate progress
         course_progress = await progress_repository.calculate_course_completion_percentage(
             student_id,
@@ -100,30 +150,24 @@ class ProgressService:
     
     async def get_student_progress_details(self, course_id: str, student_id: str) -> List[Progress]:
         """Get detailed progress for a student in a course"""
-        # Verify course exists
-        course = await course_repository.get_course_by_id(course_id)
-        
-        if not course:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found"
-            )
+        # Verify course exists and check enrollment; both are skipped on a cache hit
+        await authorization_service.require_approved_enrollment(
+            student_id,
+            course_id,
+            detail="You must be enrolled in this course to view progress"
+        )
         
-        # Check enrollment
-        enrollment = await enrollment_repository.check_enrollment_exists(student_id, course_id)
+        # Get progress, from the enrollment document when it is in sync
+        progress_list = None
+        if EMBEDDED_PROGRESS_READS:
+            progress_list = await enrollment_repository.get_embedded_progress(student_id, course_id)
         
-        if not enrollment or enrollment.status != EnrollmentStatus.APPROVED:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You must be enrolled in this course to view progress"
+        if progress_list is None:
+            progress_list = await progress_repository.get_student_progress_for_course(
+                student_id, 
+                course_id
             )
         
-        # Get progress
-        progress_list = await progress_repository.get_student_progress_for_course(
-            student_id, 
-            course_id
-        )
-        
         return [Progress(
             _id=p.id,
             student_id=p.student_id,
@@ -156,8 +200,7 @@ class ProgressService:
             )
         
         # Get total lessons
-        lessons = await lesson_repository.get_lessons_by_course(course_id)
-        total_lessons = len(lessons)
+        total_lessons = await lesson_repository.count_lessons_by_course(course_id)
         
         # Calculate progress
         course_progress = await progress_repository.calculate_course_completion_percentage(
@@ -168,11 +211,195 @@ class ProgressService:
         
         return course_progress
     
+    async def get_course_students_progress(
+        self,
+        course_id: str,
+        mentor_id: str,
+        student_ids: Optional[List[str]] = None,
+        page: int = 1,
+        limit: int = 10,
+        sort: SortOrder = SortOrder.DESC
+    ) -> PaginatedResponse[StudentCourseProgress]:
+        """Get progress of every approved student in a mentor's course, sorted by completion (mentor only)"""
+        course = await course_repository.get_course_by_id(course_id)
+        
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        
+        if course.mentor_id != mentor_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view this course's progress"
+            )
+        
+        # One lesson count, one enrollment lookup and one $group over progress for the whole cohort
+        total_lessons = await lesson_repository.count_lessons_by_course(course_id)
+        enrolled_ids = await enrollment_repository.get_approved_student_ids(course_id, student_ids)
+        completed_by_student = await progress_repository.count_completed_by_student(course_id, student_ids)
+        
+        # Sort plain (percentage, student_id) keys; models are built for the page only.
+        # Ties are broken by student id so pages are stable
+        descending = sort == SortOrder.DESC
+        ranked = []
+        for student_id in enrolled_ids:
+            completed = completed_by_student.get(student_id, 0)
+            percentage = round(completed / total_lessons * 100, 2) if total_lessons > 0 else 0
+            ranked.append((-percentage if descending else percentage, student_id, completed))
+        ranked.sort()
+        
+        skip = (page - 1) * limit
+        items = [StudentCourseProgress(
+            student_id=student_id,
+            course_id=course_id,
+            total_lessons=total_lessons,
+            completed_lessons=completed,
+            completion_percentage=-key if descending else key
+        ) for key, student_id, completed in ranked[skip:skip + limit]]
+        
+        return PaginatedResponse.create(
+            items=items,
+            total=len(ranked),
+            page=page,
+            limit=limit
+        )
+    
+    async def export_course_progress(
+        self,
+        course_id: str,
+        mentor_id: str,
+        export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        """Check access and return a stream of export chunks (mentor only)
+        
+        Ownership is verified before the stream starts, so errors still
+        become proper HTTP responses. The stream yields one row per enrolled
+        student and lesson.
+        """
+        course = await course_repository.get_course_by_id(course_id)
+        
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        
+        if course.mentor_id != mentor_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to export this course's progress"
+            )
+        
+        lessons = await lesson_repository.get_lessons_by_course(course_id)
+        return self._export_rows(course_id, lessons, export_format)
+    
+    async def _export_rows(
+        self,
+        course_id: str,
+        lessons: List[LessonInDB],
+        export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        """Render enrollment rows into CSV or NDJSON chunks of about EXPORT_CHUNK_BYTES"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+        
+        students = enrollment_repository.stream_course_progress(course_id, batch_size=EXPORT_BATCH_SIZE)
+        async for student in students:
+            completed = {p["lesson_id"]: p for p in student["progress"] if p.get("completed")}
+            approved_at = student.get("approved_at")
+            for lesson in lessons:
+                record = completed.get(lesson.id)
+                completed_at = record.get("completed_at") if record else None
+                row = [
+                    student["student_id"],
+                    student.get("email"),
+                    approved_at.isoformat() if approved_at else None,
+                    lesson.id,
+                    lesson.order,
+                    lesson.title,
+                    record is not None,
+                    completed_at.isoformat() if completed_at else None
+                ]
+                if export_format == ExportFormat.CSV:
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, row))))
+                    buffer.write("\n")
+            
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    async def get_progress_history(
+        self,
+        student_id: str,
+        bucket: HistoryBucket = HistoryBucket.DAY,
+        periods: int = 30
+    ) -> ProgressHistory:
+        """Get a student's completions per day or ISO week, oldest first and zero-filled, with streaks
+        
+        The window covers `periods` buckets up to and including the current
+        one. Streaks count consecutive UTC days with a completion over the
+        whole history; the current streak is still alive if the last
+        completion was yesterday.
+        """
+        today = day_start(datetime.utcnow())
+        step = timedelta(days=7 if bucket == HistoryBucket.WEEK else 1)
+        current = today - timedelta(days=today.weekday()) if bucket == HistoryBucket.WEEK else today
+        start = current - step * (periods - 1)
+        
+        history = await progress_repository.get_completion_history(student_id, start, bucket)
+        
+        rows = {row["start"]: row for row in history["points"]}
+        points = []
+        for offset in range(periods):
+            bucket_start = start + step * offset
+            row = rows.get(bucket_start, {})
+            points.append(ProgressHistoryPoint(
+                start=bucket_start.date(),
+                completions=row.get("completions", 0),
+                courses=row.get("courses", 0)
+            ))
+        
+        current_streak, longest_streak = _streaks([day.date() for day in history["days"]], today.date())
+        
+        return ProgressHistory(
+            bucket=bucket,
+            start=start.date(),
+            end=(current + step - timedelta(days=1)).date(),
+            points=points,
+            total_completions=sum(point.completions for point in points),
+            active_days=len(history["days"]),
+            current_streak_days=current_streak,
+            longest_streak_days=longest_streak
+        )
+    
     async def is_lesson_completed(self, lesson_id: str, student_id: str) -> bool:
         """Check if a lesson is completed by a student"""
         return await progress_repository.is_lesson_completed(student_id, lesson_id)
 
 
+def _streaks(days: List[date], today: date) -> Tuple[int, int]:
+    """(current, longest) runs of consecutive days in a sorted list of distinct days"""
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    
+    current = run if previous is not None and today - previous <= timedelta(days=1) else 0
+    return current, longest
+
+
 # Create singleton instance
 progress_service = ProgressService()
 
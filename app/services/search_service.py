@@ -0,0 +1,137 @@
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from models.course import CourseInDB, CourseSearchResult
+from models.lesson import LessonInDB
+from models.enrollment import Enrollment, EnrollmentStatus
+from models.pagination import CursorPage
+from repository.search_repository import search_repository
+from core.search import search_terms, encode_cursor, decode_cursor
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ranking: lesson-title matches count for less than course matches, and newer
+# courses get a bonus that halves every SEARCH_RECENCY_HALF_LIFE_DAYS
+SEARCH_LESSON_WEIGHT = float(os.getenv("SEARCH_LESSON_WEIGHT", 0.5))
+SEARCH_RECENCY_WEIGHT = float(os.getenv("SEARCH_RECENCY_WEIGHT", 1.0))
+SEARCH_RECENCY_HALF_LIFE_DAYS = float(os.getenv("SEARCH_RECENCY_HALF_LIFE_DAYS", 30))
+
+
+class SearchService:
+    """Service for course search and keeping the search index in sync"""
+
+    async def search_courses(
+        self,
+        query: str,
+        include_lessons: bool = False,
+        limit: int = 10,
+        cursor: str = None,
+        student_id: str = None
+    ) -> CursorPage[CourseSearchResult]:
+        """Search courses by title, description and optionally lesson titles (public)
+        
+        With student_id, each result carries that student's enrollment.
+        """
+        terms = search_terms(query)
+        if not terms:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must contain at least one word"
+            )
+
+        after = None
+        # The reference time travels in the cursor so recency bonuses, and
+        # therefore ranks, stay identical across pages
+        now = datetime.utcnow()
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+                now = datetime.fromisoformat(after["now"])
+                after = {"rank": float(after["rank"]), "id": str(after["id"])}
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
+        rows = await search_repository.search(
+            terms,
+            include_lessons=include_lessons,
+            lesson_weight=SEARCH_LESSON_WEIGHT,
+            recency_weight=SEARCH_RECENCY_WEIGHT,
+            half_life_ms=SEARCH_RECENCY_HALF_LIFE_DAYS * 86_400_000,
+            now=now,
+            after=after,
+            limit=limit + 1,
+            student_id=student_id
+        )
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor({"rank": last["rank"], "id": last["course_id"], "now": now.isoformat()})
+
+        items = [CourseSearchResult(
+            _id=row["course_id"],
+            title=row["course"]["title"],
+            description=row["course"]["description"],
+            mentor_id=row["course"]["mentor_id"],
+            created_at=row["course"]["created_at"],
+            updated_at=row["course"]["updated_at"],
+            score=round(row["rank"], 4),
+            matched_lessons=row["matched_lessons"],
+            enrollment=self._enrollment(row.get("enrollment"))
+        ) for row in page if row.get("course")]
+
+        return CursorPage[CourseSearchResult](items=items, limit=limit, next_cursor=next_cursor)
+
+    @staticmethod
+    def _enrollment(enrollment: Optional[dict]) -> Optional[Enrollment]:
+        if not enrollment:
+            return None
+        return Enrollment(
+            _id=str(enrollment["_id"]),
+            student_id=enrollment["student_id"],
+            course_id=enrollment["course_id"],
+            status=EnrollmentStatus(enrollment["status"]),
+            requested_at=enrollment["requested_at"],
+            approved_at=enrollment.get("approved_at"),
+            approved_by=enrollment.get("approved_by"),
+            version=enrollment.get("version", 0)
+        )
+
+    async def index_course(self, course: CourseInDB) -> None:
+        """Add or refresh a course in the search index"""
+        try:
+            await search_repository.upsert_documents([search_repository.course_document(course)])
+        except Exception as e:
+            logger.error("Error indexing course %s for search: %s", course.id, e)
+
+    async def index_lesson(self, lesson: LessonInDB, course_created_at: datetime) -> None:
+        """Add or refresh a lesson in the search index"""
+        try:
+            await search_repository.upsert_documents([
+                search_repository.lesson_document(lesson, course_created_at)
+            ])
+        except Exception as e:
+            logger.error("Error indexing lesson %s for search: %s", lesson.id, e)
+
+    async def remove_course(self, course_id: str) -> None:
+        """Remove a course and its lessons from the search index"""
+        try:
+            await search_repository.delete_course(course_id)
+        except Exception as e:
+            logger.error("Error removing course %s from search: %s", course_id, e)
+
+    async def remove_lesson(self, lesson_id: str) -> None:
+        try:
+            await search_repository.delete_lesson(lesson_id)
+        except Exception as e:
+            logger.error("Error removing lesson %s from search: %s", lesson_id, e)
+
+
+# Create singleton instance
+search_service = SearchService()
@@ -5,7 +5,9 @@ from repository.student_stats_repository import student_stats_repository
 from repository.enrollment_repository import enrollment_repository
 from repository.lesson_repository import lesson_repository
 from repository.progress_repository import progress_repository
-from core.log_config import logger
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class StudentStatsService:
@@ -109,12 +111,13 @@ class StudentStatsService:
                 overall_progress_percentage=overall_progress_percentage
             )
             
-            logger.info(f"Recalculated stats for student {student_id}: "
-                       f"{total_completed_lessons}/{total_available_lessons} lessons, "
-                       f"{overall_progress_percentage}% complete")
+            logger.info(
+                "Recalculated stats for student %s: %s/%s lessons, %s%% complete",
+                student_id, total_completed_lessons, total_available_lessons, overall_progress_percentage
+            )
             
         except Exception as e:
-            logger.error(f"Error recalculating student stats for {student_id}: {e}")
+            logger.error("Error recalculating student stats for %s: %s", student_id, e)
             raise
 
 
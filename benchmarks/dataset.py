@@ -0,0 +1,22 @@
+"""
+Seed the benchmark dataset into MongoDB
+Run this script: python benchmarks/dataset.py --drop --students 10000 --courses 2000 --lessons 50
+
+Thin wrapper around app/data_generator.py; accepts the same arguments.
+All benchmark users share BENCH_PASSWORD and use predictable emails
+(see student_email / mentor_email) so the load driver can log in as any of them.
+"""
+import asyncio
+import os
+import sys
+
+# Make the application packages importable (core, models, data_generator, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from data_generator import DEFAULT_PASSWORD as BENCH_PASSWORD, generate_data, mentor_email, parse_args, student_email
+
+__all__ = ["BENCH_PASSWORD", "mentor_email", "student_email"]
+
+
+if __name__ == "__main__":
+    print(asyncio.run(generate_data(parse_args())))
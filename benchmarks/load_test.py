@@ -0,0 +1,277 @@
+"""
+Drive the main API flows against a running server and report latency percentiles
+Run this script: python benchmarks/load_test.py --base-url http://localhost:5001 --output results.json
+
+Expects a dataset seeded with benchmarks/dataset.py. Each scenario runs for
+--duration seconds with --concurrency virtual users; every request is timed
+and grouped by endpoint. Results are written as JSON and can be compared
+against a previous run with --baseline.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from dataset import BENCH_PASSWORD, mentor_email, student_email
+
+SCENARIOS = ("login", "dashboard", "mentor_dashboard", "lesson_completion", "mentor_pending", "catalog_paging")
+
+
+class Recorder:
+    """Collects per-endpoint latencies and error counts"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+        return response
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint in sorted(set(recorder.latencies) | set(recorder.errors)):
+        values = sorted(recorder.latencies[endpoint])
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": recorder.errors[endpoint],
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "p99_ms": round(percentile(values, 0.99), 3),
+            "max_ms": round(values[-1], 3) if values else 0.0,
+        }
+    return endpoints
+
+
+async def login(client: httpx.AsyncClient, email: str, role: str) -> str:
+    response = await client.post("/auth/login", json={"email": email, "password": BENCH_PASSWORD, "role": role})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+class VirtualUser:
+    """One simulated user; logs in once and keeps its token for the scenario"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, args, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.rng = rng
+        self.headers = {}
+        self.lesson_ids = []
+
+    async def setup_student(self):
+        email = student_email(self.rng.randrange(self.args.students))
+        self.headers = {"Authorization": f"Bearer {await login(self.client, email, 'STUDENT')}"}
+
+    async def setup_mentor(self):
+        email = mentor_email(self.rng.randrange(self.args.mentors))
+        self.headers = {"Authorization": f"Bearer {await login(self.client, email, 'MENTOR')}"}
+
+    async def load_lessons(self):
+        """Collect lessons from the student's approved courses for the completion scenario"""
+        response = await self.client.get("/enrollments/my-courses", params={"limit": 100}, headers=self.headers)
+        response.raise_for_status()
+        for course in response.json()["items"]:
+            lessons = await self.client.get(f"/courses/{course['_id']}/lessons", headers=self.headers)
+            if lessons.status_code == 200:
+                self.lesson_ids.extend(lesson["_id"] for lesson in lessons.json())
+
+    async def login_flow(self):
+        if self.rng.random() < 0.5:
+            email, role = student_email(self.rng.randrange(self.args.students)), "STUDENT"
+        else:
+            email, role = mentor_email(self.rng.randrange(self.args.mentors)), "MENTOR"
+        await self.recorder.request(
+            self.client, "POST /auth/login", "POST", "/auth/login",
+            json={"email": email, "password": BENCH_PASSWORD, "role": role}
+        )
+
+    async def dashboard_flow(self):
+        # Same call the student dashboard makes on load
+        await self.recorder.request(
+            self.client, "GET /dashboard/student", "GET", "/dashboard/student",
+            params={"page": 1, "limit": 6}, headers=self.headers
+        )
+
+    async def mentor_dashboard_flow(self):
+        # Same call the mentor dashboard makes on load
+        await self.recorder.request(
+            self.client, "GET /dashboard/mentor", "GET", "/dashboard/mentor",
+            params={"page": 1, "limit": 6}, headers=self.headers
+        )
+
+    async def lesson_completion_flow(self):
+        if not self.lesson_ids:
+            await self.dashboard_flow()
+            return
+        lesson_id = self.rng.choice(self.lesson_ids)
+        await self.recorder.request(
+            self.client, "POST /progress/lessons/{lesson_id}/complete", "POST",
+            f"/progress/lessons/{lesson_id}/complete", headers=self.headers
+        )
+
+    async def mentor_pending_flow(self):
+        await self.recorder.request(
+            self.client, "GET /enrollments/pending", "GET", "/enrollments/pending", headers=self.headers
+        )
+
+    async def catalog_paging_flow(self):
+        page = self.rng.randint(1, max(1, self.args.courses // self.args.page_size))
+        await self.recorder.request(
+            self.client, "GET /courses/", "GET", "/courses/",
+            params={"page": page, "limit": self.args.page_size}
+        )
+
+
+async def run_scenario(name: str, args) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = [VirtualUser(client, recorder, args, random.Random(args.seed * 1000 + i)) for i in range(args.concurrency)]
+
+        if name in ("dashboard", "lesson_completion"):
+            await asyncio.gather(*(user.setup_student() for user in users))
+        elif name in ("mentor_dashboard", "mentor_pending"):
+            await asyncio.gather(*(user.setup_mentor() for user in users))
+        if name == "lesson_completion":
+            await asyncio.gather(*(user.load_lessons() for user in users))
+
+        flow = {
+            "login": VirtualUser.login_flow,
+            "dashboard": VirtualUser.dashboard_flow,
+            "mentor_dashboard": VirtualUser.mentor_dashboard_flow,
+            "lesson_completion": VirtualUser.lesson_completion_flow,
+            "mentor_pending": VirtualUser.mentor_pending_flow,
+            "catalog_paging": VirtualUser.catalog_paging_flow,
+        }[name]
+
+        async def loop(user: VirtualUser, deadline: float):
+            while time.perf_counter() < deadline:
+                await flow(user)
+
+        # Warm-up requests are not recorded
+        if args.warmup > 0:
+            warmup_recorder = Recorder()
+            for user in users:
+                user.recorder = warmup_recorder
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(loop(user, deadline) for user in users))
+            for user in users:
+                user.recorder = recorder
+
+        start = time.perf_counter()
+        await asyncio.gather(*(loop(user, start + args.duration) for user in users))
+        elapsed = time.perf_counter() - start
+
+    return {"duration_seconds": round(elapsed, 3), "endpoints": summarize(recorder, elapsed)}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return regressions where p95 grew by more than `tolerance` (a fraction)"""
+    regressions = []
+    for scenario, data in results["scenarios"].items():
+        base_endpoints = baseline.get("scenarios", {}).get(scenario, {}).get("endpoints", {})
+        for endpoint, stats in data["endpoints"].items():
+            base = base_endpoints.get(endpoint)
+            if not base or not base["p95_ms"]:
+                continue
+            change = (stats["p95_ms"] - base["p95_ms"]) / base["p95_ms"]
+            print(f"{scenario:18} {endpoint:48} p95 {base['p95_ms']:9.2f} -> {stats['p95_ms']:9.2f} ms ({change:+.1%})")
+            if change > tolerance:
+                regressions.append({"scenario": scenario, "endpoint": endpoint, "change": round(change, 4)})
+    return regressions
+
+
+async def main(args) -> int:
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "students": args.students,
+            "mentors": args.mentors,
+            "courses": args.courses,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        print(f"Running {name} ({args.concurrency} users, {args.duration}s)...", file=sys.stderr)
+        results["scenarios"][name] = await run_scenario(name, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} endpoint(s) regressed beyond {args.tolerance:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the API hot paths")
+    parser.add_argument("--base-url", default="http://localhost:5001")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=5, help="Unrecorded seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--students", type=int, default=10000, help="Students in the seeded dataset")
+    parser.add_argument("--mentors", type=int, default=200, help="Mentors in the seeded dataset")
+    parser.add_argument("--courses", type=int, default=2000, help="Courses in the seeded dataset")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="Previous results file to compare p95 latency against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed p95 growth vs baseline")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,174 @@
+"""
+Compression trade-off benchmark: CPU time versus bytes on the wire
+Run this script: python benchmarks/micro/compression.py [--bandwidth-kbps 1000] [--output compression.json]
+
+Serializes representative API payloads with the real response models, then
+compresses each one with gzip (and brotli, if installed) at several levels.
+For every combination it reports the median compression time, the compressed
+size and ratio, and compression time plus the transfer time on a link of
+--bandwidth-kbps, which is roughly what a student on a slow connection feels.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "app"))
+
+from core.compression import compress_body, brotli
+from models.course import Course
+from models.enrollment import Enrollment, EnrollmentStatus
+from models.lesson import Lesson, LessonType
+from models.pagination import PaginatedResponse
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+WORDS = (
+    "lesson walk through core ideas step worked examples common mistakes avoid short exercise "
+    "check understanding variables functions loops data structures testing debugging design "
+    "patterns performance memory network database query index cache async events state review"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    """Pseudo-prose from a fixed vocabulary; real descriptions repeat less than copy-paste"""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _lesson_list(count: int) -> bytes:
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    course_id = str(ObjectId())
+    lessons = [Lesson(
+        _id=str(ObjectId()),
+        course_id=course_id,
+        title=f"Lesson {i + 1}: Topic {i % 7}",
+        description=_text(rng, 60),
+        type=list(LessonType)[i % len(LessonType)],
+        order=i,
+        duration=5 + i % 55,
+        created_at=now - timedelta(days=i)
+    ) for i in range(count)]
+    return json.dumps([lesson.model_dump(mode="json", by_alias=True) for lesson in lessons]).encode()
+
+
+def _enrollment_page(count: int) -> bytes:
+    now = datetime.utcnow()
+    enrollments = [Enrollment(
+        _id=str(ObjectId()),
+        student_id=str(ObjectId()),
+        course_id=str(ObjectId()),
+        status=list(EnrollmentStatus)[i % len(EnrollmentStatus)],
+        requested_at=now - timedelta(hours=i),
+        approved_at=now - timedelta(hours=i - 1) if i % 3 == 1 else None,
+        approved_by=str(ObjectId()) if i % 3 == 1 else None
+    ) for i in range(count)]
+    page = PaginatedResponse[Enrollment].create(items=enrollments, total=count * 10, page=1, limit=count)
+    return page.model_dump_json(by_alias=True).encode()
+
+
+def _catalog_page(count: int) -> bytes:
+    rng = random.Random(2)
+    now = datetime.utcnow()
+    courses = [Course(
+        _id=str(ObjectId()),
+        title=f"Course {i}",
+        description=_text(rng, 30),
+        mentor_id=str(ObjectId()),
+        created_at=now - timedelta(days=i),
+        updated_at=now - timedelta(days=i)
+    ) for i in range(count)]
+    page = PaginatedResponse[Course].create(items=courses, total=count * 20, page=1, limit=count)
+    return page.model_dump_json(by_alias=True).encode()
+
+
+def payloads() -> dict:
+    return {
+        "lessons[50]": _lesson_list(50),
+        "enrollments_page[100]": _enrollment_page(100),
+        "catalog_page[100]": _catalog_page(100),
+        "catalog_page[10]": _catalog_page(10),
+    }
+
+
+def codecs() -> list:
+    """(label, encoding, gzip_level, brotli_quality) combinations to measure"""
+    combinations = [("identity", None, 0, 0)]
+    combinations += [(f"gzip-{level}", "gzip", level, 0) for level in GZIP_LEVELS]
+    if brotli is not None:
+        combinations += [(f"br-{quality}", "br", 0, quality) for quality in BROTLI_QUALITIES]
+    return combinations
+
+
+def median_ms(function, min_time: float, rounds: int) -> float:
+    """Median milliseconds per call over `rounds` rounds of at least `min_time` seconds each"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure compression CPU cost against bytes saved")
+    parser.add_argument("--bandwidth-kbps", type=float, default=1000, help="Link speed used for transfer estimates")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    if brotli is None:
+        print("brotli is not installed; measuring gzip only (pip install brotli)\n")
+
+    bytes_per_ms = args.bandwidth_kbps * 1000 / 8 / 1000
+    results = {}
+    print(f"{'payload':24} {'codec':9} {'bytes':>9} {'ratio':>6} {'cpu_ms':>9} {'total_ms':>9}"
+          f"  (transfer at {args.bandwidth_kbps:g} kbps)")
+    for name, body in payloads().items():
+        results[name] = {}
+        for label, encoding, gzip_level, brotli_quality in codecs():
+            if encoding is None:
+                size, cpu_ms = len(body), 0.0
+            else:
+                size = len(compress_body(body, encoding, gzip_level, brotli_quality))
+                cpu_ms = median_ms(
+                    lambda: compress_body(body, encoding, gzip_level, brotli_quality),
+                    args.min_time, args.rounds
+                )
+            total_ms = cpu_ms + size / bytes_per_ms
+            results[name][label] = {
+                "bytes": size,
+                "ratio": round(len(body) / size, 2),
+                "cpu_ms": round(cpu_ms, 4),
+                "total_ms": round(total_ms, 2),
+            }
+            print(f"{name:24} {label:9} {size:9d} {len(body) / size:6.2f} {cpu_ms:9.4f} {total_ms:9.2f}")
+        print()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"bandwidth_kbps": args.bandwidth_kbps, "payloads": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+In-memory stand-in for the subset of the Motor API the repositories use.
+
+Documents live in plain lists so benchmark numbers measure the Python side
+(query building, document -> model conversion) without network or server
+variance. Filters support equality, $in, $nin and $ne; updates support $set,
+$inc and $setOnInsert.
+"""
+import copy
+from bson import ObjectId
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+            for operator, operand in condition.items():
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$nin" and value in operand:
+                    return False
+                if operator == "$ne" and value == operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _apply_update(document: dict, update: dict, inserting: bool = False) -> None:
+    for field, value in update.get("$set", {}).items():
+        document[field] = value
+    for field, value in update.get("$inc", {}).items():
+        document[field] = document.get(field, 0) + value
+    if inserting:
+        for field, value in update.get("$setOnInsert", {}).items():
+            document[field] = value
+
+
+class _Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeCursor:
+    def __init__(self, documents: list):
+        self._documents = documents
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, field_direction in reversed(keys):
+            self._documents.sort(key=lambda d: d.get(field), reverse=field_direction < 0)
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def _window(self) -> list:
+        end = self._skip + self._limit if self._limit else None
+        return self._documents[self._skip:end]
+
+    async def to_list(self, length=None):
+        window = self._window()
+        return window if length is None else window[:length]
+
+    def __aiter__(self):
+        self._iter = iter(self._window())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.documents: list = []
+
+    async def find_one(self, query: dict = None, *args, **kwargs):
+        for document in self.documents:
+            if _matches(document, query or {}):
+                return document
+        return None
+
+    def find(self, query: dict = None, *args, **kwargs) -> FakeCursor:
+        return FakeCursor([d for d in self.documents if _matches(d, query or {})])
+
+    async def count_documents(self, query: dict, **kwargs) -> int:
+        return sum(1 for d in self.documents if _matches(d, query))
+
+    async def distinct(self, field: str, query: dict = None):
+        return list({d.get(field) for d in self.documents if _matches(d, query or {})})
+
+    async def insert_one(self, document: dict):
+        document = copy.copy(document)
+        document.setdefault("_id", ObjectId())
+        self.documents.append(document)
+        return _Result(inserted_id=document["_id"])
+
+    async def insert_many(self, documents: list, ordered: bool = True):
+        ids = [(await self.insert_one(document)).inserted_id for document in documents]
+        return _Result(inserted_ids=ids)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        for document in self.documents:
+            if _matches(document, query):
+                _apply_update(document, update)
+                return _Result(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            document = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            _apply_update(document, update, inserting=True)
+            result = await self.insert_one(document)
+            return _Result(matched_count=0, modified_count=0, upserted_id=result.inserted_id)
+        return _Result(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def update_many(self, query: dict, update: dict):
+        matched = [d for d in self.documents if _matches(d, query)]
+        for document in matched:
+            _apply_update(document, update)
+        return _Result(matched_count=len(matched), modified_count=len(matched))
+
+    async def delete_one(self, query: dict):
+        for index, document in enumerate(self.documents):
+            if _matches(document, query):
+                del self.documents[index]
+                return _Result(deleted_count=1)
+        return _Result(deleted_count=0)
+
+    async def delete_many(self, query: dict):
+        before = len(self.documents)
+        self.documents = [d for d in self.documents if not _matches(d, query)]
+        return _Result(deleted_count=before - len(self.documents))
+
+
+class FakeDatabase:
+    def __init__(self):
+        self._collections = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
@@ -0,0 +1,254 @@
+"""
+Micro-benchmarks for the repository, model-conversion and security layers
+Run this script: python benchmarks/micro/run.py [--filter course] [--write-thresholds]
+
+MongoDB is replaced by the in-memory FakeDatabase so results are stable.
+Each benchmark reports the median time per call; any benchmark whose median
+exceeds its entry in thresholds.json makes the script exit non-zero.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "app"))
+
+from core import mongodb
+from core.security import create_access_token, hash_password, verify_token
+from models.course import Course
+from models.pagination import PaginatedResponse
+from models.enrollment import EnrollmentStatus
+from repository.course_repository import course_repository
+from repository.progress_repository import progress_repository
+from services.course_service import course_service
+from services.student_stats_service import student_stats_service
+
+from fake_mongo import FakeDatabase
+
+THRESHOLDS_FILE = os.path.join(HERE, "thresholds.json")
+# Thresholds are written with this much headroom over the measured median
+THRESHOLD_HEADROOM = 2.0
+
+SIZES = (1, 100, 10000)
+STATS_COURSES = 20
+STATS_LESSONS_PER_COURSE = 50
+
+
+def _course_documents(count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Course {i}",
+            "description": f"Description of course {i}",
+            "mentor_id": "mentor-1",
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def _progress_documents(count: int, student_id: str, course_id: str) -> list:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "student_id": student_id,
+            "lesson_id": str(ObjectId()),
+            "course_id": course_id,
+            "completed": True,
+            "completed_at": now,
+        }
+        for _ in range(count)
+    ]
+
+
+def _use_database(database: FakeDatabase) -> None:
+    mongodb.database = database
+
+
+def _setup_courses(size: int) -> None:
+    database = FakeDatabase()
+    database["courses"].documents = _course_documents(size)
+    _use_database(database)
+
+
+def _setup_progress(size: int) -> None:
+    database = FakeDatabase()
+    database["progress"].documents = _progress_documents(size, "student-1", "course-1")
+    _use_database(database)
+
+
+def _setup_stats() -> None:
+    """One student with STATS_COURSES approved courses, half of each completed"""
+    database = FakeDatabase()
+    student_id = "student-1"
+    for c in range(STATS_COURSES):
+        course_id = f"course-{c}"
+        database["enrollments"].documents.append({
+            "_id": ObjectId(),
+            "student_id": student_id,
+            "course_id": course_id,
+            "status": EnrollmentStatus.APPROVED.value,
+            "requested_at": datetime.utcnow(),
+        })
+        for order in range(STATS_LESSONS_PER_COURSE):
+            lesson_id = ObjectId()
+            database["lessons"].documents.append({
+                "_id": lesson_id,
+                "course_id": course_id,
+                "title": f"Lesson {order}",
+                "description": "",
+                "type": "VIDEO",
+                "order": order,
+                "created_at": datetime.utcnow(),
+            })
+            if order % 2 == 0:
+                database["progress"].documents.append({
+                    "_id": ObjectId(),
+                    "student_id": student_id,
+                    "lesson_id": str(lesson_id),
+                    "course_id": course_id,
+                    "completed": True,
+                    "completed_at": datetime.utcnow(),
+                })
+    _use_database(database)
+
+
+def build_benchmarks() -> list:
+    """Return (name, setup, callable, is_async) tuples"""
+    benchmarks = []
+
+    for size in SIZES:
+        benchmarks.append((
+            f"course_repository.get_all_courses[{size}]",
+            lambda size=size: _setup_courses(size),
+            lambda size=size: course_repository.get_all_courses(skip=0, limit=size),
+            True,
+        ))
+        benchmarks.append((
+            f"course_service.get_all_courses[{size}]",
+            lambda size=size: _setup_courses(size),
+            lambda size=size: course_service.get_all_courses(page=1, limit=size),
+            True,
+        ))
+        benchmarks.append((
+            f"progress_repository.get_student_progress_for_course[{size}]",
+            lambda size=size: _setup_progress(size),
+            lambda: progress_repository.get_student_progress_for_course("student-1", "course-1"),
+            True,
+        ))
+
+        courses = [
+            Course(_id=str(d["_id"]), title=d["title"], description=d["description"], mentor_id=d["mentor_id"],
+                   created_at=d["created_at"], updated_at=d["updated_at"])
+            for d in _course_documents(size)
+        ]
+        benchmarks.append((
+            f"PaginatedResponse.create[{size}]",
+            None,
+            lambda courses=courses: PaginatedResponse[Course].create(items=courses, total=len(courses) * 10, page=2, limit=len(courses)),
+            False,
+        ))
+
+    token = create_access_token({"user_id": "user-1", "email": "bench@progress.test", "role": "STUDENT"})
+    benchmarks.append(("verify_token", None, lambda: verify_token(token), False))
+    benchmarks.append(("hash_password", None, lambda: hash_password("bench123"), False))
+    benchmarks.append((
+        f"student_stats_service.recalculate_student_stats[{STATS_COURSES}x{STATS_LESSONS_PER_COURSE}]",
+        _setup_stats,
+        lambda: student_stats_service.recalculate_student_stats("student-1"),
+        True,
+    ))
+    return benchmarks
+
+
+def _time_calls(call, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        call()
+    return time.perf_counter() - start
+
+
+def measure(function, is_async: bool, loop, min_time: float, rounds: int) -> float:
+    """Median milliseconds per call over `rounds` rounds of at least `min_time` seconds each"""
+    call = (lambda: loop.run_until_complete(function())) if is_async else function
+
+    # Calibrate the number of calls per round
+    call()
+    number = 1
+    while True:
+        elapsed = _time_calls(call, number)
+        if elapsed >= min_time:
+            break
+        # Scale towards min_time, growing at most 10x per step
+        number = min(number * 10, max(number + 1, int(number * min_time / max(elapsed, 1e-9))))
+
+    timings = [_time_calls(call, number) / number * 1000 for _ in range(rounds)]
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--write-thresholds", action="store_true",
+                        help=f"Store median x {THRESHOLD_HEADROOM} as the new thresholds")
+    args = parser.parse_args(argv)
+
+    thresholds = {}
+    if os.path.exists(THRESHOLDS_FILE):
+        with open(THRESHOLDS_FILE) as f:
+            thresholds = json.load(f)
+
+    # Repository INFO logs would otherwise dominate the fast paths
+    logging.disable(logging.CRITICAL)
+
+    loop = asyncio.new_event_loop()
+    results, failures = {}, []
+    for name, setup, function, is_async in build_benchmarks():
+        if args.filter and args.filter not in name:
+            continue
+        if setup:
+            setup()
+        median_ms = measure(function, is_async, loop, args.min_time, args.rounds)
+        limit = thresholds.get(name)
+        status = "ok"
+        if limit is not None and median_ms > limit:
+            status = "REGRESSION"
+            failures.append(name)
+        results[name] = {"median_ms": round(median_ms, 6), "threshold_ms": limit, "status": status}
+        print(f"{name:70} {median_ms:12.4f} ms  (limit {limit if limit is not None else '-'}) {status}")
+    loop.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.write_thresholds:
+        thresholds.update({name: round(r["median_ms"] * THRESHOLD_HEADROOM, 4) for name, r in results.items()})
+        with open(THRESHOLDS_FILE, "w") as f:
+            json.dump(dict(sorted(thresholds.items())), f, indent=2)
+            f.write("\n")
+        print(f"Wrote {len(results)} thresholds to {THRESHOLDS_FILE}")
+        return 0
+
+    if failures:
+        print(f"{len(failures)} benchmark(s) exceeded their threshold", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
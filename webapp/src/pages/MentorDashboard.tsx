@@ -26,16 +26,17 @@ import { Add, School, People, CheckCircle, HourglassEmpty, Check, Close } from '
 import { useAuth } from '../hooks/useAuth';
 import { useNavigate } from 'react-router-dom';
 import Layout from '../components/layout/Layout';
-import courseService from '../services/courseService';
 import enrollmentService from '../services/enrollmentService';
-import type { Course, Enrollment } from '../types/course';
+import dashboardService from '../services/dashboardService';
+import type { MentorCourseSummary, PendingEnrollment } from '../services/dashboardService';
 
 const MentorDashboard: React.FC = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
-  const [courses, setCourses] = useState<Course[]>([]);
+  const [courses, setCourses] = useState<MentorCourseSummary[]>([]);
   const [loading, setLoading] = useState(true);
-  const [enrollmentRequests, setEnrollmentRequests] = useState<Enrollment[]>([]);
+  const [enrollmentRequests, setEnrollmentRequests] = useState<PendingEnrollment[]>([]);
+  const [pendingTotal, setPendingTotal] = useState(0);
   const [showEnrollmentsDialog, setShowEnrollmentsDialog] = useState(false);
   const [processing, setProcessing] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -53,16 +54,13 @@ const MentorDashboard: React.FC = () => {
   const loadData = async () => {
     try {
       setLoading(true);
-      const [coursesResponse, enrollmentsData, studentsCount] = await Promise.all([
-        courseService.getMyCourses(page, limit),
-        enrollmentService.getPendingEnrollments(),
-        enrollmentService.getEnrolledStudentsCount(),
-      ]);
-      setCourses(coursesResponse.items);
-      setTotalPages(coursesResponse.total_pages);
-      setTotalCourses(coursesResponse.total);
-      setEnrollmentRequests(enrollmentsData);
-      setEnrolledStudentsCount(studentsCount);
+      const dashboard = await dashboardService.getMentorDashboard(page, limit);
+      setCourses(dashboard.courses.items);
+      setTotalPages(dashboard.courses.total_pages);
+      setTotalCourses(dashboard.courses.total);
+      setEnrollmentRequests(dashboard.pending_requests);
+      setPendingTotal(dashboard.pending_total);
+      setEnrolledStudentsCount(dashboard.enrolled_students);
     } catch (error) {
       console.error('Failed to load data:', error);
       setError('Failed to load data');
@@ -76,33 +74,61 @@ const MentorDashboard: React.FC = () => {
     window.scrollTo({ top: 0, behavior: 'smooth' });
   };
 
-  const handleApproveEnrollment = async (enrollmentId: string) => {
+  const handleApproveEnrollment = async (enrollmentId: string, version: number) => {
     try {
       setProcessing(enrollmentId);
       setError(null);
-      await enrollmentService.approveEnrollment(enrollmentId);
+      await enrollmentService.approveEnrollment(enrollmentId, version);
       setSuccessMessage('Enrollment approved successfully!');
       // Refresh data
       await loadData();
     } catch (err: any) {
       console.error('Error approving enrollment:', err);
       setError(err.response?.data?.detail || 'Failed to approve enrollment');
+      if (err.response?.status === 409) {
+        // Someone else decided it first; show the current state
+        await loadData();
+      }
     } finally {
       setProcessing(null);
     }
   };
 
-  const handleRejectEnrollment = async (enrollmentId: string) => {
+  const handleRejectEnrollment = async (enrollmentId: string, version: number) => {
     try {
       setProcessing(enrollmentId);
       setError(null);
-      await enrollmentService.rejectEnrollment(enrollmentId);
+      await enrollmentService.rejectEnrollment(enrollmentId, version);
       setSuccessMessage('Enrollment rejected');
       // Refresh data
       await loadData();
     } catch (err: any) {
       console.error('Error rejecting enrollment:', err);
       setError(err.response?.data?.detail || 'Failed to reject enrollment');
+      if (err.response?.status === 409) {
+        // Someone else decided it first; show the current state
+        await loadData();
+      }
+    } finally {
+      setProcessing(null);
+    }
+  };
+
+  const handleBulkUpdate = async (action: 'approve' | 'reject') => {
+    try {
+      setProcessing('bulk');
+      setError(null);
+      const result = await enrollmentService.bulkUpdateEnrollments({
+        action,
+        enrollment_ids: enrollmentRequests.map((enrollment) => enrollment._id),
+      });
+      setSuccessMessage(
+        `${result.updated} enrollment${result.updated === 1 ? '' : 's'} ${action === 'approve' ? 'approved' : 'rejected'}`
+      );
+      await loadData();
+    } catch (err: any) {
+      console.error('Error updating enrollments:', err);
+      setError(err.response?.data?.detail || 'Failed to update enrollments');
     } finally {
       setProcessing(null);
     }
@@ -116,11 +142,6 @@ const MentorDashboard: React.FC = () => {
     navigate(`/mentor/courses/${courseId}`);
   };
 
-  const getCourseTitle = (courseId: string) => {
-    const course = courses.find((c) => c._id === courseId);
-    return course?.title || 'Unknown Course';
-  };
-
   return (
     <Layout>
       <Container maxWidth="lg" sx={{ py: 4 }}>
@@ -210,7 +231,7 @@ const MentorDashboard: React.FC = () => {
                       Pending
                     </Typography>
                     <Typography variant="h4" fontWeight={700}>
-                      {loading ? '...' : enrollmentRequests.length}
+                      {loading ? '...' : pendingTotal}
                     </Typography>
                   </Box>
                   {enrollmentRequests.length > 0 && (
@@ -274,6 +295,8 @@ const MentorDashboard: React.FC = () => {
                         </Typography>
                         <Typography variant="caption" color="text.secondary">
                           Created: {new Date(course.created_at).toLocaleDateString()}
+                          {' · '}{course.enrollment_counts.approved} enrolled
+                          {course.enrollment_counts.pending > 0 && ` · ${course.enrollment_counts.pending} pending`}
                         </Typography>
                       </CardContent>
                     </Card>
@@ -347,7 +370,7 @@ const MentorDashboard: React.FC = () => {
                       <Box>
                         <IconButton
                           color="success"
-                          onClick={() => handleApproveEnrollment(enrollment._id)}
+                          onClick={() => handleApproveEnrollment(enrollment._id, enrollment.version)}
                           disabled={processing === enrollment._id}
                         >
                           {processing === enrollment._id ? (
@@ -358,7 +381,7 @@ const MentorDashboard: React.FC = () => {
                         </IconButton>
                         <IconButton
                           color="error"
-                          onClick={() => handleRejectEnrollment(enrollment._id)}
+                          onClick={() => handleRejectEnrollment(enrollment._id, enrollment.version)}
                           disabled={processing === enrollment._id}
                         >
                           <Close />
@@ -370,7 +393,7 @@ const MentorDashboard: React.FC = () => {
                       primary={
                         <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
                           <Typography fontWeight={600}>
-                            {getCourseTitle(enrollment.course_id)}
+                            {enrollment.course_title || 'Unknown Course'}
                           </Typography>
                           <Chip label="Pending" color="warning" size="small" />
                         </Box>
@@ -389,6 +412,25 @@ const MentorDashboard: React.FC = () => {
             )}
           </DialogContent>
           <DialogActions>
+            {enrollmentRequests.length > 1 && (
+              <>
+                <Button
+                  color="error"
+                  onClick={() => handleBulkUpdate('reject')}
+                  disabled={processing !== null}
+                >
+                  Reject all shown
+                </Button>
+                <Button
+                  color="success"
+                  variant="contained"
+                  onClick={() => handleBulkUpdate('approve')}
+                  disabled={processing !== null}
+                >
+                  Approve all shown ({enrollmentRequests.length})
+                </Button>
+              </>
+            )}
             <Button onClick={() => setShowEnrollmentsDialog(false)}>Close</Button>
           </DialogActions>
         </Dialog>
@@ -22,9 +22,7 @@ import { School, Assignment, TrendingUp, Add, CheckCircle, HourglassEmpty, Cance
 import { useAuth } from '../hooks/useAuth';
 import { useNavigate } from 'react-router-dom';
 import Layout from '../components/layout/Layout';
-import enrollmentService from '../services/enrollmentService';
-import progressService from '../services/progressService';
-import studentStatsService from '../services/studentStatsService';
+import dashboardService from '../services/dashboardService';
 import type { StudentStats } from '../services/studentStatsService';
 import type { CourseWithProgress, EnrollmentStatus } from '../types/course';
 import { ROUTES } from '../config/constants';
@@ -41,6 +39,7 @@ const StudentDashboard: React.FC = () => {
   const limit = 6; // Show 6 courses per page
   const [studentStats, setStudentStats] = useState<StudentStats | null>(null);
   const [statusFilter, setStatusFilter] = useState<string>('ALL');
+  const [pendingCount, setPendingCount] = useState(0);
 
   useEffect(() => {
     fetchData();
@@ -51,55 +50,17 @@ const StudentDashboard: React.FC = () => {
       setLoading(true);
       setError(null);
       
-      // Fetch student stats
-      const stats = await studentStatsService.getMyStats();
-      setStudentStats(stats);
-      
-      // Fetch all enrolled courses (paginate through backend)
-      let allCourses: CourseWithProgress[] = [];
-      let currentPage = 1;
-      let totalPagesBackend = 1;
-
-      // Fetch first page to get total pages
-      const firstResponse = await enrollmentService.getMyEnrolledCourses(currentPage, 100);
-      allCourses = [...firstResponse.items];
-      totalPagesBackend = firstResponse.total_pages;
-
-      // Fetch remaining pages if any
-      while (currentPage < totalPagesBackend) {
-        currentPage++;
-        const response = await enrollmentService.getMyEnrolledCourses(currentPage, 100);
-        allCourses = [...allCourses, ...response.items];
-      }
-      
-      // Filter courses based on status
-      const filteredCourses = statusFilter === 'ALL'
-        ? allCourses
-        : allCourses.filter(course => course.enrollment?.status === statusFilter);
-      
-      // Calculate pagination for filtered results
-      const totalFiltered = filteredCourses.length;
-      const totalPagesFiltered = Math.ceil(totalFiltered / limit);
-      const startIndex = (page - 1) * limit;
-      const endIndex = startIndex + limit;
-      const paginatedCourses = filteredCourses.slice(startIndex, endIndex);
-      
-      setTotalPages(totalPagesFiltered);
-      setTotalCourses(totalFiltered);
-      
-      // Fetch progress for each course on current page
-      const coursesWithProgress = await Promise.all(
-        paginatedCourses.map(async (course) => {
-          try {
-            const progress = await progressService.getCourseProgress(course._id);
-            return { ...course, progress };
-          } catch (err) {
-            return course;
-          }
-        })
+      // Stats, the current page with progress and pending requests in one call
+      const dashboard = await dashboardService.getStudentDashboard(
+        page,
+        limit,
+        statusFilter === 'ALL' ? undefined : (statusFilter as EnrollmentStatus)
       );
-
-      setEnrolledCourses(coursesWithProgress);
+      setStudentStats(dashboard.stats);
+      setEnrolledCourses(dashboard.courses.items);
+      setTotalPages(dashboard.courses.total_pages);
+      setTotalCourses(dashboard.courses.total);
+      setPendingCount(dashboard.pending_requests.length);
     } catch (err: any) {
       console.error('Error fetching data:', err);
       setError(err.response?.data?.detail || 'Failed to fetch data');
@@ -276,7 +237,7 @@ const StudentDashboard: React.FC = () => {
                 </ToggleButton>
                 <ToggleButton value="PENDING" aria-label="pending courses">
                   <HourglassEmpty sx={{ fontSize: 18, mr: 0.5 }} />
-                  Pending
+                  Pending{pendingCount > 0 ? ` (${pendingCount})` : ''}
                 </ToggleButton>
               </ToggleButtonGroup>
             </Box>
@@ -10,6 +10,8 @@ import {
   Alert,
   Paper,
   Chip,
+  ToggleButton,
+  ToggleButtonGroup,
 } from '@mui/material';
 import {
   PieChart,
@@ -19,6 +21,11 @@ import {
   Legend,
   Tooltip,
   Label,
+  BarChart,
+  Bar,
+  XAxis,
+  YAxis,
+  CartesianGrid,
 } from 'recharts';
 import { CheckCircle, TrendingUp, HourglassEmpty, ArrowBack } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
@@ -26,7 +33,7 @@ import { Button } from '@mui/material';
 import Layout from '../../components/layout/Layout';
 import enrollmentService from '../../services/enrollmentService';
 import progressService from '../../services/progressService';
-import type { CourseWithProgress } from '../../types/course';
+import type { CourseWithProgress, HistoryBucket, ProgressHistory } from '../../types/course';
 import { ROUTES } from '../../config/constants';
 
 interface CourseCompletionData {
@@ -42,11 +49,28 @@ const Analytics: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
   const [enrolledCourses, setEnrolledCourses] = useState<CourseWithProgress[]>([]);
   const [completionData, setCompletionData] = useState<CourseCompletionData[]>([]);
+  const [historyBucket, setHistoryBucket] = useState<HistoryBucket>('day');
+  const [history, setHistory] = useState<ProgressHistory | null>(null);
 
   useEffect(() => {
     fetchAnalyticsData();
   }, []);
 
+  useEffect(() => {
+    fetchHistory(historyBucket);
+  }, [historyBucket]);
+
+  const fetchHistory = async (bucket: HistoryBucket) => {
+    try {
+      // 30 days or 12 weeks, bucketed by the API
+      const data = await progressService.getProgressHistory(bucket, bucket === 'day' ? 30 : 12);
+      setHistory(data);
+    } catch (err) {
+      console.error('Error fetching progress history:', err);
+      setHistory(null);
+    }
+  };
+
   const fetchAnalyticsData = async () => {
     try {
       setLoading(true);
@@ -276,6 +300,72 @@ const Analytics: React.FC = () => {
               </Grid>
             </Grid>
 
+            {/* Completion History */}
+            {history && (
+              <Card sx={{ p: 3, mb: 4 }}>
+                <CardContent>
+                  <Box
+                    sx={{
+                      display: 'flex',
+                      alignItems: 'center',
+                      justifyContent: 'space-between',
+                      mb: 2,
+                    }}
+                  >
+                    <Typography variant="h6" fontWeight={600}>
+                      Lessons Completed
+                    </Typography>
+                    <ToggleButtonGroup
+                      size="small"
+                      exclusive
+                      value={historyBucket}
+                      onChange={(_, value) => value && setHistoryBucket(value)}
+                    >
+                      <ToggleButton value="day">Daily</ToggleButton>
+                      <ToggleButton value="week">Weekly</ToggleButton>
+                    </ToggleButtonGroup>
+                  </Box>
+                  <Box sx={{ display: 'flex', gap: 1, mb: 3, flexWrap: 'wrap' }}>
+                    <Chip
+                      color="primary"
+                      label={`Current streak: ${history.current_streak_days} day${history.current_streak_days !== 1 ? 's' : ''}`}
+                    />
+                    <Chip
+                      variant="outlined"
+                      label={`Longest streak: ${history.longest_streak_days} day${history.longest_streak_days !== 1 ? 's' : ''}`}
+                    />
+                    <Chip
+                      variant="outlined"
+                      label={`${history.total_completions} lesson${history.total_completions !== 1 ? 's' : ''} in this period`}
+                    />
+                  </Box>
+                  <ResponsiveContainer width="100%" height={260}>
+                    <BarChart data={history.points}>
+                      <CartesianGrid strokeDasharray="3 3" vertical={false} />
+                      <XAxis
+                        dataKey="start"
+                        tickFormatter={(value: string) =>
+                          new Date(`${value}T00:00:00Z`).toLocaleDateString(undefined, {
+                            month: 'short',
+                            day: 'numeric',
+                            timeZone: 'UTC',
+                          })
+                        }
+                      />
+                      <YAxis allowDecimals={false} />
+                      <Tooltip
+                        labelFormatter={(value: string) =>
+                          historyBucket === 'week' ? `Week of ${value}` : value
+                        }
+                        formatter={(value: number) => [value, 'Lessons']}
+                      />
+                      <Bar dataKey="completions" fill="#2196f3" radius={[4, 4, 0, 0]} />
+                    </BarChart>
+                  </ResponsiveContainer>
+                </CardContent>
+              </Card>
+            )}
+
             {/* Pie Chart */}
             <Card sx={{ p: 3 }}>
               <CardContent>
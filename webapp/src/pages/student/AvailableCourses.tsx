@@ -14,15 +14,27 @@ import {
   Snackbar,
   Pagination,
   Stack,
+  TextField,
+  InputAdornment,
 } from '@mui/material';
-import { CheckCircle, HourglassEmpty, School } from '@mui/icons-material';
+import { CheckCircle, HourglassEmpty, School, Search } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
 import Layout from '../../components/layout/Layout';
 import courseService from '../../services/courseService';
 import enrollmentService from '../../services/enrollmentService';
-import type { Course, Enrollment } from '../../types/course';
+import type { Course, CourseWithEnrollment, Enrollment } from '../../types/course';
 import { ROUTES } from '../../config/constants';
 
+const enrollmentMapOf = (courses: CourseWithEnrollment[]) => {
+  const enrollmentMap = new Map<string, Enrollment>();
+  courses.forEach((course) => {
+    if (course.enrollment) {
+      enrollmentMap.set(course._id, course.enrollment);
+    }
+  });
+  return enrollmentMap;
+};
+
 const AvailableCourses: React.FC = () => {
   const navigate = useNavigate();
   const [courses, setCourses] = useState<Course[]>([]);
@@ -34,30 +46,44 @@ const AvailableCourses: React.FC = () => {
   const [page, setPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
   const [totalCourses, setTotalCourses] = useState(0);
+  const [searchInput, setSearchInput] = useState('');
+  const [searchQuery, setSearchQuery] = useState('');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const limit = 9; // Show 9 courses per page (3x3 grid)
 
   useEffect(() => {
     fetchData();
-  }, [page]);
+  }, [page, searchQuery]);
+
+  // Search once typing pauses
+  useEffect(() => {
+    const timer = setTimeout(() => setSearchQuery(searchInput.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchInput]);
 
   const fetchData = async () => {
     try {
       setLoading(true);
       setError(null);
       
-      // Fetch all courses with pagination
-      const coursesResponse = await courseService.getAllCourses(page, limit);
-      setCourses(coursesResponse.items);
-      setTotalPages(coursesResponse.total_pages);
-      setTotalCourses(coursesResponse.total);
-
-      // Fetch my enrollments
-      const myEnrollments = await enrollmentService.getMyEnrollments();
-      const enrollmentMap = new Map<string, Enrollment>();
-      myEnrollments.forEach((enrollment) => {
-        enrollmentMap.set(enrollment.course_id, enrollment);
-      });
-      setEnrollments(enrollmentMap);
+      // Each course comes back with my enrollment, so no separate enrollments download
+      let items: CourseWithEnrollment[];
+      if (searchQuery) {
+        // Search results are ranked server-side and paged with a cursor
+        const searchResponse = await courseService.searchCourses(searchQuery, null, limit, true, true);
+        items = searchResponse.items;
+        setNextCursor(searchResponse.next_cursor);
+      } else {
+        // Fetch all courses with pagination
+        const coursesResponse = await courseService.getAllCourses(page, limit, true);
+        items = coursesResponse.items;
+        setTotalPages(coursesResponse.total_pages);
+        setTotalCourses(coursesResponse.total);
+        setNextCursor(null);
+      }
+      setCourses(items);
+      setEnrollments(enrollmentMapOf(items));
     } catch (err: any) {
       console.error('Error fetching courses:', err);
       setError(err.response?.data?.detail || 'Failed to fetch courses');
@@ -66,6 +92,22 @@ const AvailableCourses: React.FC = () => {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const searchResponse = await courseService.searchCourses(searchQuery, nextCursor, limit, true, true);
+      setCourses([...courses, ...searchResponse.items]);
+      setEnrollments(new Map([...enrollments, ...enrollmentMapOf(searchResponse.items)]));
+      setNextCursor(searchResponse.next_cursor);
+    } catch (err: any) {
+      console.error('Error loading more courses:', err);
+      setError(err.response?.data?.detail || 'Failed to load more courses');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleEnroll = async (courseId: string) => {
     try {
       setEnrolling(courseId);
@@ -104,6 +146,21 @@ const AvailableCourses: React.FC = () => {
           </Typography>
         </Box>
 
+        <TextField
+          fullWidth
+          placeholder="Search courses"
+          value={searchInput}
+          onChange={(e) => setSearchInput(e.target.value)}
+          sx={{ mb: 3 }}
+          InputProps={{
+            startAdornment: (
+              <InputAdornment position="start">
+                <Search />
+              </InputAdornment>
+            ),
+          }}
+        />
+
         {error && (
           <Alert severity="error" sx={{ mb: 3 }} onClose={() => setError(null)}>
             {error}
@@ -118,10 +175,10 @@ const AvailableCourses: React.FC = () => {
           <Box sx={{ textAlign: 'center', py: 8 }}>
             <School sx={{ fontSize: 80, color: 'text.secondary', mb: 2 }} />
             <Typography variant="h6" gutterBottom color="text.secondary">
-              No courses available yet
+              {searchQuery ? 'No courses match your search' : 'No courses available yet'}
             </Typography>
             <Typography variant="body2" color="text.secondary">
-              Check back later for new courses
+              {searchQuery ? 'Try different or fewer words' : 'Check back later for new courses'}
             </Typography>
           </Box>
         ) : (
@@ -205,8 +262,17 @@ const AvailableCourses: React.FC = () => {
           </Grid>
         )}
 
+        {/* Search results load incrementally */}
+        {!loading && searchQuery && nextCursor && (
+          <Box sx={{ display: 'flex', justifyContent: 'center', mt: 4 }}>
+            <Button variant="outlined" onClick={handleLoadMore} disabled={loadingMore}>
+              {loadingMore ? <CircularProgress size={24} /> : 'Load more'}
+            </Button>
+          </Box>
+        )}
+
         {/* Pagination */}
-        {!loading && courses.length > 0 && totalPages > 1 && (
+        {!loading && !searchQuery && courses.length > 0 && totalPages > 1 && (
           <Box sx={{ display: 'flex', justifyContent: 'center', mt: 4 }}>
             <Stack spacing={2}>
               <Pagination 
@@ -31,12 +31,15 @@ import {
   Description,
   MoreHoriz,
   Close,
+  EmojiEvents,
 } from '@mui/icons-material';
 import { useNavigate, useParams } from 'react-router-dom';
 import Layout from '../../components/layout/Layout';
 import courseService from '../../services/courseService';
 import lessonService from '../../services/lessonService';
 import progressService from '../../services/progressService';
+import leaderboardService from '../../services/leaderboardService';
+import type { Leaderboard } from '../../services/leaderboardService';
 import type { Course, Lesson, Progress, LessonType } from '../../types/course';
 import { ROUTES } from '../../config/constants';
 
@@ -50,6 +53,7 @@ const StudentCourseDetail: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
   const [selectedLesson, setSelectedLesson] = useState<Lesson | null>(null);
   const [completing, setCompleting] = useState(false);
+  const [leaderboard, setLeaderboard] = useState<Leaderboard | null>(null);
   const [courseProgress, setCourseProgress] = useState({
     total: 0,
     completed: 0,
@@ -90,6 +94,14 @@ const StudentCourseDetail: React.FC = () => {
       const total = lessonsData.length;
       const percentage = total > 0 ? Math.round((completed / total) * 100) : 0;
       setCourseProgress({ total, completed, percentage });
+
+      // Leaderboard is optional; the page works without it
+      try {
+        setLeaderboard(await leaderboardService.getCourseLeaderboard(courseId, 5));
+      } catch (err) {
+        console.error('Error fetching leaderboard:', err);
+        setLeaderboard(null);
+      }
     } catch (err: any) {
       console.error('Error fetching course data:', err);
       setError(err.response?.data?.detail || 'Failed to fetch course data');
@@ -276,6 +288,52 @@ const StudentCourseDetail: React.FC = () => {
               </CardContent>
             </Card>
 
+            {/* Leaderboard */}
+            {leaderboard && leaderboard.entries.length > 0 && (
+              <Card sx={{ mb: 3 }}>
+                <CardContent>
+                  <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 1 }}>
+                    <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                      <EmojiEvents color="warning" />
+                      <Typography variant="h6" fontWeight={600}>
+                        Top Learners
+                      </Typography>
+                    </Box>
+                    {leaderboard.me && (
+                      <Chip
+                        color="primary"
+                        label={`Your rank: #${leaderboard.me.rank} of ${leaderboard.total_students}`}
+                      />
+                    )}
+                  </Box>
+                  <List dense>
+                    {leaderboard.entries.map((entry) => {
+                      const isMe = entry.student_id === leaderboard.me?.student_id;
+                      return (
+                        <ListItem
+                          key={entry.student_id}
+                          sx={{ borderRadius: 1, bgcolor: isMe ? 'primary.50' : 'transparent' }}
+                        >
+                          <ListItemIcon sx={{ minWidth: 40 }}>
+                            <Typography fontWeight={700} color="text.secondary">
+                              #{entry.rank}
+                            </Typography>
+                          </ListItemIcon>
+                          <ListItemText
+                            primary={isMe ? 'You' : `Student ${entry.student_id.slice(-6)}`}
+                            primaryTypographyProps={{ fontWeight: isMe ? 700 : 400 }}
+                          />
+                          <Typography variant="body2" color="text.secondary">
+                            {entry.score} lesson{entry.score !== 1 ? 's' : ''}
+                          </Typography>
+                        </ListItem>
+                      );
+                    })}
+                  </List>
+                </CardContent>
+              </Card>
+            )}
+
             {/* Lessons List */}
             <Card>
               <CardContent>
@@ -3,8 +3,10 @@ import type {
   Course,
   CourseCreate,
   CourseUpdate,
+  CourseWithEnrollment,
+  CourseSearchResult,
 } from '../types/course';
-import type { PaginatedResponse } from '../types/pagination';
+import type { PaginatedResponse, CursorPage } from '../types/pagination';
 
 class CourseService {
   async createCourse(courseData: CourseCreate): Promise<Course> {
@@ -12,9 +14,32 @@ class CourseService {
     return response.data;
   }
 
-  async getAllCourses(page: number = 1, limit: number = 10): Promise<PaginatedResponse<Course>> {
-    const response = await apiClient.get<PaginatedResponse<Course>>('/courses', {
-      params: { page, limit }
+  async getAllCourses(
+    page: number = 1,
+    limit: number = 10,
+    withEnrollment: boolean = false
+  ): Promise<PaginatedResponse<CourseWithEnrollment>> {
+    const response = await apiClient.get<PaginatedResponse<CourseWithEnrollment>>('/courses', {
+      params: { page, limit, with_enrollment: withEnrollment }
+    });
+    return response.data;
+  }
+
+  async searchCourses(
+    q: string,
+    cursor?: string | null,
+    limit: number = 10,
+    includeLessons: boolean = false,
+    withEnrollment: boolean = false
+  ): Promise<CursorPage<CourseSearchResult>> {
+    const response = await apiClient.get<CursorPage<CourseSearchResult>>('/courses/search', {
+      params: {
+        q,
+        limit,
+        cursor: cursor || undefined,
+        include_lessons: includeLessons,
+        with_enrollment: withEnrollment,
+      }
     });
     return response.data;
   }
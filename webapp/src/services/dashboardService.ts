@@ -0,0 +1,59 @@
+import apiClient from './api';
+import type { StudentStats } from './studentStatsService';
+import type {
+  Course,
+  CourseWithProgress,
+  CourseWithEnrollment,
+  Enrollment,
+  EnrollmentStatus,
+} from '../types/course';
+import type { PaginatedResponse } from '../types/pagination';
+
+export interface StudentDashboard {
+  stats: StudentStats;
+  courses: PaginatedResponse<CourseWithProgress>;
+  pending_requests: CourseWithEnrollment[];
+}
+
+export interface EnrollmentCounts {
+  pending: number;
+  approved: number;
+  rejected: number;
+}
+
+export interface MentorCourseSummary extends Course {
+  enrollment_counts: EnrollmentCounts;
+}
+
+export interface PendingEnrollment extends Enrollment {
+  course_title: string;
+}
+
+export interface MentorDashboard {
+  courses: PaginatedResponse<MentorCourseSummary>;
+  pending_requests: PendingEnrollment[];
+  pending_total: number;
+  enrolled_students: number;
+}
+
+class DashboardService {
+  async getStudentDashboard(
+    page: number = 1,
+    limit: number = 6,
+    status?: EnrollmentStatus
+  ): Promise<StudentDashboard> {
+    const response = await apiClient.get<StudentDashboard>('/dashboard/student', {
+      params: { page, limit, status }
+    });
+    return response.data;
+  }
+
+  async getMentorDashboard(page: number = 1, limit: number = 6): Promise<MentorDashboard> {
+    const response = await apiClient.get<MentorDashboard>('/dashboard/mentor', {
+      params: { page, limit }
+    });
+    return response.data;
+  }
+}
+
+export default new DashboardService();
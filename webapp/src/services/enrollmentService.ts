@@ -3,6 +3,8 @@ import type {
   Enrollment,
   EnrollmentCreate,
   CourseWithProgress,
+  BulkEnrollmentUpdate,
+  BulkEnrollmentResult,
 } from '../types/course';
 import type { PaginatedResponse } from '../types/pagination';
 
@@ -46,19 +48,28 @@ class EnrollmentService {
     return response.data;
   }
 
-  async approveEnrollment(enrollmentId: string): Promise<Enrollment> {
+  async approveEnrollment(enrollmentId: string, version?: number): Promise<Enrollment> {
     const response = await apiClient.put<Enrollment>(
-      `/enrollments/${enrollmentId}/approve`
+      `/enrollments/${enrollmentId}/approve`,
+      undefined,
+      { params: { version } }
     );
     return response.data;
   }
 
-  async rejectEnrollment(enrollmentId: string): Promise<Enrollment> {
+  async rejectEnrollment(enrollmentId: string, version?: number): Promise<Enrollment> {
     const response = await apiClient.put<Enrollment>(
-      `/enrollments/${enrollmentId}/reject`
+      `/enrollments/${enrollmentId}/reject`,
+      undefined,
+      { params: { version } }
     );
     return response.data;
   }
+
+  async bulkUpdateEnrollments(request: BulkEnrollmentUpdate): Promise<BulkEnrollmentResult> {
+    const response = await apiClient.post<BulkEnrollmentResult>('/enrollments/bulk', request);
+    return response.data;
+  }
 }
 
 export default new EnrollmentService();
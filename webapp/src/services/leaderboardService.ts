@@ -0,0 +1,33 @@
+import apiClient from './api';
+
+export interface LeaderboardEntry {
+  rank: number;
+  student_id: string;
+  score: number;
+  reached_at: string;
+}
+
+export interface Leaderboard {
+  course_id: string | null;
+  total_students: number;
+  entries: LeaderboardEntry[];
+  me: LeaderboardEntry | null;
+}
+
+class LeaderboardService {
+  async getCourseLeaderboard(courseId: string, limit: number = 10): Promise<Leaderboard> {
+    const response = await apiClient.get<Leaderboard>(`/leaderboards/courses/${courseId}`, {
+      params: { limit }
+    });
+    return response.data;
+  }
+
+  async getGlobalLeaderboard(limit: number = 10): Promise<Leaderboard> {
+    const response = await apiClient.get<Leaderboard>('/leaderboards/global', {
+      params: { limit }
+    });
+    return response.data;
+  }
+}
+
+export default new LeaderboardService();
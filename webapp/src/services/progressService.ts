@@ -2,6 +2,8 @@ import apiClient from './api';
 import type {
   Progress,
   CourseProgress,
+  HistoryBucket,
+  ProgressHistory,
 } from '../types/course';
 
 class ProgressService {
@@ -33,6 +35,16 @@ class ProgressService {
     return response.data;
   }
 
+  async getProgressHistory(
+    bucket: HistoryBucket = 'day',
+    periods: number = 30
+  ): Promise<ProgressHistory> {
+    const response = await apiClient.get<ProgressHistory>('/progress/history', {
+      params: { bucket, periods },
+    });
+    return response.data;
+  }
+
   async getStudentProgressMentor(
     studentId: string,
     courseId: string
@@ -21,6 +21,15 @@ export interface Course {
   updated_at: string;
 }
 
+export interface CourseWithEnrollment extends Course {
+  enrollment: Enrollment | null;
+}
+
+export interface CourseSearchResult extends CourseWithEnrollment {
+  score: number;
+  matched_lessons: string[];
+}
+
 export interface CourseCreate {
   title: string;
   description: string;
@@ -66,12 +75,28 @@ export interface Enrollment {
   requested_at: string;
   approved_at?: string;
   approved_by?: string;
+  version: number;
 }
 
 export interface EnrollmentCreate {
   course_id: string;
 }
 
+export type BulkEnrollmentAction = 'approve' | 'reject';
+
+export interface BulkEnrollmentUpdate {
+  action: BulkEnrollmentAction;
+  enrollment_ids?: string[];
+  course_id?: string;
+}
+
+export interface BulkEnrollmentResult {
+  status: EnrollmentStatus;
+  updated: number;
+  skipped: number;
+  enrollments: Enrollment[];
+}
+
 export interface Progress {
   _id: string;
   student_id: string;
@@ -88,6 +113,25 @@ export interface CourseProgress {
   completion_percentage: number;
 }
 
+export type HistoryBucket = 'day' | 'week';
+
+export interface ProgressHistoryPoint {
+  start: string;
+  completions: number;
+  courses: number;
+}
+
+export interface ProgressHistory {
+  bucket: HistoryBucket;
+  start: string;
+  end: string;
+  points: ProgressHistoryPoint[];
+  total_completions: number;
+  active_days: number;
+  current_streak_days: number;
+  longest_streak_days: number;
+}
+
 export interface CourseWithProgress extends Course {
   progress?: CourseProgress;
   enrollment?: Enrollment;
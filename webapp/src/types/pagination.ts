@@ -8,6 +8,12 @@ export interface PaginatedResponse<T> {
   has_prev: boolean;
 }
 
+export interface CursorPage<T> {
+  items: T[];
+  limit: number;
+  next_cursor: string | null;
+}
+
 export interface PaginationParams {
   page: number;
   limit: number;